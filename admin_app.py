@@ -1,19 +1,32 @@
+import pandas as pd
+import plotly.express as px
 import streamlit as st
 
+import perf
+import sql_trace
 from fantasy_backend import (
     authenticate_user,
-    init_db,
+    EVENT_CATEGORIES,
+    bootstrap,
+    list_event_categories,
     list_events_for_season,
     list_leagues,
     list_players_for_season,
     list_seasons,
     list_teams_for_league_season,
+    player_event_week,
+    set_event_categories,
     upsert_player_event,
+    upsert_player_events_bulk,
     upsert_weekly_bonus,
+    upsert_weekly_bonuses_bulk,
+    weekly_bonus_week,
+    write_queue_stats,
 )
+from utils_cache import cache_df_stats, cache_obj_stats
 
 st.set_page_config(page_title="Fantasy Survivor Admin", page_icon="🛠️", layout="wide")
-init_db(force_seed=True)
+bootstrap()
 
 st.title("🛠️ Fantasy Survivor Admin Console")
 st.caption("Use this private app to record weekly events and question bonus points.")
@@ -39,34 +52,229 @@ if st.session_state.admin is None:
 with st.sidebar:
     st.success(f"Signed in as {st.session_state.admin['username']}")
 
-season = st.selectbox("Season", list_seasons())
-
-col1, col2 = st.columns(2)
-with col1:
-    st.subheader("Player event scoring")
-    with st.form("player_event_form"):
-        player = st.selectbox("Player", list_players_for_season(season))
-        week = st.number_input("Week", min_value=1, max_value=30, value=1, step=1)
-        event = st.selectbox("Event", list_events_for_season(season))
-        value = st.number_input("Event count/value", value=0.0, step=1.0)
-        submit_event = st.form_submit_button("Save event value")
-
-    if submit_event:
-        upsert_player_event(season, int(week), player, event, float(value))
-        st.success("Player event saved.")
-
-with col2:
-    st.subheader("Weekly question / bonus points")
-    with st.form("weekly_bonus_form"):
-        league = st.selectbox("League", list_leagues())
-        team = st.selectbox("Team", list_teams_for_league_season(league, season))
-        week_bonus = st.number_input("Week", min_value=1, max_value=30, value=1, step=1, key="week_bonus")
-        points = st.number_input("Bonus points", value=0.0, step=1.0)
-        submit_bonus = st.form_submit_button("Save weekly bonus")
-
-    if submit_bonus:
-        upsert_weekly_bonus(league, season, team, int(week_bonus), float(points))
-        st.success("Weekly bonus saved.")
+def scoring_page() -> None:
+    season = st.selectbox("Season", list_seasons())
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Player event scoring")
+        with st.form("player_event_form"):
+            player = st.selectbox("Player", list_players_for_season(season))
+            week = st.number_input("Week", min_value=1, max_value=30, value=1, step=1)
+            event = st.selectbox("Event", list_events_for_season(season))
+            value = st.number_input("Event count/value", value=0.0, step=1.0)
+            submit_event = st.form_submit_button("Save event value")
+
+        if submit_event:
+            upsert_player_event(season, int(week), player, event, float(value))
+            st.success("Player event saved.")
+
+    with col2:
+        st.subheader("Weekly question / bonus points")
+        with st.form("weekly_bonus_form"):
+            league = st.selectbox("League", list_leagues())
+            team = st.selectbox("Team", list_teams_for_league_season(league, season))
+            week_bonus = st.number_input("Week", min_value=1, max_value=30, value=1, step=1, key="week_bonus")
+            points = st.number_input("Bonus points", value=0.0, step=1.0)
+            submit_bonus = st.form_submit_button("Save weekly bonus")
+
+        if submit_bonus:
+            upsert_weekly_bonus(league, season, team, int(week_bonus), float(points))
+            st.success("Weekly bonus saved.")
+
+
+def _changed_events(original: pd.DataFrame, edited: pd.DataFrame) -> pd.DataFrame:
+    """Player/Event/Value rows for the grid cells whose value was edited (cleared cells count as 0)."""
+    before = original.reset_index().melt(id_vars="Player", var_name="Event", value_name="Value")
+    after = edited.fillna(0.0).reset_index().melt(id_vars="Player", var_name="Event", value_name="Value")
+    return after[before["Value"].to_numpy() != after["Value"].to_numpy()]
+
+
+def _upload_rows(upload, kind: str) -> pd.DataFrame:
+    """
+    Read an uploaded CSV/XLSX into the long format the bulk API takes. Long
+    files (Week/Player/Event/Value or Team/Week/Points) pass through; legacy
+    wide sheets (an event or team per column) are melted.
+    """
+    frame = pd.read_csv(upload) if upload.name.lower().endswith(".csv") else pd.read_excel(upload)
+    frame = frame.rename(columns=lambda c: str(c).strip())
+    titled = {str(c).title() for c in frame.columns}
+    if kind == "Player events":
+        if {"Event", "Value"} <= titled:
+            return frame
+        long = frame.melt(id_vars=["Player", "Week"], var_name="Event", value_name="Value")
+    else:
+        if {"Team", "Points"} <= titled:
+            return frame
+        long = frame.melt(id_vars=["Week"], var_name="Team", value_name="Points")
+    return long.dropna(subset=[long.columns[-1]])
+
+
+def batch_page() -> None:
+    season = st.selectbox("Season", list_seasons(), key="batch_season")
+    week = int(st.number_input("Week", min_value=1, max_value=30, value=1, step=1, key="batch_week"))
+
+    st.subheader(f"Player events, week {week}")
+    original = player_event_week(season, week)
+    with st.form("event_grid_form"):
+        edited = st.data_editor(original, num_rows="fixed", use_container_width=True, key=f"events_{season}_{week}")
+        save_events = st.form_submit_button("Save week")
+    if save_events:
+        changes = _changed_events(original, edited).assign(Week=week)
+        try:
+            st.success(f"Saved {upsert_player_events_bulk(season, changes)} changed value(s).")
+        except ValueError as exc:
+            st.error(str(exc))
+
+    st.subheader(f"Weekly bonus points, week {week}")
+    league = st.selectbox("League", list_leagues(), key="batch_league")
+    bonuses = weekly_bonus_week(league, season, week).set_index("Team")
+    with st.form("bonus_grid_form"):
+        edited_bonuses = st.data_editor(bonuses, num_rows="fixed", use_container_width=True,
+                                        key=f"bonus_{league}_{season}_{week}")
+        save_bonuses = st.form_submit_button("Save bonuses")
+    if save_bonuses:
+        points = edited_bonuses["Points"].fillna(0.0)
+        changed = points[points.to_numpy() != bonuses["Points"].to_numpy()]
+        changes = pd.DataFrame({"Team": changed.index, "Week": week, "Points": changed.to_numpy()})
+        try:
+            st.success(f"Saved {upsert_weekly_bonuses_bulk(league, season, changes)} changed bonus(es).")
+        except ValueError as exc:
+            st.error(str(exc))
+
+    st.subheader("Upload a file")
+    st.caption(
+        "Player events: `Week, Player, Event, Value` rows, or a PointsScored-style sheet with one column per event. "
+        "Bonuses (for the league above): `Team, Week, Points` rows, or a Weekly_Pick_Scores-style sheet with one "
+        "column per team. Nothing is saved unless every row is valid."
+    )
+    kind = st.radio("File contains", ["Player events", "Weekly bonuses"], horizontal=True)
+    upload = st.file_uploader("CSV or Excel file", type=["csv", "xlsx"])
+    if upload is not None:
+        try:
+            rows = _upload_rows(upload, kind)
+        except (KeyError, ValueError) as exc:
+            st.error(f"Could not read {upload.name}: {exc}")
+            return
+        st.dataframe(rows.head(50), use_container_width=True)
+        if st.button(f"Import {len(rows):,} row(s)"):
+            try:
+                if kind == "Player events":
+                    saved = upsert_player_events_bulk(season, rows)
+                else:
+                    saved = upsert_weekly_bonuses_bulk(league, season, rows)
+                st.success(f"Imported {saved:,} row(s).")
+            except ValueError as exc:
+                st.error(str(exc))
+
+
+def categories_page() -> None:
+    season = st.selectbox("Season", list_seasons(), key="category_season")
+    st.caption(
+        "Categories drive the elimination view and the per-category charts. They are filled in from the event "
+        "name when point values are imported; anything you change here is kept as an override."
+    )
+    current = list_event_categories(season).set_index("event_name")
+    with st.form("event_categories_form"):
+        edited = st.data_editor(
+            current,
+            column_config={
+                "category": st.column_config.SelectboxColumn("Category", options=list(EVENT_CATEGORIES), required=True),
+                "points": st.column_config.NumberColumn("Points", disabled=True),
+                "is_override": st.column_config.CheckboxColumn("Override", disabled=True),
+            },
+            num_rows="fixed",
+            use_container_width=True,
+            key=f"categories_{season}",
+        )
+        save = st.form_submit_button("Save categories")
+    if save:
+        changed = edited["category"][edited["category"].to_numpy() != current["category"].to_numpy()]
+        try:
+            st.success(f"Updated {set_event_categories(season, changed.to_dict())} event(s).")
+        except ValueError as exc:
+            st.error(str(exc))
+
+    overrides = current.index[current["is_override"].astype(bool)].tolist()
+    if overrides:
+        reset = st.multiselect("Restore the automatic category for", overrides)
+        if reset and st.button("Restore"):
+            set_event_categories(season, dict.fromkeys(reset))
+            st.rerun()
+
+
+def performance_page() -> None:
+    st.subheader("Hot-path timings")
+    st.caption(
+        f"Spans recorded by this server process (last {perf.RING_SIZE:,}). "
+        "Every `fantasy_backend` entry point, cache reader and tab is instrumented."
+    )
+    summary = perf.summary()
+    if summary.empty:
+        st.info("No spans recorded yet. Use the app on this server, then refresh.")
+    else:
+        st.dataframe(summary.style.format(precision=2), use_container_width=True)
+        name = st.selectbox("Latency histogram for", summary["span"].tolist())
+        durations = perf.spans(name)
+        fig = px.histogram(durations, x="duration_ms", nbins=40, labels={"duration_ms": "Latency (ms)"})
+        fig.update_layout(height=320, yaxis_title="Calls")
+        st.plotly_chart(fig, use_container_width=True)
+    if st.button("Clear recorded spans"):
+        perf.reset()
+        st.rerun()
+
+    st.subheader("Cache hit ratios")
+    caches = pd.DataFrame(
+        [{"cache": "DataFrame cache", **cache_df_stats()}, {"cache": "Object store", **cache_obj_stats()}]
+    )
+    caches["MB"] = caches["bytes"] / 1e6
+    st.dataframe(
+        caches[["cache", "hits", "misses", "hit_ratio", "evictions", "entries", "MB"]].style.format(
+            {"hit_ratio": "{:.1%}", "MB": "{:.1f}"}
+        ),
+        use_container_width=True,
+    )
+
+    st.subheader("Write queue")
+    st.caption("Every save goes through one writer thread that commits whatever is pending as a single batch.")
+    writes = write_queue_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Pending", f"{writes['depth']} / {writes['capacity']}", help=f"Peak {writes['max_depth']}")
+    col2.metric("Committed", f"{writes['committed']:,}", help=f"{writes['failed']:,} failed, {writes['rejected']:,} rejected")
+    col3.metric("Mean batch", f"{writes['mean_batch']:.1f}", help=f"{writes['batches']:,} batches, largest {writes['max_batch']}")
+    col4.metric("Queue wait p95", f"{writes['wait_p95_ms']:.1f} ms", help=f"Callers blocked on a full queue for {writes['blocked_ms']:.0f} ms")
+
+    st.subheader("SQL statements")
+    tracing = st.toggle(
+        "Trace SQLite statements",
+        value=sql_trace.active_tracer() is not None,
+        help=f"Times every statement on this server and appends it to `{sql_trace.DEFAULT_LOG}`.",
+    )
+    if tracing and sql_trace.active_tracer() is None:
+        sql_trace.enable(sql_trace.DEFAULT_LOG)
+    elif not tracing and sql_trace.active_tracer() is not None:
+        sql_trace.disable()
+    tracer = sql_trace.active_tracer()
+    if tracer is not None:
+        by = st.radio("Rank by", ["total_ms", "p95_ms", "max_ms", "count"], horizontal=True)
+        top = tracer.top_statements(15, by)
+        if top.empty:
+            st.info("No statements traced yet.")
+        else:
+            if top["full_scan"].any():
+                st.warning("Some of the slowest statements fall back to a full scan of a scoring table.")
+            st.dataframe(top, use_container_width=True)
+
+
+page = st.sidebar.radio("Page", ["Scoring", "Batch scoring", "Event categories", "Performance"])
+if page == "Scoring":
+    scoring_page()
+elif page == "Batch scoring":
+    batch_page()
+elif page == "Event categories":
+    categories_page()
+else:
+    performance_page()
 
 st.markdown("---")
 st.caption("All updates are stored in `data/fantasy_survivor.db` and sync instantly with the main app.")
@@ -1,24 +1,65 @@
+import json
+
 import streamlit as st
+import streamlit.components.v1 as components
 import plotly.express as px
 
 from fantasy_backend import (
+    SESSION_TTL,
     assign_team,
     authenticate_user,
+    bootstrap,
     build_team_dashboard,
-    init_db,
+    create_session,
+    get_data_version,
     list_all_teams,
     list_league_season_options_for_user,
+    login_retry_after,
     register_user,
+    revoke_session,
+    user_for_session,
 )
 
+LIVE_REFRESH_SECONDS = 15
+SESSION_COOKIE = "fantasy_survivor_session"
+# st.iframe supersedes components.html (deprecated) where it exists; both run the script same-origin.
+embed_html = getattr(st, "iframe", components.html)
+
 st.set_page_config(page_title="Fantasy Survivor", page_icon="🏝️", layout="wide")
-init_db(force_seed=True)
+bootstrap()
 
 st.title("🏝️ Fantasy Survivor League Hub")
 st.caption("A modern fantasy dashboard for standings, player/team performance, bonuses, and eliminations.")
 
+
+def write_session_cookie(token: str | None) -> None:
+    # Streamlit scripts can't send Set-Cookie, so a one-pixel embedded script sets it on
+    # the app page. That rules out HttpOnly; SameSite=Strict keeps it off cross-site
+    # requests, and the token itself is signed, expiring and revoked on logout.
+    value, max_age = (token, int(SESSION_TTL)) if token else ("", 0)
+    cookie = f"{SESSION_COOKIE}={value}; Max-Age={max_age}; Path=/; SameSite=Strict"
+    embed_html(
+        f"""<script>
+        const page = window.parent;
+        page.document.cookie = {json.dumps(cookie)} + (page.location.protocol === "https:" ? "; Secure" : "");
+        </script>""",
+        height=1,
+    )
+
+
+# The session token is a bearer credential: it lives in a cookie and this browser
+# session's state, never in the URL (history, bookmarks, Referer headers, shared links).
+if "session" in st.query_params:
+    # Links from before tokens left the URL; drop it from the address bar only.
+    del st.query_params["session"]
 if "user" not in st.session_state:
-    st.session_state.user = None
+    # A reload starts a new Streamlit session; resume it from the cookie without PBKDF2.
+    token = st.context.cookies.get(SESSION_COOKIE)
+    st.session_state.user = user_for_session(token)
+    if st.session_state.user:
+        st.session_state.session_token = st.session_state.cookie_token = token
+if st.session_state.pop("clear_session_cookie", False):
+    write_session_cookie(None)
 
 
 def login_panel() -> None:
@@ -33,8 +74,11 @@ def login_panel() -> None:
             user = authenticate_user(username, password)
             if user:
                 st.session_state.user = user
+                st.session_state.session_token = create_session(user["id"])
                 st.success(f"Welcome back, {user['username']}!")
                 st.rerun()
+            elif login_retry_after(username):
+                st.error(f"Too many attempts. Try again in {login_retry_after(username):.0f} seconds.")
             else:
                 st.error("Invalid username or password.")
 
@@ -59,8 +103,14 @@ user = st.session_state.user
 with st.sidebar:
     st.header(f"👋 {user['username']}")
     if st.button("Log out"):
+        revoke_session(st.session_state.pop("session_token", None))
+        st.session_state.pop("cookie_token", None)
         st.session_state.user = None
+        st.session_state.clear_session_cookie = True
         st.rerun()
+if st.session_state.get("cookie_token") != st.session_state.session_token:
+    write_session_cookie(st.session_state.session_token)
+    st.session_state.cookie_token = st.session_state.session_token
 
 user_teams = list_league_season_options_for_user(user["id"])
 if user_teams.empty:
@@ -85,7 +135,20 @@ user_teams["label"] = (
 selected_label = st.sidebar.selectbox("Select your team", user_teams["label"].tolist())
 selected_team = user_teams[user_teams["label"] == selected_label].iloc[0]
 
+league_season = (selected_team["league_name"], selected_team["season_label"])
+live_updates = st.sidebar.toggle("Live updates", value=True, help="Reload automatically when new scores are saved.")
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS if live_updates else None)
+def watch_data_version() -> None:
+    # Polls one indexed row; the page (and its cached dashboard) only re-renders once the version moves.
+    if get_data_version(*league_season) != st.session_state.get("rendered_version"):
+        st.rerun(scope="app")
+
+
+st.session_state.rendered_version = get_data_version(*league_season)
 data = build_team_dashboard(int(selected_team["team_id"]))
+watch_data_version()
 meta = data["meta"].iloc[0]
 
 col1, col2, col3 = st.columns(3)
@@ -99,10 +162,14 @@ tab_team, tab_players, tab_bonus, tab_elims, tab_events = st.tabs(
 
 with tab_team:
     st.subheader("Standings")
-    standings = data["standings"].copy()
-    standings["Rank"] = standings["total_points"].rank(ascending=False, method="min").astype(int)
-    standings = standings[["Rank", "team_name", "total_points"]].rename(
-        columns={"team_name": "Team", "total_points": "Points"}
+    standings = data["standings"][["rank", "team_name", "player_points", "bonus_points", "total_points"]].rename(
+        columns={
+            "rank": "Rank",
+            "team_name": "Team",
+            "player_points": "Player Points",
+            "bonus_points": "Bonus Points",
+            "total_points": "Points",
+        }
     )
     st.dataframe(standings, use_container_width=True)
 
@@ -204,8 +271,19 @@ with tab_events:
             }
         )
         st.dataframe(events, use_container_width=True)
+
+        st.subheader("Points by Category")
+        categories = data["category_points"].rename(
+            columns={"category": "Category", "events": "Events", "points": "Points"}
+        )
+        fig = px.bar(categories, x="Category", y="Points", hover_data=["Events"])
+        fig.update_layout(height=340)
+        st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No event-level data is available yet.")
 
 st.markdown("---")
-st.caption("Admin scoring updates can be entered through `admin_app.py` and are reflected here automatically.")
+st.caption(
+    "Admin scoring updates can be entered through `admin_app.py`. With live updates on, this page "
+    f"checks for them every {LIVE_REFRESH_SECONDS} seconds and reloads when they arrive."
+)
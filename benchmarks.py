@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the backend hot paths.
+
+Builds a synthetic league (see synthetic_league.py), times each entry point
+and writes a JSON baseline with per-case latency percentiles, peak Python
+memory and SQLite work. Pass --compare to diff against an earlier baseline;
+the exit status is 1 when any case's p50 regressed past --threshold.
+
+    python benchmarks.py --scale large --output bench_large.json
+    python benchmarks.py --scale large --compare bench_large.json
+
+Latency is measured on its own pass. Memory (tracemalloc peak) and SQLite
+work are gathered on a second, instrumented pass so they don't skew it.
+SQLite doesn't expose rows scanned to Python, so "sqlite_vm_steps" (virtual
+machine instructions, counted through a progress handler) stands in for it.
+It scales with rows visited.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+import fantasy_backend as fb
+import workbooks
+from synthetic_league import SCALES, SyntheticSpec, build_database, write_workbooks
+
+VM_STEP_GRANULARITY = 100
+BURST_WRITES = 64   # saves per "episode night" burst ...
+BURST_CLIENTS = 16  # ... spread over this many concurrent sessions
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[int], object]    # called with the iteration number
+    iterations: int
+    setup: Callable[[int], None] | None = None  # untimed, runs before each iteration
+
+
+class _VmStepCounter:
+    def __init__(self) -> None:
+        self.steps = 0
+
+    def _tick(self) -> int:
+        self.steps += VM_STEP_GRANULARITY
+        return 0
+
+    def hook(self, conn: sqlite3.Connection) -> None:
+        conn.set_progress_handler(self._tick, VM_STEP_GRANULARITY)
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    return float(np.percentile(samples, q)) if samples else 0.0
+
+
+def measure(case: Case) -> dict[str, float]:
+    # Warm-up call: first-touch costs (sidecar conversion, page cache) aren't what we track.
+    if case.setup:
+        case.setup(-1)
+    case.run(-1)
+
+    timings = []
+    for i in range(case.iterations):
+        if case.setup:
+            case.setup(i)
+        started = time.perf_counter()
+        case.run(i)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Instrumented pass: fresh connections so the progress handler is attached to every one.
+    counter = _VmStepCounter()
+    fb.close_all_connections()
+    fb.add_connection_hook(counter.hook)
+    runs = max(1, min(case.iterations, 5))
+    try:
+        tracemalloc.start()
+        for i in range(runs):
+            if case.setup:
+                tracemalloc.stop()
+                case.setup(i)
+                tracemalloc.start()
+            case.run(i)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        fb.remove_connection_hook(counter.hook)
+        fb.close_all_connections()
+
+    return {
+        "iterations": case.iterations,
+        "p50_ms": _percentile(timings, 50),
+        "p95_ms": _percentile(timings, 95),
+        "mean_ms": float(np.mean(timings)),
+        "peak_kb": peak / 1024,
+        "sqlite_vm_steps": counter.steps / runs,
+    }
+
+
+def _read_path_cases(spec: SyntheticSpec, iterations: int, db_path: Path) -> list[Case]:
+    data = build_database(db_path, spec)
+    with fb.get_conn(readonly=True) as conn:
+        teams = conn.execute(
+            """
+            SELECT t.id, l.name AS league_name, s.label AS season_label, t.name AS team_name
+            FROM teams t JOIN leagues l ON l.id=t.league_id JOIN seasons s ON s.id=t.season_id
+            """
+        ).fetchall()
+    rng = np.random.default_rng(spec.seed)
+    picks = [teams[i] for i in rng.integers(0, len(teams), max(iterations, 1) + 1)]
+    season = data.seasons[0]
+
+    def pick(i: int) -> sqlite3.Row:
+        return picks[i % len(picks)]
+
+    def roster_index(i: int) -> fb.RosterIndex:
+        return fb.get_roster_index(pick(i)["league_name"], pick(i)["season_label"])
+
+    def team_weekly_points(i: int) -> object:
+        with fb.get_conn(readonly=True) as conn:
+            return fb._team_weekly_points(conn, pick(i)["id"])
+
+    def week_of_events(i: int) -> list[tuple]:
+        week = 1 + i % spec.weeks
+        return [(week, player, event, float(i % 3)) for player in data.players for event in data.events[:10]]
+
+    def clear_caches(_: int) -> None:
+        fb.clear_caches()
+
+    def warm_standings(i: int) -> None:
+        fb.clear_caches()
+        fb.build_league_standings(pick(i)["league_name"], pick(i)["season_label"])
+
+    def warm_dashboard(i: int) -> None:
+        fb.build_team_dashboard(pick(i)["id"])
+
+    def bonus_burst(i: int) -> None:
+        def save(j: int) -> None:
+            team = pick(i * BURST_WRITES + j)
+            fb.upsert_weekly_bonus(team["league_name"], team["season_label"], team["team_name"], 1 + j % spec.weeks,
+                                   float(j % 3))
+
+        with ThreadPoolExecutor(max_workers=BURST_CLIENTS) as pool:
+            list(pool.map(save, range(BURST_WRITES)))
+
+    return [
+        Case("build_team_dashboard", lambda i: fb.build_team_dashboard(pick(i)["id"]), iterations, clear_caches),
+        Case("build_team_dashboard (standings cached)", lambda i: fb.build_team_dashboard(pick(i)["id"]),
+             iterations, warm_standings),
+        Case("build_team_dashboard (cached)", lambda i: fb.build_team_dashboard(pick(i)["id"]), iterations,
+             warm_dashboard),
+        Case("_team_weekly_points", team_weekly_points, iterations),
+        Case("build_league_standings", lambda i: fb.build_league_standings(pick(i)["league_name"], pick(i)["season_label"]),
+             iterations, clear_caches),
+        Case("get_roster_index (rebuild)", roster_index, iterations, clear_caches),
+        Case("upsert_player_event", lambda i: fb.upsert_player_event(season, 1 + i % spec.weeks, data.players[0],
+                                                                     data.events[0], float(i % 3)), iterations),
+        Case("upsert_weekly_bonus", lambda i: fb.upsert_weekly_bonus(pick(i)["league_name"], pick(i)["season_label"],
+                                                                     pick(i)["team_name"], 1, float(i % 3)), iterations),
+        Case(f"upsert_weekly_bonus (burst of {BURST_WRITES})", bonus_burst, max(1, iterations // 4)),
+        Case("upsert_player_events_bulk (week)", lambda i: fb.upsert_player_events_bulk(season, week_of_events(i)),
+             max(1, iterations // 4)),
+        Case("upsert_weekly_bonuses_bulk (league)", lambda i: fb.upsert_weekly_bonuses_bulk(
+            pick(i)["league_name"], pick(i)["season_label"],
+            [(team, 1 + i % spec.weeks, float(i % 3)) for team in roster_index(i).teams(
+                pick(i)["league_name"], pick(i)["season_label"])]), iterations),
+    ]
+
+
+def _seed_case(spec: SyntheticSpec, iterations: int, workdir: Path) -> Case:
+    league_config, rosters = write_workbooks(workdir / "workbooks", spec)
+
+    def fresh_db(i: int) -> None:
+        fb.close_all_connections()
+        path = workdir / f"seed_{i + 1}.db"
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+        fb.DB_PATH = path
+        fb.migrate()
+
+    def seed(_: int) -> object:
+        saved = fb.LEAGUE_CONFIG, fb.ROSTERS
+        fb.LEAGUE_CONFIG, fb.ROSTERS = league_config, rosters
+        try:
+            return fb.seed_from_legacy()
+        finally:
+            fb.LEAGUE_CONFIG, fb.ROSTERS = saved
+
+    return Case("seed_from_legacy", seed, iterations, fresh_db)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(spec: SyntheticSpec, iterations: int = 20, seed_spec: SyntheticSpec | None = None,
+              seed_iterations: int = 3) -> dict:
+    seed_spec = seed_spec or replace(spec, leagues=min(spec.leagues, 20))
+    original_path, original_sidecars = fb.DB_PATH, workbooks.SIDECAR_DIR
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        # Synthetic workbooks get their sidecars in the scratch directory too, not under data/.
+        workbooks.SIDECAR_DIR = workdir / ".sidecars"
+        try:
+            cases = _read_path_cases(spec, iterations, workdir / "bench.db")
+            for case in cases:
+                results[case.name] = measure(case)
+            results["seed_from_legacy"] = measure(_seed_case(seed_spec, seed_iterations, workdir))
+        finally:
+            fb.close_all_connections()
+            fb.DB_PATH = original_path
+            workbooks.SIDECAR_DIR = original_sidecars
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "spec": spec.as_dict(),
+            "seed_spec": seed_spec.as_dict(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a side-by-side table; returns the names of cases whose p50 grew by more than threshold x."""
+    regressions = []
+    print(f"\n{'case':<42}{'p50 base':>10}{'p50 now':>10}{'ratio':>8}{'vm steps ratio':>16}")
+    for name, now in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<42}{'-':>10}{now['p50_ms']:>10.2f}{'new':>8}")
+            continue
+        ratio = now["p50_ms"] / base["p50_ms"] if base["p50_ms"] else float("inf")
+        steps = now["sqlite_vm_steps"] / base["sqlite_vm_steps"] if base["sqlite_vm_steps"] else float("nan")
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{name:<42}{base['p50_ms']:>10.2f}{now['p50_ms']:>10.2f}{ratio:>8.2f}{steps:>16.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the backend entry points on a synthetic league.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--roster-size", type=int, help="override the scale's players per team")
+    parser.add_argument("--weeks", type=int, help="override the scale's weeks per season")
+    parser.add_argument("--players", type=int, help="override the scale's players per season")
+    parser.add_argument("--seed-leagues", type=int, default=20, help="leagues in the seed_from_legacy workbooks")
+    parser.add_argument("--seed-iterations", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="write the JSON baseline here")
+    parser.add_argument("--compare", type=Path, help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.25, help="p50 ratio that counts as a regression")
+    args = parser.parse_args()
+
+    overrides = {"roster_size": args.roster_size, "weeks": args.weeks, "players": args.players}
+    spec = replace(SCALES[args.scale], **{k: v for k, v in overrides.items() if v})
+    report = run_suite(spec, args.iterations, replace(spec, leagues=min(spec.leagues, args.seed_leagues)),
+                       args.seed_iterations)
+
+    print(f"{'case':<42}{'p50 ms':>10}{'p95 ms':>10}{'peak KB':>10}{'vm steps':>14}")
+    for name, row in report["results"].items():
+        print(f"{name:<42}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['peak_kb']:>10.0f}{row['sqlite_vm_steps']:>14,.0f}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        if compare(report, json.loads(args.compare.read_text()), args.threshold):
+            sys.exit(1)
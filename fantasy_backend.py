@@ -1,12 +1,32 @@
 from __future__ import annotations
 
 import hashlib
+import hmac
+import logging
 import os
+import queue
+import re
+import secrets
 import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
+from perf import span, timed
+from scoring import count_matrix, grade_answers, normalize_point_values
+from workbooks import read_sheet, read_workbook
+
+logger = logging.getLogger(__name__)
+
 DB_PATH = Path("data/fantasy_survivor.db")
 
 LEAGUE_CONFIG = {
@@ -48,177 +68,1023 @@ ROSTERS = {
     },
 }
 
-
+# Per-season cast workbooks: an Images sheet (Player, Image, Eliminated) and an Elimination_Table (Week, Player).
+PLAYER_IMAGES = {
+    "Season 49": "data/Player_images_S49_Survivor.xlsx",
+    "Season 48": "data/Player_images_S48_Survivor.xlsx",
+    "Season 47": "data/Player_images_S47_Survivor.xlsx",
+}
 
 
 def load_point_values(path: str, league_name: str) -> pd.DataFrame:
     if league_name == "Bi-coastal Elites":
-        df = pd.read_excel(path, "PointValues_Survivor")[["Event", "Points"]]
+        df = read_sheet(path, "PointValues_Survivor")[["Event", "Points"]]
     else:
         df = pd.read_csv(path)[["Event", "Points"]]
-    df["Event"] = df["Event"].astype(str).str.strip()
-    return df.dropna(subset=["Event", "Points"]).drop_duplicates("Event")
+    return normalize_point_values(df)
+
+
+CONNECTION_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,
+    "cache_size": -16000,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,
+}
+POOL_SIZE = 8
+
+# Callables run against every newly opened connection (tracing, plan capture, ...).
+_CONNECTION_HOOKS: list[Callable[[sqlite3.Connection], None]] = []
+# sqlite3.Connection subclass new connections are created with (see sql_trace.py).
+_CONNECTION_FACTORY: type[sqlite3.Connection] = sqlite3.Connection
+
+
+class _ConnectionPool:
+    """Idle SQLite connections for one database file, tuned once when opened and reused across reruns."""
+
+    def __init__(self, path: Path, readonly: bool, size: int = POOL_SIZE) -> None:
+        self.path = path
+        self.readonly = readonly
+        self.size = size
+        self._idle: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, factory=_CONNECTION_FACTORY)
+        conn.row_factory = sqlite3.Row
+        if not self.readonly:
+            conn.execute("PRAGMA journal_mode=WAL")
+        for pragma, value in CONNECTION_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        if self.readonly:
+            conn.execute("PRAGMA query_only=ON")
+        for hook in _CONNECTION_HOOKS:
+            hook(conn)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_POOLS: dict[tuple[str, bool], _ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _pool_for(readonly: bool, path: Path | None = None) -> _ConnectionPool:
+    path = DB_PATH if path is None else path
+    key = (str(path), readonly)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = _ConnectionPool(path, readonly)
+    return pool
+
+
+@contextmanager
+def get_conn(readonly: bool = False) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled connection for one unit of work.
+
+    The block runs as a single transaction (committed on success, rolled back on
+    error) and the connection goes back to the pool afterwards. Read-only handles
+    refuse writes, so dashboards and list helpers never take the write lock.
+    Writes made while the app is serving go through submit_write() instead;
+    direct write connections are for migrations and bulk seeding.
+    """
+    pool = _pool_for(readonly)
+    conn = pool.acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.release(conn)
+
+
+def close_all_connections() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def add_connection_hook(hook: Callable[[sqlite3.Connection], None]) -> None:
+    """Register a hook for connections opened from now on; call close_all_connections() to apply it everywhere."""
+    _CONNECTION_HOOKS.append(hook)
+
+
+def remove_connection_hook(hook: Callable[[sqlite3.Connection], None]) -> None:
+    if hook in _CONNECTION_HOOKS:
+        _CONNECTION_HOOKS.remove(hook)
+
+
+def set_connection_factory(factory: type[sqlite3.Connection] | None) -> None:
+    """Open connections as factory (None restores sqlite3.Connection); pooled connections are closed so it applies everywhere."""
+    global _CONNECTION_FACTORY
+    _CONNECTION_FACTORY = factory or sqlite3.Connection
+    close_all_connections()
+
+
+WRITE_QUEUE_SIZE = 256        # pending writes before submit_write() blocks the caller
+WRITE_BATCH_SIZE = 64         # writes committed together at most
+WRITE_SUBMIT_TIMEOUT = 10.0   # seconds a caller waits for queue space before WriteQueueFull
+WRITE_STATS_WINDOW = 5000     # recent writes/batches kept for write_queue_stats()
+
+
+class WriteQueueFull(RuntimeError):
+    """The write queue stayed full for the whole submit timeout."""
+
+
+@dataclass
+class _Mutation:
+    fn: Callable[[sqlite3.Connection], object]
+    future: Future
+    path: Path
+    queued_at: float
+
+
+class _WriteQueue:
+    """
+    One writer thread for every write the app makes.
+
+    Callers enqueue a mutation (a function of a connection) and get a Future.
+    The writer drains whatever is pending, up to WRITE_BATCH_SIZE, into one
+    BEGIN IMMEDIATE transaction, runs each mutation inside its own SAVEPOINT
+    (so one that raises is rolled back alone) and commits once. Futures
+    resolve only after that commit. SQLite therefore sees a single writer from
+    this process, and a burst of saves costs one commit per batch; readers
+    keep going against the WAL snapshot meanwhile.
+    """
+
+    def __init__(self, size: int = WRITE_QUEUE_SIZE, batch_size: int = WRITE_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self._queue: queue.Queue[_Mutation] = queue.Queue(maxsize=size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=WRITE_STATS_WINDOW)
+        self._batch_sizes: deque[int] = deque(maxlen=WRITE_STATS_WINDOW)
+        self._counts = dict.fromkeys(("submitted", "committed", "failed", "rejected", "batches", "max_depth"), 0)
+        self._blocked_seconds = 0.0
+
+    def submit(self, fn: Callable[[sqlite3.Connection], object], timeout: float = WRITE_SUBMIT_TIMEOUT) -> Future:
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Queued writes cannot submit further writes")
+        self._start()
+        mutation = _Mutation(fn, Future(), Path(DB_PATH), time.perf_counter())
+        try:
+            self._queue.put_nowait(mutation)
+        except queue.Full:
+            # Backpressure: wait for the writer to make room rather than grow without bound.
+            started = time.perf_counter()
+            try:
+                self._queue.put(mutation, timeout=timeout)
+            except queue.Full:
+                with self._lock:
+                    self._counts["rejected"] += 1
+                raise WriteQueueFull(f"{self._queue.maxsize} writes still pending after {timeout:g}s") from None
+            finally:
+                with self._lock:
+                    self._blocked_seconds += time.perf_counter() - started
+        with self._lock:
+            self._counts["submitted"] += 1
+            self._counts["max_depth"] = max(self._counts["max_depth"], self._queue.qsize())
+        return mutation.future
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # One transaction per database file, in submission order.
+            start = 0
+            while start < len(batch):
+                end = start + 1
+                while end < len(batch) and batch[end].path == batch[start].path:
+                    end += 1
+                self._commit(batch[start:end])
+                start = end
+
+    def _commit(self, batch: list[_Mutation]) -> None:
+        started = time.perf_counter()
+        batch = [m for m in batch if m.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes: list[tuple[_Mutation, object, Exception | None]] = []
+        pool, conn = _pool_for(False, batch[0].path), None
+        try:
+            with span("backend.write_batch"):
+                conn = pool.acquire()
+                conn.execute("BEGIN IMMEDIATE")
+                for mutation in batch:
+                    conn.execute("SAVEPOINT queued_write")
+                    try:
+                        outcomes.append((mutation, mutation.fn(conn), None))
+                    except Exception as exc:
+                        conn.execute("ROLLBACK TO queued_write")
+                        outcomes.append((mutation, None, exc))
+                    conn.execute("RELEASE queued_write")
+                conn.commit()
+        except Exception as exc:
+            # Opening, BEGIN, a rollback or COMMIT failed: nothing in this batch was written.
+            outcomes = [(mutation, None, exc) for mutation in batch]
+        finally:
+            if conn is not None:
+                pool.release(conn)
+
+        for mutation, result, exc in outcomes:
+            if exc is None:
+                mutation.future.set_result(result)
+            else:
+                mutation.future.set_exception(exc)
+        failed = sum(exc is not None for _, _, exc in outcomes)
+        with self._lock:
+            self._counts["batches"] += 1
+            self._counts["committed"] += len(outcomes) - failed
+            self._counts["failed"] += failed
+            self._batch_sizes.append(len(batch))
+            self._waits.extend((started - m.queued_at) * 1000 for m in batch)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            counts = dict(self._counts)
+            waits = list(self._waits)
+            sizes = list(self._batch_sizes)
+            blocked = self._blocked_seconds
+        return {
+            "depth": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            **counts,
+            "mean_batch": float(np.mean(sizes)) if sizes else 0.0,
+            "max_batch": max(sizes, default=0),
+            "wait_p50_ms": float(np.percentile(waits, 50)) if waits else 0.0,
+            "wait_p95_ms": float(np.percentile(waits, 95)) if waits else 0.0,
+            "blocked_ms": blocked * 1000,
+        }
+
+
+_WRITER = _WriteQueue()
+
+
+def submit_write(fn: Callable[[sqlite3.Connection], object], timeout: float = WRITE_SUBMIT_TIMEOUT) -> Future:
+    """
+    Queue fn(conn) for the writer thread. The Future resolves to fn's result
+    (or its exception) once the batch it ran in has committed; raises
+    WriteQueueFull if no room frees up within timeout.
+    """
+    return _WRITER.submit(fn, timeout)
+
+
+def _write(fn: Callable[[sqlite3.Connection], object]) -> object:
+    return submit_write(fn).result()
+
 
-def get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+def write_queue_stats() -> dict[str, float]:
+    """Queue depth, throughput, batch sizes, queue wait percentiles and time callers spent blocked."""
+    return _WRITER.stats()
+
+
+PBKDF2_ITERATIONS = 120000
+# PBKDF2 releases the GIL, so a few threads hash in parallel while the pool caps
+# how many cores a login burst can take from everyone else's reruns. Callers
+# still wait for their own hash.
+HASH_WORKERS = 4
+LOGIN_ATTEMPTS = 5          # password checks allowed per username ...
+LOGIN_WINDOW = 60.0         # ... per this many seconds
+SESSION_TTL = 14 * 24 * 3600
+
+_HASH_POOL = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="pbkdf2")
+# Ordered by each username's latest recorded attempt, so expired ones sit at the front.
+_LOGIN_ATTEMPTS: "OrderedDict[str, deque[float]]" = OrderedDict()
+_LOGIN_ATTEMPTS_LOCK = threading.Lock()
 
 
 def _hash_password(password: str, salt: bytes | None = None) -> str:
+    """
+    PBKDF2 on _HASH_POOL. This blocks the calling (script) thread for the full
+    hash; the pool only bounds how many hashes run at once across sessions.
+    """
     salt = salt or os.urandom(16)
-    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 120000)
+    digest = _HASH_POOL.submit(
+        hashlib.pbkdf2_hmac, "sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS
+    ).result()
     return f"{salt.hex()}:{digest.hex()}"
 
 
 def _verify_password(password: str, stored_hash: str) -> bool:
     salt_hex, hash_hex = stored_hash.split(":", 1)
     recomputed = _hash_password(password, bytes.fromhex(salt_hex)).split(":", 1)[1]
-    return hash_hex == recomputed
+    return hmac.compare_digest(hash_hex, recomputed)
 
 
-def init_db(force_seed: bool = False) -> None:
+def login_retry_after(username: str) -> float:
+    """Seconds until username may try another password (0 when not rate limited)."""
+    now = time.monotonic()
+    with _LOGIN_ATTEMPTS_LOCK:
+        attempts = _LOGIN_ATTEMPTS.get(username.strip())
+        if not attempts or len(attempts) < LOGIN_ATTEMPTS:
+            return 0.0
+        return max(0.0, attempts[0] + LOGIN_WINDOW - now)
+
+
+def _prune_login_attempts(now: float) -> None:
+    # Submitted usernames are arbitrary, so entries are dropped once their window
+    # has passed. Live entries are never evicted early: made-up names cost an
+    # attacker nothing, and pushing a limited username out would reset its limit.
+    # The map is therefore bounded by the usernames tried within one LOGIN_WINDOW.
+    while _LOGIN_ATTEMPTS:
+        attempts = next(iter(_LOGIN_ATTEMPTS.values()))
+        if attempts and attempts[-1] > now - LOGIN_WINDOW:
+            break
+        _LOGIN_ATTEMPTS.popitem(last=False)
+
+
+def _take_login_attempt(username: str) -> bool:
+    now = time.monotonic()
+    with _LOGIN_ATTEMPTS_LOCK:
+        _prune_login_attempts(now)
+        attempts = _LOGIN_ATTEMPTS.setdefault(username, deque())
+        while attempts and attempts[0] <= now - LOGIN_WINDOW:
+            attempts.popleft()
+        allowed = len(attempts) < LOGIN_ATTEMPTS
+        if allowed:
+            attempts.append(now)
+            _LOGIN_ATTEMPTS.move_to_end(username)
+        return allowed
+
+
+def _clear_login_attempts(username: str) -> None:
+    with _LOGIN_ATTEMPTS_LOCK:
+        _LOGIN_ATTEMPTS.pop(username, None)
+
+
+def _execute_statements(conn: sqlite3.Connection, script: str) -> None:
+    # executescript() would COMMIT the migration transaction, so run statements one by one.
+    for statement in script.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def _migrate_base_schema(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            is_admin INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS leagues (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS seasons (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            label TEXT UNIQUE NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            league_id INTEGER NOT NULL,
+            season_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            UNIQUE(league_id, season_id, name),
+            FOREIGN KEY (league_id) REFERENCES leagues(id),
+            FOREIGN KEY (season_id) REFERENCES seasons(id)
+        );
+        CREATE TABLE IF NOT EXISTS roster_players (
+            team_id INTEGER NOT NULL,
+            player_name TEXT NOT NULL,
+            PRIMARY KEY(team_id, player_name),
+            FOREIGN KEY(team_id) REFERENCES teams(id)
+        );
+        CREATE TABLE IF NOT EXISTS user_teams (
+            user_id INTEGER NOT NULL,
+            team_id INTEGER NOT NULL,
+            PRIMARY KEY(user_id, team_id),
+            FOREIGN KEY(user_id) REFERENCES users(id),
+            FOREIGN KEY(team_id) REFERENCES teams(id)
+        );
+        CREATE TABLE IF NOT EXISTS point_values (
+            season_id INTEGER NOT NULL,
+            event_name TEXT NOT NULL,
+            points REAL NOT NULL,
+            PRIMARY KEY(season_id, event_name),
+            FOREIGN KEY(season_id) REFERENCES seasons(id)
+        );
+        CREATE TABLE IF NOT EXISTS player_event_scores (
+            season_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            player_name TEXT NOT NULL,
+            event_name TEXT NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY(season_id, week_number, player_name, event_name),
+            FOREIGN KEY(season_id) REFERENCES seasons(id)
+        );
+        CREATE TABLE IF NOT EXISTS weekly_question_scores (
+            team_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            points REAL NOT NULL,
+            PRIMARY KEY(team_id, week_number),
+            FOREIGN KEY(team_id) REFERENCES teams(id)
+        );
+        """,
+    )
+
+
+def _migrate_team_week_scores(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS team_week_scores (
+            team_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            player_points REAL NOT NULL DEFAULT 0,
+            bonus_points REAL NOT NULL DEFAULT 0,
+            week_total REAL NOT NULL DEFAULT 0,
+            cumulative_total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY(team_id, week_number),
+            FOREIGN KEY(team_id) REFERENCES teams(id)
+        );
+        """,
+    )
+    has_scores = conn.execute("SELECT 1 FROM player_event_scores LIMIT 1").fetchone()
+    has_materialized = conn.execute("SELECT 1 FROM team_week_scores LIMIT 1").fetchone()
+    if has_scores and not has_materialized:
+        _rebuild_team_week_scores(conn)
+
+
+def _migrate_data_versions(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            league_id INTEGER NOT NULL,
+            season_id INTEGER NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY(league_id, season_id),
+            FOREIGN KEY(league_id) REFERENCES leagues(id),
+            FOREIGN KEY(season_id) REFERENCES seasons(id)
+        );
+        """,
+    )
+
+
+def _migrate_scoring_indexes(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE INDEX IF NOT EXISTS idx_player_event_scores_season_player
+            ON player_event_scores(season_id, player_name, week_number, event_name, value);
+        CREATE INDEX IF NOT EXISTS idx_roster_players_player
+            ON roster_players(player_name, team_id);
+        CREATE INDEX IF NOT EXISTS idx_teams_season_league
+            ON teams(season_id, league_id);
+        """,
+    )
+
+
+def _migrate_sessions(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            token_hash TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);
+        CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id);
+        CREATE TABLE IF NOT EXISTS app_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        """,
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO app_settings(key, value) VALUES ('session_secret', ?)", (secrets.token_hex(32),)
+    )
+
+
+# First matching rule wins; anything unmatched is "other". Admin overrides
+# (is_override=1) are never re-derived.
+EVENT_CATEGORY_RULES: list[tuple[str, str]] = [
+    ("elimination", "eliminat|exits|kicked off|fire making|rocks|voluntar|voted out|first boot"),
+    ("idol", "idol|advantage|shot in (the )?dark|extra vote|steals"),
+    ("challenge", "immunity|reward|challenge"),
+    ("placement", r"\bplace\b|winner of survivor|makes it to merge"),
+    ("bonus", "correctly pick|most itms"),
+    ("social", "vote|tribal|journey|juror"),
+]
+EVENT_CATEGORIES = tuple(category for category, _ in EVENT_CATEGORY_RULES) + ("other",)
+_CATEGORY_REGEXES = [(category, re.compile(pattern, re.IGNORECASE)) for category, pattern in EVENT_CATEGORY_RULES]
+
+
+def categorize_event(event_name: str) -> str:
+    for category, regex in _CATEGORY_REGEXES:
+        if regex.search(event_name):
+            return category
+    return "other"
+
+
+def _categorize_events(conn: sqlite3.Connection, season_id: int) -> int:
+    """Give every point_values event of the season without an event_categories row its rule-based category."""
+    missing = [
+        r["event_name"]
+        for r in conn.execute(
+            """
+            SELECT pv.event_name FROM point_values pv
+            LEFT JOIN event_categories ec ON ec.season_id=pv.season_id AND ec.event_name=pv.event_name
+            WHERE pv.season_id=? AND ec.event_name IS NULL
+            """,
+            (season_id,),
+        )
+    ]
+    conn.executemany(
+        "INSERT INTO event_categories(season_id, event_name, category) VALUES (?,?,?)",
+        [(season_id, name, categorize_event(name)) for name in missing],
+    )
+    return len(missing)
+
+
+def _migrate_event_categories(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS event_categories (
+            season_id INTEGER NOT NULL,
+            event_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            is_override INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY(season_id, event_name),
+            FOREIGN KEY(season_id) REFERENCES seasons(id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_event_categories_category
+            ON event_categories(season_id, category, event_name);
+        """,
+    )
+    for row in conn.execute("SELECT id FROM seasons").fetchall():
+        _categorize_events(conn, row["id"])
+
+
+def _migrate_weekly_questions(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS weekly_questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            league_id INTEGER NOT NULL,
+            season_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            question TEXT NOT NULL,
+            correct_answer TEXT,
+            is_voided INTEGER NOT NULL DEFAULT 0,
+            UNIQUE(league_id, season_id, week_number, position),
+            FOREIGN KEY(league_id) REFERENCES leagues(id),
+            FOREIGN KEY(season_id) REFERENCES seasons(id)
+        );
+        CREATE TABLE IF NOT EXISTS team_answers (
+            question_id INTEGER NOT NULL,
+            team_id INTEGER NOT NULL,
+            answer TEXT,
+            is_correct INTEGER,
+            PRIMARY KEY(question_id, team_id),
+            FOREIGN KEY(question_id) REFERENCES weekly_questions(id),
+            FOREIGN KEY(team_id) REFERENCES teams(id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_team_answers_team ON team_answers(team_id, is_correct);
+        """,
+    )
+    # Databases seeded before this migration get their questions from the same workbooks.
+    for league_name, seasons in LEAGUE_CONFIG.items():
+        for season_label, paths in seasons.items():
+            team_ids = {
+                r["name"]: r["id"]
+                for r in conn.execute(
+                    """
+                    SELECT t.id, t.name FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id
+                    WHERE l.name=? AND s.label=?
+                    """,
+                    (league_name, season_label),
+                )
+            }
+            sheet = read_workbook(paths["scores"]).get("Weekly_Questions") if team_ids else None
+            if sheet is not None:
+                _ingest_weekly_questions(conn, team_ids, sheet)
+
+
+def _migrate_players(conn: sqlite3.Connection) -> None:
+    _execute_statements(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS players (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            season_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            is_eliminated INTEGER NOT NULL DEFAULT 0,
+            UNIQUE(season_id, name),
+            FOREIGN KEY(season_id) REFERENCES seasons(id)
+        );
+        CREATE TABLE IF NOT EXISTS player_images (
+            player_id INTEGER PRIMARY KEY,
+            image_url TEXT NOT NULL,
+            FOREIGN KEY(player_id) REFERENCES players(id)
+        );
+        CREATE TABLE IF NOT EXISTS eliminations (
+            player_id INTEGER PRIMARY KEY,
+            season_id INTEGER NOT NULL,
+            elimination_order INTEGER NOT NULL,
+            week_label TEXT NOT NULL,
+            UNIQUE(season_id, elimination_order),
+            FOREIGN KEY(player_id) REFERENCES players(id),
+            FOREIGN KEY(season_id) REFERENCES seasons(id)
+        );
+        """,
+    )
+    for row in conn.execute("SELECT id, label FROM seasons").fetchall():
+        if row["label"] in PLAYER_IMAGES:
+            _ingest_players(conn, row["id"], read_workbook(PLAYER_IMAGES[row["label"]]))
+
+
+# Ordered, append-only. Each entry runs exactly once per database, inside one transaction.
+MIGRATIONS = [
+    (1, "base schema", _migrate_base_schema),
+    (2, "materialized team_week_scores", _migrate_team_week_scores),
+    (3, "data_versions counters", _migrate_data_versions),
+    (4, "covering indexes for scoring joins", _migrate_scoring_indexes),
+    (5, "login sessions", _migrate_sessions),
+    (6, "event categories", _migrate_event_categories),
+    (7, "weekly questions and graded team answers", _migrate_weekly_questions),
+    (8, "players, images and eliminations", _migrate_players),
+]
+
+
+def schema_version() -> int:
+    with get_conn(readonly=True) as conn:
+        return _schema_version(conn)
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='schema_version'"
+    ).fetchone()
+    if not has_table:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) AS v FROM schema_version").fetchone()["v"]
+
+
+@timed("backend.migrate")
+def migrate() -> int:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     with get_conn() as conn:
-        conn.executescript(
+        conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                is_admin INTEGER NOT NULL DEFAULT 0
-            );
-            CREATE TABLE IF NOT EXISTS leagues (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            );
-            CREATE TABLE IF NOT EXISTS seasons (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                label TEXT UNIQUE NOT NULL
-            );
-            CREATE TABLE IF NOT EXISTS teams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                league_id INTEGER NOT NULL,
-                season_id INTEGER NOT NULL,
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
                 name TEXT NOT NULL,
-                UNIQUE(league_id, season_id, name),
-                FOREIGN KEY (league_id) REFERENCES leagues(id),
-                FOREIGN KEY (season_id) REFERENCES seasons(id)
-            );
-            CREATE TABLE IF NOT EXISTS roster_players (
-                team_id INTEGER NOT NULL,
-                player_name TEXT NOT NULL,
-                PRIMARY KEY(team_id, player_name),
-                FOREIGN KEY(team_id) REFERENCES teams(id)
-            );
-            CREATE TABLE IF NOT EXISTS user_teams (
-                user_id INTEGER NOT NULL,
-                team_id INTEGER NOT NULL,
-                PRIMARY KEY(user_id, team_id),
-                FOREIGN KEY(user_id) REFERENCES users(id),
-                FOREIGN KEY(team_id) REFERENCES teams(id)
-            );
-            CREATE TABLE IF NOT EXISTS point_values (
-                season_id INTEGER NOT NULL,
-                event_name TEXT NOT NULL,
-                points REAL NOT NULL,
-                PRIMARY KEY(season_id, event_name),
-                FOREIGN KEY(season_id) REFERENCES seasons(id)
-            );
-            CREATE TABLE IF NOT EXISTS player_event_scores (
-                season_id INTEGER NOT NULL,
-                week_number INTEGER NOT NULL,
-                player_name TEXT NOT NULL,
-                event_name TEXT NOT NULL,
-                value REAL NOT NULL,
-                PRIMARY KEY(season_id, week_number, player_name, event_name),
-                FOREIGN KEY(season_id) REFERENCES seasons(id)
-            );
-            CREATE TABLE IF NOT EXISTS weekly_question_scores (
-                team_id INTEGER NOT NULL,
-                week_number INTEGER NOT NULL,
-                points REAL NOT NULL,
-                PRIMARY KEY(team_id, week_number),
-                FOREIGN KEY(team_id) REFERENCES teams(id)
-            );
+                applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
             """
         )
+        # Take the write lock before reading the version so two processes never apply the same step.
+        conn.execute("BEGIN IMMEDIATE")
+        current = _schema_version(conn)
+        for version, name, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            apply(conn)
+            conn.execute("INSERT INTO schema_version(version, name) VALUES (?,?)", (version, name))
+            logger.info("Applied schema migration %d (%s)", version, name)
+            current = version
+    return current
+
+
+def init_db(force_seed: bool = False) -> None:
+    migrate()
     if force_seed:
         seed_from_legacy()
 
 
-def seed_from_legacy() -> None:
-    with get_conn() as conn:
-        existing = conn.execute("SELECT COUNT(*) AS c FROM teams").fetchone()["c"]
-        if existing:
+_BOOTSTRAPPED: set[str] = set()
+_BOOTSTRAP_LOCK = threading.Lock()
+
+
+def bootstrap(seed: bool = True) -> None:
+    """
+    Migrate (and optionally seed) the database once per server process.
+
+    Streamlit reruns the app script for every interaction; after the first call
+    this is a set lookup.
+    """
+    key = str(DB_PATH)
+    if key in _BOOTSTRAPPED:
+        return
+    with _BOOTSTRAP_LOCK:
+        if key in _BOOTSTRAPPED:
             return
-        for league_name, seasons in LEAGUE_CONFIG.items():
-            conn.execute("INSERT INTO leagues(name) VALUES (?)", (league_name,))
-            for season_label in seasons:
-                conn.execute("INSERT OR IGNORE INTO seasons(label) VALUES (?)", (season_label,))
+        init_db(force_seed=seed)
+        _BOOTSTRAPPED.add(key)
+
+
+def _legacy_team_name(column: str) -> str:
+    # Workbook headers drift on whitespace (e.g. "Schultz  & Big P"), so collapse it before matching teams.
+    return " ".join(str(column).split())
+
+
+def _player_event_rows(season_id: int, point_values: pd.DataFrame, raw_scores: pd.DataFrame) -> list[tuple]:
+    rows, events, counts = count_matrix(raw_scores, point_values["Event"].tolist())
+    row_idx, event_idx = np.nonzero(counts)
+    return list(
+        zip(
+            repeat(season_id),
+            rows["Week"].to_numpy(dtype=int)[row_idx].tolist(),
+            rows["Player"].astype(str).to_numpy()[row_idx].tolist(),
+            np.asarray(events, dtype=object)[event_idx].tolist(),
+            counts[row_idx, event_idx].tolist(),
+        )
+    )
+
+
+def _weekly_bonus_rows(weekly_bonus: pd.DataFrame, team_ids: dict[str, int]) -> list[tuple]:
+    melted = (
+        weekly_bonus.rename(columns=_legacy_team_name)
+        .dropna(subset=["Week"])
+        .melt(id_vars="Week", var_name="team_name", value_name="points")
+        .dropna(subset=["points"])
+    )
+    team_col = melted["team_name"].map(team_ids)
+    keep = team_col.notna().to_numpy()
+    return list(
+        zip(
+            team_col.to_numpy()[keep].astype(int).tolist(),
+            melted["Week"].to_numpy(dtype=int)[keep].tolist(),
+            melted["points"].to_numpy(dtype=float)[keep].tolist(),
+        )
+    )
+
+
+_TRUTHY = {"yes", "y", "true", "1"}
+
+
+@timed("backend.ingest_weekly_questions")
+def _ingest_weekly_questions(conn: sqlite3.Connection, team_ids: dict[str, int], sheet: pd.DataFrame) -> int:
+    """
+    Replace one league season's weekly questions with those in a legacy
+    Weekly_Questions sheet (Week, Question, Correct Answer, Is Voided, then
+    one answer column per team) and store every team's graded answer.
+    team_ids maps that league season's team names to ids; other columns are
+    ignored. Returns the number of questions.
+    """
+    sheet = sheet.rename(columns=_legacy_team_name)
+    sheet = sheet.assign(
+        Week=pd.to_numeric(sheet["Week"].astype(str).str.extract(r"(\d+)")[0], errors="coerce")
+    ).dropna(subset=["Week", "Question"])
+    sheet = sheet.reset_index(drop=True)
+    teams = [c for c in sheet.columns if c in team_ids]
+    voided = sheet["Is Voided"].astype(str).str.strip().str.lower().isin(_TRUTHY).to_numpy()
+    correct = grade_answers(sheet["Correct Answer"], sheet[teams])
+    weeks = sheet["Week"].astype(int)
+    positions = weeks.groupby(weeks).cumcount() + 1
+
+    any_team = next(iter(team_ids.values()))
+    league_id, season_id = conn.execute("SELECT league_id, season_id FROM teams WHERE id=?", (any_team,)).fetchone()
+    conn.execute(
+        """
+        DELETE FROM team_answers WHERE question_id IN (
+          SELECT id FROM weekly_questions WHERE league_id=? AND season_id=?
+        )
+        """,
+        (league_id, season_id),
+    )
+    conn.execute("DELETE FROM weekly_questions WHERE league_id=? AND season_id=?", (league_id, season_id))
+    answers = sheet["Correct Answer"].astype(object)
+    conn.executemany(
+        """
+        INSERT INTO weekly_questions(league_id,season_id,week_number,position,question,correct_answer,is_voided)
+        VALUES (?,?,?,?,?,?,?)
+        """,
+        zip(
+            repeat(league_id),
+            repeat(season_id),
+            weeks.tolist(),
+            positions.tolist(),
+            sheet["Question"].astype(str).str.strip().tolist(),
+            [None if pd.isna(a) else str(a).strip() for a in answers],
+            voided.astype(int).tolist(),
+        ),
+    )
+    question_ids = {
+        (r["week_number"], r["position"]): r["id"]
+        for r in conn.execute(
+            "SELECT id, week_number, position FROM weekly_questions WHERE league_id=? AND season_id=?",
+            (league_id, season_id),
+        )
+    }
+    ids = [question_ids[key] for key in zip(weeks.tolist(), positions.tolist())]
+    given = pd.Series(sheet[teams].to_numpy(dtype=object).ravel())
+    graded = correct.ravel().astype(object)
+    graded[np.repeat(voided, len(teams))] = None
+    conn.executemany(
+        "INSERT INTO team_answers(question_id,team_id,answer,is_correct) VALUES (?,?,?,?)",
+        zip(
+            np.repeat(ids, len(teams)).tolist(),
+            np.tile([team_ids[team] for team in teams], len(ids)).tolist(),
+            given.astype(str).str.strip().where(given.notna(), None).tolist(),
+            [None if g is None else int(g) for g in graded],
+        ),
+    )
+    return len(ids)
+
+
+@timed("backend.ingest_players")
+def _ingest_players(conn: sqlite3.Connection, season_id: int, sheets: dict[str, pd.DataFrame]) -> int:
+    """
+    Replace one season's players, image URLs and elimination timeline with
+    those in a legacy cast workbook (its Images and Elimination_Table
+    sheets). Returns the number of players.
+    """
+    images = sheets["Images"].dropna(subset=["Player"])
+    images = images.assign(Player=images["Player"].astype(str).str.strip()).drop_duplicates("Player")
+    eliminated = sheets["Elimination_Table"].dropna(subset=["Week", "Player"]).reset_index(drop=True)
+    eliminated = eliminated.assign(
+        Player=eliminated["Player"].astype(str).str.strip(), Week=eliminated["Week"].astype(str).str.strip()
+    )
+    # Named weeks ("PreSeason Week 1", "Finale") keep their listed order ahead of numbered weeks, which sort ascending.
+    numbered = pd.to_numeric(eliminated["Week"].where(eliminated["Week"].str.isdigit()), errors="coerce")
+    order = np.empty(len(eliminated), dtype=int)
+    order[np.lexsort((np.arange(len(eliminated)), numbered.fillna(0).to_numpy(), numbered.notna().to_numpy()))] = (
+        np.arange(len(eliminated))
+    )
 
+    conn.execute("DELETE FROM eliminations WHERE season_id=?", (season_id,))
+    conn.execute(
+        "DELETE FROM player_images WHERE player_id IN (SELECT id FROM players WHERE season_id=?)", (season_id,)
+    )
+    conn.execute("DELETE FROM players WHERE season_id=?", (season_id,))
+    names = pd.concat([images["Player"], eliminated["Player"]]).drop_duplicates()
+    flagged = set(images.loc[images["Eliminated"].astype(str).str.strip().str.lower().isin(_TRUTHY), "Player"])
+    conn.executemany(
+        "INSERT INTO players(season_id,name,is_eliminated) VALUES (?,?,?)",
+        [(season_id, name, int(name in flagged)) for name in names],
+    )
+    player_ids = {
+        r["name"]: r["id"] for r in conn.execute("SELECT id, name FROM players WHERE season_id=?", (season_id,))
+    }
+    with_image = images.dropna(subset=["Image"])
+    conn.executemany(
+        "INSERT INTO player_images(player_id,image_url) VALUES (?,?)",
+        zip([player_ids[name] for name in with_image["Player"]], with_image["Image"].astype(str).str.strip().tolist()),
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO eliminations(player_id,season_id,elimination_order,week_label) VALUES (?,?,?,?)",
+        zip(
+            [player_ids[name] for name in eliminated["Player"]],
+            repeat(season_id),
+            order.tolist(),
+            eliminated["Week"].tolist(),
+        ),
+    )
+    return len(player_ids)
+
+
+@timed("backend.seed_from_legacy")
+def seed_from_legacy() -> dict[str, float]:
+    """
+    Bulk-load the legacy workbooks into an empty database.
+
+    Leagues, seasons, teams and rosters go in first; each (league, season) then
+    gets its own transaction of executemany inserts. Returns row/timing stats.
+    """
+    started = time.perf_counter()
+    with get_conn() as conn:
+        if conn.execute("SELECT 1 FROM teams LIMIT 1").fetchone():
+            return {}
+        conn.executemany("INSERT INTO leagues(name) VALUES (?)", [(name,) for name in LEAGUE_CONFIG])
+        conn.executemany(
+            "INSERT OR IGNORE INTO seasons(label) VALUES (?)",
+            [(label,) for seasons in LEAGUE_CONFIG.values() for label in seasons],
+        )
         conn.execute(
             "INSERT OR IGNORE INTO users(username,password_hash,is_admin) VALUES (?,?,1)",
             ("admin", _hash_password("admin123")),
         )
+        league_ids = {r["name"]: r["id"] for r in conn.execute("SELECT id, name FROM leagues")}
+        season_ids = {r["label"]: r["id"] for r in conn.execute("SELECT id, label FROM seasons")}
+
+        conn.executemany(
+            "INSERT INTO teams(league_id,season_id,name) VALUES (?,?,?)",
+            [
+                (league_ids[league_name], season_ids[season_label], team_name)
+                for (league_name, season_label), teams in ROSTERS.items()
+                for team_name in teams
+            ],
+        )
+        team_ids = {
+            (r["league_name"], r["season_label"], r["team_name"]): r["id"]
+            for r in conn.execute(
+                """
+                SELECT t.id, l.name AS league_name, s.label AS season_label, t.name AS team_name
+                FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id
+                """
+            )
+        }
+        conn.executemany(
+            "INSERT INTO roster_players(team_id, player_name) VALUES (?,?)",
+            [
+                (team_ids[(league_name, season_label, team_name)], player)
+                for (league_name, season_label), teams in ROSTERS.items()
+                for team_name, players in teams.items()
+                for player in players
+            ],
+        )
+        for season_label, path in PLAYER_IMAGES.items():
+            if season_label in season_ids:
+                _ingest_players(conn, season_ids[season_label], read_workbook(path))
+
+    total_rows = 0
+    for league_name, seasons in LEAGUE_CONFIG.items():
+        for season_label, paths in seasons.items():
+            season_started = time.perf_counter()
+            season_id = season_ids[season_label]
+            point_values = load_point_values(paths["point_values"], league_name)
+            point_rows = list(
+                zip(repeat(season_id), point_values["Event"].tolist(), point_values["Points"].astype(float).tolist())
+            )
+            sheets = read_workbook(paths["scores"])
+            season_team_ids = {
+                name: tid for (lg, sn, name), tid in team_ids.items() if lg == league_name and sn == season_label
+            }
+            event_rows = _player_event_rows(season_id, point_values, sheets["PointsScored_Survivor"])
+            bonus_rows = _weekly_bonus_rows(sheets["Weekly_Pick_Scores"], season_team_ids)
 
-        for (league_name, season_label), teams in ROSTERS.items():
-            league_id = _id_for(conn, "leagues", "name", league_name)
-            season_id = _id_for(conn, "seasons", "label", season_label)
-            for team_name, players in teams.items():
-                conn.execute(
-                    "INSERT INTO teams(league_id,season_id,name) VALUES (?,?,?)",
-                    (league_id, season_id, team_name),
+            with get_conn() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO point_values(season_id,event_name,points) VALUES (?,?,?)", point_rows
+                )
+                _categorize_events(conn, season_id)
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO player_event_scores(season_id,week_number,player_name,event_name,value)
+                    VALUES (?,?,?,?,?)
+                    """,
+                    event_rows,
                 )
-                team_id = conn.execute(
-                    "SELECT id FROM teams WHERE league_id=? AND season_id=? AND name=?",
-                    (league_id, season_id, team_name),
-                ).fetchone()["id"]
-                for player in players:
-                    conn.execute(
-                        "INSERT INTO roster_players(team_id, player_name) VALUES (?,?)",
-                        (team_id, player),
-                    )
-
-        for league_name, seasons in LEAGUE_CONFIG.items():
-            for season_label, paths in seasons.items():
-                season_id = _id_for(conn, "seasons", "label", season_label)
-                point_values = load_point_values(paths["point_values"], league_name)
-                for _, row in point_values.iterrows():
-                    conn.execute(
-                        "INSERT OR REPLACE INTO point_values(season_id,event_name,points) VALUES (?,?,?)",
-                        (season_id, row["Event"], float(row["Points"])),
-                    )
-
-                raw_scores = pd.read_excel(paths["scores"], "PointsScored_Survivor")
-                event_cols = [e for e in point_values["Event"].tolist() if e in raw_scores.columns]
-                melted = raw_scores[["Player", "Week", *event_cols]].melt(
-                    id_vars=["Player", "Week"], var_name="event_name", value_name="value"
+                conn.executemany(
+                    "INSERT OR REPLACE INTO weekly_question_scores(team_id,week_number,points) VALUES (?,?,?)",
+                    bonus_rows,
                 )
-                melted["value"] = melted["value"].fillna(0)
-                melted = melted[melted["value"] != 0]
-                for _, row in melted.iterrows():
-                    conn.execute(
-                        """
-                        INSERT OR REPLACE INTO player_event_scores(season_id,week_number,player_name,event_name,value)
-                        VALUES (?,?,?,?,?)
-                        """,
-                        (season_id, int(row["Week"]), row["Player"], row["event_name"], float(row["value"])),
-                    )
-
-                weekly_bonus = pd.read_excel(paths["scores"], "Weekly_Pick_Scores")
-                for _, row in weekly_bonus.iterrows():
-                    week = int(row["Week"])
-                    for col in weekly_bonus.columns:
-                        if col == "Week" or pd.isna(row[col]):
-                            continue
-                        team_lookup = "Schultz & Big P" if col.strip() == "Schultz  & Big P" else col
-                        team_id = team_id_for(conn, league_name, season_label, team_lookup)
-                        if team_id:
-                            conn.execute(
-                                "INSERT OR REPLACE INTO weekly_question_scores(team_id,week_number,points) VALUES (?,?,?)",
-                                (team_id, week, float(row[col])),
-                            )
+                if "Weekly_Questions" in sheets and season_team_ids:
+                    _ingest_weekly_questions(conn, season_team_ids, sheets["Weekly_Questions"])
+
+            rows = len(point_rows) + len(event_rows) + len(bonus_rows)
+            elapsed = time.perf_counter() - season_started
+            total_rows += rows
+            logger.info(
+                "Seeded %s / %s: %d rows in %.2fs (%.0f rows/sec)",
+                league_name, season_label, rows, elapsed, rows / elapsed if elapsed else 0.0,
+            )
+
+    # point_values is per season and the last league seeded wins, so team_week_scores
+    # is rebuilt once per season after all of its leagues are in, not once per league.
+    for season_id in sorted({season_ids[label] for seasons in LEAGUE_CONFIG.values() for label in seasons}):
+        with get_conn() as conn:
+            _rebuild_team_week_scores(conn, season_id)
+            _bump_data_version(conn, season_id)
+
+    elapsed = time.perf_counter() - started
+    stats = {"rows": total_rows, "seconds": elapsed, "rows_per_sec": total_rows / elapsed if elapsed else 0.0}
+    logger.info("Seeded legacy workbooks: %(rows)d rows in %(seconds).2fs (%(rows_per_sec).0f rows/sec)", stats)
+    return stats
 
 
 def _id_for(conn: sqlite3.Connection, table: str, col: str, value: str) -> int:
@@ -228,28 +1094,108 @@ def _id_for(conn: sqlite3.Connection, table: str, col: str, value: str) -> int:
     return row["id"]
 
 
+@timed("backend.register_user")
 def register_user(username: str, password: str) -> tuple[bool, str]:
     if not username or not password:
         return False, "Username and password are required."
+    # Hash before queueing so the writer thread never waits on PBKDF2.
+    row = (username.strip(), _hash_password(password))
     try:
-        with get_conn() as conn:
-            conn.execute(
-                "INSERT INTO users(username,password_hash,is_admin) VALUES (?,?,0)",
-                (username.strip(), _hash_password(password)),
-            )
+        _write(lambda conn: conn.execute("INSERT INTO users(username,password_hash,is_admin) VALUES (?,?,0)", row))
         return True, "Account created."
     except sqlite3.IntegrityError:
         return False, "Username already exists."
 
 
+@timed("backend.authenticate_user")
 def authenticate_user(username: str, password: str) -> dict | None:
-    with get_conn() as conn:
-        row = conn.execute("SELECT * FROM users WHERE username=?", (username.strip(),)).fetchone()
+    """
+    Check a password. Returns None for bad credentials and also, without
+    hashing anything, once a username is over LOGIN_ATTEMPTS per LOGIN_WINDOW
+    (see login_retry_after).
+    """
+    username = username.strip()
+    if not _take_login_attempt(username):
+        return None
+    with get_conn(readonly=True) as conn:
+        row = conn.execute("SELECT * FROM users WHERE username=?", (username,)).fetchone()
     if row and _verify_password(password, row["password_hash"]):
+        _clear_login_attempts(username)
         return dict(row)
     return None
 
 
+_SESSION_SECRETS: dict[str, bytes] = {}
+
+
+def _session_secret() -> bytes:
+    key = str(DB_PATH)
+    if key not in _SESSION_SECRETS:
+        with get_conn(readonly=True) as conn:
+            row = conn.execute("SELECT value FROM app_settings WHERE key='session_secret'").fetchone()
+        _SESSION_SECRETS[key] = bytes.fromhex(row["value"])
+    return _SESSION_SECRETS[key]
+
+
+def _token_signature(nonce: str, expires_at: int) -> str:
+    return hmac.new(_session_secret(), f"{nonce}.{expires_at}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _token_hash(nonce: str) -> str:
+    return hashlib.sha256(nonce.encode("utf-8")).hexdigest()
+
+
+def create_session(user_id: int, ttl: float = SESSION_TTL) -> str:
+    """
+    Issue a signed, expiring session token for user_id.
+
+    The token is "<nonce>.<expires_at>.<hmac>"; only a hash of the nonce is
+    stored, so a leaked sessions table can't be replayed.
+    """
+    nonce = secrets.token_urlsafe(24)
+    now = time.time()
+    expires_at = int(now + ttl)
+
+    def write(conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "INSERT INTO sessions(token_hash, user_id, created_at, expires_at) VALUES (?,?,?,?)",
+            (_token_hash(nonce), user_id, now, expires_at),
+        )
+
+    _write(write)
+    return f"{nonce}.{expires_at}.{_token_signature(nonce, expires_at)}"
+
+
+@timed("backend.user_for_session")
+def user_for_session(token: str | None) -> dict | None:
+    """The user a live session token belongs to, or None. No password hashing involved."""
+    try:
+        nonce, expires_raw, signature = (token or "").split(".")
+        expires_at = int(expires_raw)
+    except ValueError:
+        return None
+    if expires_at <= time.time() or not hmac.compare_digest(signature, _token_signature(nonce, expires_at)):
+        return None
+    with get_conn(readonly=True) as conn:
+        row = conn.execute(
+            """
+            SELECT u.* FROM sessions s
+            JOIN users u ON u.id = s.user_id
+            WHERE s.token_hash = ? AND s.expires_at > ?
+            """,
+            (_token_hash(nonce), time.time()),
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def revoke_session(token: str | None) -> None:
+    nonce = (token or "").split(".")[0]
+    if nonce:
+        _write(lambda conn: conn.execute("DELETE FROM sessions WHERE token_hash = ?", (_token_hash(nonce),)))
+
+
+@timed("backend.list_league_season_options_for_user")
 def list_league_season_options_for_user(user_id: int) -> pd.DataFrame:
     query = """
     SELECT t.id AS team_id, t.name AS team_name, l.name AS league_name, s.label AS season_label
@@ -260,18 +1206,20 @@ def list_league_season_options_for_user(user_id: int) -> pd.DataFrame:
     WHERE ut.user_id=?
     ORDER BY s.label DESC, l.name, t.name
     """
-    with get_conn() as conn:
+    with get_conn(readonly=True) as conn:
         return pd.read_sql_query(query, conn, params=[user_id])
 
 
 def assign_team(username: str, league_name: str, season_label: str, team_name: str) -> tuple[bool, str]:
-    with get_conn() as conn:
+    def write(conn: sqlite3.Connection) -> tuple[bool, str]:
         user = conn.execute("SELECT id FROM users WHERE username=?", (username,)).fetchone()
         team_id = team_id_for(conn, league_name, season_label, team_name)
         if not user or not team_id:
             return False, "User or team not found."
         conn.execute("INSERT OR IGNORE INTO user_teams(user_id,team_id) VALUES (?,?)", (user["id"], team_id))
-    return True, "Team linked."
+        return True, "Team linked."
+
+    return _write(write)
 
 
 def team_id_for(conn: sqlite3.Connection, league_name: str, season_label: str, team_name: str) -> int | None:
@@ -287,159 +1235,543 @@ def team_id_for(conn: sqlite3.Connection, league_name: str, season_label: str, t
     return row["id"] if row else None
 
 
+@timed("backend.list_all_teams")
 def list_all_teams() -> pd.DataFrame:
     query = """
     SELECT l.name AS league_name, s.label AS season_label, t.name AS team_name
     FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id
     ORDER BY s.label DESC, l.name, t.name
     """
-    with get_conn() as conn:
+    with get_conn(readonly=True) as conn:
         return pd.read_sql_query(query, conn)
 
 
-def _team_weekly_points(conn: sqlite3.Connection, team_id: int) -> pd.DataFrame:
-    query = """
-    WITH team_info AS (
-      SELECT t.id AS team_id, t.season_id
-      FROM teams t WHERE t.id=?
-    ), player_points AS (
-      SELECT pes.week_number, SUM(pes.value * pv.points) AS player_points
-      FROM player_event_scores pes
-      JOIN team_info ti ON pes.season_id=ti.season_id
-      JOIN roster_players rp ON rp.player_name=pes.player_name AND rp.team_id=ti.team_id
-      JOIN point_values pv ON pv.season_id=pes.season_id AND pv.event_name=pes.event_name
-      GROUP BY pes.week_number
-    )
-    SELECT pp.week_number,
-           pp.player_points,
-           COALESCE(wqs.points, 0) AS bonus_points,
-           pp.player_points + COALESCE(wqs.points,0) AS week_total
-    FROM player_points pp
-    LEFT JOIN weekly_question_scores wqs ON wqs.team_id=? AND wqs.week_number=pp.week_number
-    ORDER BY pp.week_number
-    """
-    df = pd.read_sql_query(query, conn, params=[team_id, team_id])
-    if df.empty:
-        return df
-    df["cumulative_total"] = df["week_total"].cumsum()
-    return df
+@dataclass(frozen=True)
+class RosterIndex:
+    """One league season's rosters keyed every way the tabs look them up; teams and players keep their draft order."""
 
+    version: int
+    team_ids: dict[tuple[str, str, str], int]
+    teams_by_league_season: dict[tuple[str, str], tuple[str, ...]]
+    players_by_team: dict[int, tuple[str, ...]]
+    teams_by_player: dict[tuple[str, str, str], tuple[str, ...]]
 
-def build_team_dashboard(team_id: int) -> dict[str, pd.DataFrame | float | int]:
-    with get_conn() as conn:
-        weekly = _team_weekly_points(conn, team_id)
-        row = conn.execute(
-            """
-            SELECT t.name AS team_name, l.name AS league_name, s.label AS season_label
-            FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id
-            WHERE t.id=?
-            """,
-            (team_id,),
-        ).fetchone()
-        standings = pd.read_sql_query(
-            """
-            SELECT t.id AS team_id, t.name AS team_name,
-                   COALESCE(SUM(pes.value * pv.points),0) + COALESCE(SUM(wqs.points),0) AS total_points
-            FROM teams t
-            JOIN leagues l ON l.id=t.league_id
-            JOIN seasons s ON s.id=t.season_id
-            LEFT JOIN roster_players rp ON rp.team_id=t.id
-            LEFT JOIN player_event_scores pes ON pes.player_name=rp.player_name AND pes.season_id=t.season_id
-            LEFT JOIN point_values pv ON pv.season_id=pes.season_id AND pv.event_name=pes.event_name
-            LEFT JOIN weekly_question_scores wqs ON wqs.team_id=t.id
-            WHERE l.name=? AND s.label=?
-            GROUP BY t.id, t.name
-            ORDER BY total_points DESC
-            """,
-            conn,
-            params=[row["league_name"], row["season_label"]],
-        )
+    def teams(self, league_name: str, season_label: str) -> tuple[str, ...]:
+        return self.teams_by_league_season.get((league_name, season_label), ())
 
-        player_weekly = pd.read_sql_query(
-            """
-            SELECT pes.week_number,
-                   rp.player_name,
-                   SUM(pes.value * pv.points) AS points
-            FROM roster_players rp
-            JOIN teams t ON t.id=rp.team_id
-            JOIN player_event_scores pes ON pes.player_name=rp.player_name AND pes.season_id=t.season_id
-            JOIN point_values pv ON pv.season_id=pes.season_id AND pv.event_name=pes.event_name
-            WHERE rp.team_id=?
-            GROUP BY pes.week_number, rp.player_name
-            ORDER BY pes.week_number, points DESC, rp.player_name
-            """,
-            conn,
-            params=[team_id],
-        )
+    def players(self, league_name: str, season_label: str, team_name: str) -> tuple[str, ...]:
+        team_id = self.team_ids.get((league_name, season_label, team_name))
+        return self.players_by_team.get(team_id, ())
 
-        event_breakdown = pd.read_sql_query(
-            """
-            SELECT pes.week_number,
-                   rp.player_name,
-                   pes.event_name,
-                   pes.value,
-                   pv.points,
-                   (pes.value * pv.points) AS event_points
-            FROM roster_players rp
-            JOIN teams t ON t.id=rp.team_id
-            JOIN player_event_scores pes ON pes.player_name=rp.player_name AND pes.season_id=t.season_id
-            JOIN point_values pv ON pv.season_id=pes.season_id AND pv.event_name=pes.event_name
-            WHERE rp.team_id=?
-            ORDER BY pes.week_number DESC, event_points DESC, rp.player_name
-            """,
-            conn,
-            params=[team_id],
+    def rosters(self, league_name: str, season_label: str) -> dict[str, tuple[str, ...]]:
+        return {
+            team: self.players(league_name, season_label, team) for team in self.teams(league_name, season_label)
+        }
+
+    def player_teams(self, league_name: str, season_label: str, player_name: str) -> tuple[str, ...]:
+        return self.teams_by_player.get((league_name, season_label, player_name), ())
+
+
+ROSTER_CACHE_SIZE = 256  # league season roster indexes kept per process
+
+# Keyed by database and (league, season), tagged with that pair's data version like the
+# standings and dashboard caches below.
+_ROSTER_CACHE: "OrderedDict[tuple[str, str, str], tuple[int, RosterIndex]]" = OrderedDict()
+_ROSTER_LOCK = threading.Lock()
+
+
+@timed("backend.load_roster_index")
+def _load_roster_index(conn: sqlite3.Connection, league_name: str, season_label: str, version: int) -> RosterIndex:
+    team_ids: dict[tuple[str, str, str], int] = {}
+    teams_by_league_season: dict[tuple[str, str], list[str]] = {}
+    players_by_team: dict[int, list[str]] = {}
+    teams_by_player: dict[tuple[str, str, str], list[str]] = {}
+    rows = conn.execute(
+        """
+        SELECT l.name AS league_name, s.label AS season_label, t.id AS team_id, t.name AS team_name, rp.player_name
+        FROM teams t
+        JOIN leagues l ON t.league_id=l.id
+        JOIN seasons s ON t.season_id=s.id
+        LEFT JOIN roster_players rp ON rp.team_id=t.id
+        WHERE l.name=? AND s.label=?
+        ORDER BY t.id, rp.rowid
+        """,
+        (league_name, season_label),
+    )
+    for league_name, season_label, team_id, team_name, player_name in rows:
+        if team_id not in players_by_team:
+            team_ids[(league_name, season_label, team_name)] = team_id
+            teams_by_league_season.setdefault((league_name, season_label), []).append(team_name)
+            players_by_team[team_id] = []
+        if player_name is not None:
+            players_by_team[team_id].append(player_name)
+            teams_by_player.setdefault((league_name, season_label, player_name), []).append(team_name)
+    return RosterIndex(
+        version=version,
+        team_ids=team_ids,
+        teams_by_league_season={k: tuple(v) for k, v in teams_by_league_season.items()},
+        players_by_team={k: tuple(v) for k, v in players_by_team.items()},
+        teams_by_player={k: tuple(v) for k, v in teams_by_player.items()},
+    )
+
+
+@timed("backend.get_roster_index")
+def get_roster_index(league_name: str, season_label: str) -> RosterIndex:
+    """The shared roster index for one league season, reloaded only after its data version moves."""
+    key = (str(DB_PATH), league_name, season_label)
+    with get_conn(readonly=True) as conn:
+        version = _data_version(conn, league_name, season_label)
+        with _ROSTER_LOCK:
+            index = _cached_version(_ROSTER_CACHE, key, version)
+        if index is None:
+            index = _load_roster_index(conn, league_name, season_label, version)
+            with _ROSTER_LOCK:
+                _store_version(_ROSTER_CACHE, key, version, index, ROSTER_CACHE_SIZE)
+    return index
+
+
+@timed("backend.rebuild_team_week_scores")
+def _rebuild_team_week_scores(conn: sqlite3.Connection, season_id: int | None = None) -> None:
+    """Recompute the materialized team_week_scores rows for one season (or every season)."""
+    season_filter = "" if season_id is None else "WHERE season_id=?"
+    params = [] if season_id is None else [season_id]
+    conn.execute(
+        f"DELETE FROM team_week_scores WHERE team_id IN (SELECT id FROM teams {season_filter})",
+        params,
+    )
+    conn.execute(
+        f"""
+        INSERT INTO team_week_scores(team_id,week_number,player_points,bonus_points,week_total,cumulative_total)
+        WITH season_teams AS (
+          SELECT id AS team_id, season_id FROM teams {season_filter}
+        ), player_points AS (
+          SELECT st.team_id, pes.week_number, SUM(pes.value * pv.points) AS points
+          FROM season_teams st
+          JOIN roster_players rp ON rp.team_id=st.team_id
+          JOIN player_event_scores pes ON pes.player_name=rp.player_name AND pes.season_id=st.season_id
+          JOIN point_values pv ON pv.season_id=pes.season_id AND pv.event_name=pes.event_name
+          GROUP BY st.team_id, pes.week_number
+        ), bonus_points AS (
+          SELECT wqs.team_id, wqs.week_number, wqs.points
+          FROM weekly_question_scores wqs
+          JOIN season_teams st ON st.team_id=wqs.team_id
+        ), cells AS (
+          SELECT team_id, week_number FROM player_points
+          UNION
+          SELECT team_id, week_number FROM bonus_points
         )
+        SELECT c.team_id,
+               c.week_number,
+               COALESCE(pp.points, 0),
+               COALESCE(bp.points, 0),
+               COALESCE(pp.points, 0) + COALESCE(bp.points, 0),
+               SUM(COALESCE(pp.points, 0) + COALESCE(bp.points, 0))
+                 OVER (PARTITION BY c.team_id ORDER BY c.week_number)
+        FROM cells c
+        LEFT JOIN player_points pp ON pp.team_id=c.team_id AND pp.week_number=c.week_number
+        LEFT JOIN bonus_points bp ON bp.team_id=c.team_id AND bp.week_number=c.week_number
+        """,
+        params,
+    )
 
-        bonus_weekly = pd.read_sql_query(
-            """
-            SELECT week_number, points
-            FROM weekly_question_scores
-            WHERE team_id=?
-            ORDER BY week_number
-            """,
-            conn,
-            params=[team_id],
+
+@timed("backend.refresh_team_week_scores")
+def _refresh_team_week_scores(conn: sqlite3.Connection, cells: Iterable[tuple[int, int]]) -> None:
+    """Recompute only the (team_id, week_number) cells touched by a write, then roll cumulative totals forward."""
+    cells = sorted(set(cells))
+    if not cells:
+        return
+    # The cell is MATERIALIZED so each scalar subquery runs once rather than once per
+    # column that reads it, and CROSS JOIN walks the team's roster before the season's
+    # scores, so only the rostered players' rows for the week are visited.
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO team_week_scores(team_id,week_number,player_points,bonus_points,week_total,cumulative_total)
+        WITH cell AS MATERIALIZED (
+          SELECT t.id AS team_id,
+                 ? AS week_number,
+                 COALESCE((
+                   SELECT SUM(pes.value * pv.points)
+                   FROM roster_players rp
+                   CROSS JOIN player_event_scores pes
+                     ON pes.season_id=t.season_id AND pes.player_name=rp.player_name AND pes.week_number=?
+                   JOIN point_values pv ON pv.season_id=pes.season_id AND pv.event_name=pes.event_name
+                   WHERE rp.team_id=t.id
+                 ), 0) AS player_points,
+                 COALESCE((
+                   SELECT wqs.points FROM weekly_question_scores wqs
+                   WHERE wqs.team_id=t.id AND wqs.week_number=?
+                 ), 0) AS bonus_points
+          FROM teams t WHERE t.id=?
         )
-    total = float(weekly["week_total"].sum()) if not weekly.empty else 0.0
-    current_week = int(weekly["week_number"].max()) if not weekly.empty else 0
-    player_totals = (
-        player_weekly.groupby("player_name", as_index=False)["points"]
+        SELECT team_id, week_number, player_points, bonus_points, player_points + bonus_points, 0 FROM cell
+        """,
+        [(week_number, week_number, week_number, team_id) for team_id, week_number in cells],
+    )
+    first_week: dict[int, int] = {}
+    for team_id, week_number in cells:
+        first_week.setdefault(team_id, week_number)
+    # One running sum per team instead of re-summing every earlier week for each row.
+    conn.executemany(
+        """
+        UPDATE team_week_scores
+        SET cumulative_total = running.total
+        FROM (
+          SELECT week_number, SUM(week_total) OVER (ORDER BY week_number) AS total
+          FROM team_week_scores WHERE team_id=?
+        ) AS running
+        WHERE team_week_scores.team_id=? AND team_week_scores.week_number=running.week_number
+          AND running.week_number>=?
+        """,
+        [(team_id, team_id, week_number) for team_id, week_number in first_week.items()],
+    )
+
+
+def _bump_data_version(conn: sqlite3.Connection, season_id: int | None = None, league_id: int | None = None) -> None:
+    """Advance the version counter of every (league, season) the write touched."""
+    clauses, params = ["1=1"], []
+    if season_id is not None:
+        clauses.append("season_id=?")
+        params.append(season_id)
+    if league_id is not None:
+        clauses.append("league_id=?")
+        params.append(league_id)
+    conn.execute(
+        f"""
+        INSERT INTO data_versions(league_id, season_id, version)
+        SELECT DISTINCT league_id, season_id, 1 FROM teams WHERE {" AND ".join(clauses)}
+        ON CONFLICT(league_id, season_id) DO UPDATE SET version=version+1
+        """,
+        params,
+    )
+
+
+def get_data_version(league_name: str, season_label: str) -> int:
+    with get_conn(readonly=True) as conn:
+        return _data_version(conn, league_name, season_label)
+
+
+def _data_version(conn: sqlite3.Connection, league_name: str, season_label: str) -> int:
+    row = conn.execute(
+        """
+        SELECT dv.version FROM data_versions dv
+        JOIN leagues l ON l.id=dv.league_id JOIN seasons s ON s.id=dv.season_id
+        WHERE l.name=? AND s.label=?
+        """,
+        (league_name, season_label),
+    ).fetchone()
+    return row["version"] if row else 0
+
+
+@timed("backend.team_weekly_points")
+def _team_weekly_points(conn: sqlite3.Connection, team_id: int) -> pd.DataFrame:
+    query = """
+    SELECT week_number, player_points, bonus_points, week_total, cumulative_total
+    FROM team_week_scores
+    WHERE team_id=?
+    ORDER BY week_number
+    """
+    return pd.read_sql_query(query, conn, params=[team_id])
+
+
+STANDINGS_CACHE_SIZE = 256  # league standings kept per process
+DASHBOARD_CACHE_SIZE = 512  # team dashboards kept per process
+
+# Both caches are keyed by database and tagged with the (league, season) data
+# version they were computed at; an entry is only reused while that version holds.
+_STANDINGS_CACHE: "OrderedDict[tuple[str, str, str], tuple[int, dict[str, pd.DataFrame]]]" = OrderedDict()
+_STANDINGS_LOCK = threading.Lock()
+_DASHBOARD_CACHE: "OrderedDict[tuple[str, int], tuple[int, dict]]" = OrderedDict()
+_DASHBOARD_LOCK = threading.Lock()
+
+
+def _cached_version(cache: OrderedDict, key: tuple, version: int) -> dict | None:
+    """The entry for key if it was computed at version; a stale entry is dropped. Call under the cache's lock."""
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    if cached[0] != version:
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return cached[1]
+
+
+def _store_version(cache: OrderedDict, key: tuple, version: int, value: dict, size: int) -> None:
+    """Insert as most recently used and evict the least recently used past size. Call under the cache's lock."""
+    cache[key] = (version, value)
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
+def _shallow_copies(result: dict) -> dict:
+    return {k: v.copy(deep=False) if isinstance(v, pd.DataFrame) else v for k, v in result.items()}
+
+
+def clear_caches() -> None:
+    """Drop the cached standings, dashboards and roster indexes; the next call rebuilds them."""
+    for cache, lock in ((_STANDINGS_CACHE, _STANDINGS_LOCK), (_DASHBOARD_CACHE, _DASHBOARD_LOCK),
+                        (_ROSTER_CACHE, _ROSTER_LOCK)):
+        with lock:
+            cache.clear()
+
+
+@timed("backend.compute_league_standings")
+def _compute_league_standings(conn: sqlite3.Connection, league_name: str, season_label: str) -> dict[str, pd.DataFrame]:
+    rows = pd.read_sql_query(
+        """
+        SELECT t.id AS team_id, t.name AS team_name,
+               tws.week_number, tws.player_points, tws.bonus_points, tws.week_total
+        FROM teams t
+        JOIN leagues l ON l.id=t.league_id
+        JOIN seasons s ON s.id=t.season_id
+        LEFT JOIN team_week_scores tws ON tws.team_id=t.id
+        WHERE l.name=? AND s.label=?
+        """,
+        conn,
+        params=[league_name, season_label],
+    )
+    teams = rows[["team_id", "team_name"]].drop_duplicates()
+    totals = (
+        rows.groupby("team_id", as_index=False)[["player_points", "bonus_points", "week_total"]]
         .sum()
-        .sort_values("points", ascending=False)
-        .rename(columns={"player_name": "Player", "points": "Total Points"})
+        .rename(columns={"week_total": "total_points"})
     )
+    standings = teams.merge(totals, on="team_id", how="left").fillna(
+        {"player_points": 0.0, "bonus_points": 0.0, "total_points": 0.0}
+    )
+    standings["rank"] = standings["total_points"].rank(ascending=False, method="min").astype(int)
+    standings = standings.sort_values(["rank", "team_name"]).reset_index(drop=True)
 
-    elimination_events = event_breakdown[
-        event_breakdown["event_name"].str.contains(
-            "eliminat|exits|kicked off|fire making|rocks|voluntar", case=False, regex=True
+    scored = rows.dropna(subset=["week_number"])
+    if scored.empty:
+        weekly_ranks = pd.DataFrame(
+            columns=["week_number", "team_id", "team_name", "week_total", "cumulative_total", "rank"]
         )
-    ].copy()
+        return {"standings": standings, "weekly_ranks": weekly_ranks}
+
+    week_grid = (
+        scored.pivot_table(index="week_number", columns="team_id", values="week_total", aggfunc="sum")
+        .reindex(columns=teams["team_id"])
+        .fillna(0.0)
+    )
+    cumulative = week_grid.cumsum()
+    ranks = cumulative.rank(axis=1, ascending=False, method="min").astype(int)
+    weekly_ranks = (
+        pd.concat(
+            {"week_total": week_grid.stack(), "cumulative_total": cumulative.stack(), "rank": ranks.stack()},
+            axis=1,
+        )
+        .reset_index()
+        .merge(teams, on="team_id")
+    )
+    weekly_ranks["week_number"] = weekly_ranks["week_number"].astype(int)
+    weekly_ranks = weekly_ranks[["week_number", "team_id", "team_name", "week_total", "cumulative_total", "rank"]]
+    weekly_ranks = weekly_ranks.sort_values(["week_number", "rank", "team_name"]).reset_index(drop=True)
+    return {"standings": standings, "weekly_ranks": weekly_ranks}
+
+
+@timed("backend.build_league_standings")
+def build_league_standings(league_name: str, season_label: str) -> dict[str, pd.DataFrame]:
+    """
+    Totals, ranks and week-by-week ranks for every team in a league/season.
+
+    Computed in one pass over team_week_scores and shared by every caller until
+    the (league, season) data version moves. Callers get shallow copies of the
+    frames.
+    """
+    key = (str(DB_PATH), league_name, season_label)
+    with get_conn(readonly=True) as conn:
+        version = _data_version(conn, league_name, season_label)
+        with _STANDINGS_LOCK:
+            result = _cached_version(_STANDINGS_CACHE, key, version)
+        if result is None:
+            result = _compute_league_standings(conn, league_name, season_label)
+            with _STANDINGS_LOCK:
+                _store_version(_STANDINGS_CACHE, key, version, result, STANDINGS_CACHE_SIZE)
+    return _shallow_copies(result)
+
+
+# CROSS JOIN pins the loop order: the team's roster first, then each rostered player's
+# rows through idx_player_event_scores_season_player, instead of every row in the season.
+_DASHBOARD_ROWS_QUERY = """
+SELECT pes.week_number, rp.player_name, pes.event_name, pes.value, pv.points, 0 AS is_bonus,
+       COALESCE(ec.category, 'other') AS category
+FROM teams t
+CROSS JOIN roster_players rp ON rp.team_id=t.id
+CROSS JOIN player_event_scores pes ON pes.season_id=t.season_id AND pes.player_name=rp.player_name
+JOIN point_values pv ON pv.season_id=pes.season_id AND pv.event_name=pes.event_name
+LEFT JOIN event_categories ec ON ec.season_id=pes.season_id AND ec.event_name=pes.event_name
+WHERE t.id=?
+UNION ALL
+SELECT week_number, NULL, NULL, NULL, points, 1, NULL
+FROM weekly_question_scores
+WHERE team_id=?
+"""
+
+
+@timed("backend.build_team_dashboard")
+def build_team_dashboard(team_id: int) -> dict[str, pd.DataFrame | float | int]:
+    """
+    Everything the team page shows. Cached per team until the data version of
+    the team's (league, season) moves, so a write only recomputes dashboards
+    in the season it touched. Callers get shallow copies of the frames.
+    """
+    key = (str(DB_PATH), team_id)
+    with get_conn(readonly=True) as conn:
+        with span("dashboard.meta_query"):
+            meta = conn.execute(
+                """
+                SELECT t.name AS team_name, l.name AS league_name, s.label AS season_label,
+                       COALESCE(dv.version, 0) AS version
+                FROM teams t
+                JOIN leagues l ON t.league_id=l.id
+                JOIN seasons s ON t.season_id=s.id
+                LEFT JOIN data_versions dv ON dv.league_id=t.league_id AND dv.season_id=t.season_id
+                WHERE t.id=?
+                """,
+                (team_id,),
+            ).fetchone()
+        if meta is None:
+            raise ValueError("Team not found")
+        with _DASHBOARD_LOCK:
+            result = _cached_version(_DASHBOARD_CACHE, key, meta["version"])
+        if result is None:
+            rows = _dashboard_rows(conn, team_id)
+            weekly = _team_weekly_points(conn, team_id)
+    if result is None:
+        result = _derive_team_dashboard(rows)
+        # Weekly and running totals come from the materialized team_week_scores rows.
+        result["weekly"] = weekly
+        result["total"] = float(weekly["week_total"].sum()) if not weekly.empty else 0.0
+        result["current_week"] = int(weekly["week_number"].max()) if not weekly.empty else 0
+        result["meta"] = pd.DataFrame([{k: meta[k] for k in ("team_name", "league_name", "season_label")}])
+        result["standings"] = build_league_standings(meta["league_name"], meta["season_label"])["standings"]
+        with _DASHBOARD_LOCK:
+            _store_version(_DASHBOARD_CACHE, key, meta["version"], result, DASHBOARD_CACHE_SIZE)
+    return _shallow_copies(result)
+
+
+@timed("backend.dashboard_rows")
+def _dashboard_rows(conn: sqlite3.Connection, team_id: int) -> pd.DataFrame:
+    """
+    The team's event-level rows (with their event category) and its bonus rows
+    (is_bonus, points = bonus) from one scan. Player, event and category names
+    come back as categoricals whose categories are in name order, so
+    everything downstream runs on integer codes.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples; they're transposed straight into arrays
+    rows = cursor.execute(_DASHBOARD_ROWS_QUERY, (team_id, team_id)).fetchall()
+    columns = list(zip(*rows)) if rows else [()] * 7
+    names = {}
+    for col, label in ((1, "player_name"), (2, "event_name"), (6, "category")):
+        codes, uniques = pd.factorize(np.array(columns[col], dtype=object), sort=True)
+        names[label] = pd.Categorical.from_codes(codes, uniques)
+    return pd.DataFrame(
+        {
+            "week_number": np.fromiter(columns[0], dtype=np.int64, count=len(rows)),
+            **names,
+            "value": np.array(columns[3], dtype=float),
+            "points": np.array(columns[4], dtype=float),
+            "is_bonus": np.fromiter(columns[5], dtype=bool, count=len(rows)),
+        }
+    )
+
+
+@timed("backend.derive_team_dashboard")
+def _derive_team_dashboard(rows: pd.DataFrame) -> dict[str, pd.DataFrame | float | int]:
+    """
+    Player views, bonuses, eliminations and per-category points from
+    _dashboard_rows(), with every aggregate computed as a bincount over
+    integer codes. Weekly totals are read from team_week_scores instead.
+    """
+    scored = ~rows["is_bonus"].to_numpy()
+    week = rows["week_number"].to_numpy()
+    points = rows["points"].to_numpy()
+    ev_week, ev_points, ev_value = week[scored], points[scored], rows["value"].to_numpy()[scored]
+    ev_total = ev_value * ev_points
+    bonus_week, bonus_points = week[~scored], points[~scored]
+    players = rows["player_name"].cat.categories.to_numpy(dtype=object)
+    events = rows["event_name"].cat.categories.to_numpy(dtype=object)
+    player_code = rows["player_name"].cat.codes.to_numpy()[scored]
+    event_code = rows["event_name"].cat.codes.to_numpy()[scored]
+    categories = rows["category"].cat.categories.to_numpy(dtype=object)
+    category_code = rows["category"].cat.codes.to_numpy()[scored]
+
+    # Codes follow name order, so sorting on a code sorts by name.
+    n_players = max(len(players), 1)
+    cells, cell_code = np.unique(ev_week * n_players + player_code, return_inverse=True)
+    cell_points = np.bincount(cell_code, weights=ev_total, minlength=len(cells)).astype(float)
+    cell_week, cell_player = cells // n_players, cells % n_players
+    order = np.lexsort((cell_player, -cell_points, cell_week))
+    player_weekly = pd.DataFrame(
+        {"week_number": cell_week[order], "player_name": players[cell_player[order]], "points": cell_points[order]}
+    )
+
+    order = np.argsort(bonus_week, kind="stable")
+    bonus_weekly = pd.DataFrame({"week_number": bonus_week[order], "points": bonus_points[order]})
+
+    newest_first = np.lexsort((player_code, -ev_total, -ev_week))
+    event_breakdown = pd.DataFrame(
+        {
+            "week_number": ev_week[newest_first],
+            "player_name": players[player_code[newest_first]],
+            "event_name": events[event_code[newest_first]],
+            "value": ev_value[newest_first],
+            "points": ev_points[newest_first],
+            "event_points": ev_total[newest_first],
+        }
+    )
+
+    totals = np.bincount(player_code, weights=ev_total, minlength=len(players)).astype(float)
+    order = np.argsort(-totals, kind="stable")
+    player_totals = pd.DataFrame({"Player": players[order], "Total Points": totals[order]})
+
+    eliminations = event_breakdown[categories[category_code[newest_first]] == "elimination"]
+    category_totals = np.bincount(category_code, weights=ev_total, minlength=len(categories)).astype(float)
+    category_events = np.bincount(category_code, weights=ev_value, minlength=len(categories)).astype(float)
+    category_points = pd.DataFrame(
+        {"category": categories, "events": category_events, "points": category_totals}
+    ).sort_values("points", ascending=False, kind="stable", ignore_index=True)
     return {
-        "meta": pd.DataFrame([dict(row)]),
-        "weekly": weekly,
-        "standings": standings,
         "player_weekly": player_weekly,
         "player_totals": player_totals,
         "event_breakdown": event_breakdown,
         "bonus_weekly": bonus_weekly,
-        "eliminations": elimination_events,
-        "total": total,
-        "current_week": current_week,
+        "eliminations": eliminations,
+        "category_points": category_points,
     }
 
 
+@timed("backend.upsert_player_event")
 def upsert_player_event(season_label: str, week_number: int, player_name: str, event_name: str, value: float) -> None:
-    with get_conn() as conn:
+    def write(conn: sqlite3.Connection) -> None:
         season_id = _id_for(conn, "seasons", "label", season_label)
         conn.execute(
             "INSERT OR REPLACE INTO player_event_scores(season_id,week_number,player_name,event_name,value) VALUES (?,?,?,?,?)",
             (season_id, week_number, player_name, event_name, value),
         )
+        team_ids = [
+            r["team_id"]
+            for r in conn.execute(
+                """
+                SELECT rp.team_id FROM roster_players rp JOIN teams t ON t.id=rp.team_id
+                WHERE t.season_id=? AND rp.player_name=?
+                """,
+                (season_id, player_name),
+            )
+        ]
+        _refresh_team_week_scores(conn, [(team_id, week_number) for team_id in team_ids])
+        _bump_data_version(conn, season_id)
 
+    _write(write)
 
+
+@timed("backend.upsert_weekly_bonus")
 def upsert_weekly_bonus(league_name: str, season_label: str, team_name: str, week_number: int, points: float) -> None:
-    with get_conn() as conn:
+    def write(conn: sqlite3.Connection) -> None:
         team_id = team_id_for(conn, league_name, season_label, team_name)
         if team_id is None:
             raise ValueError("Team not found")
@@ -447,16 +1779,185 @@ def upsert_weekly_bonus(league_name: str, season_label: str, team_name: str, wee
             "INSERT OR REPLACE INTO weekly_question_scores(team_id,week_number,points) VALUES (?,?,?)",
             (team_id, week_number, points),
         )
+        _refresh_team_week_scores(conn, [(team_id, week_number)])
+        team = conn.execute("SELECT league_id, season_id FROM teams WHERE id=?", (team_id,)).fetchone()
+        _bump_data_version(conn, team["season_id"], team["league_id"])
+
+    _write(write)
+
+
+def _bulk_frame(rows: pd.DataFrame | Iterable, columns: list[str], keys: list[str]) -> pd.DataFrame:
+    """
+    Normalize bulk input (a DataFrame, or records/tuples in `columns` order) to
+    those columns with whitespace-stripped names, integer weeks and float
+    values. Later duplicates of the same `keys` win, as with repeated upserts.
+    """
+    frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows), columns=columns)
+    frame = frame.rename(columns=lambda c: str(c).strip().title())
+    missing = [c for c in columns if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    frame = frame[columns].copy()
+    for col in columns:
+        if col == "Week" or col == columns[-1]:
+            frame[col] = pd.to_numeric(frame[col], errors="coerce")
+        else:
+            frame[col] = frame[col].astype("string").str.strip()
+    bad = frame.isna().any(axis=1) | ~np.isfinite(frame[columns[-1]]) | (frame["Week"] < 1) | (frame["Week"] % 1 != 0)
+    if bad.any():
+        raise ValueError(f"Invalid or empty values in row(s) {_preview((frame.index[bad] + 1).tolist())}")
+    frame["Week"] = frame["Week"].astype(int)
+    frame[columns[-1]] = frame[columns[-1]].astype(float)
+    return frame.drop_duplicates(keys, keep="last")
+
+
+def _preview(values: Iterable, limit: int = 5) -> str:
+    values = [str(v) for v in values]
+    more = f" (+{len(values) - limit} more)" if len(values) > limit else ""
+    return ", ".join(values[:limit]) + more
+
+
+@timed("backend.upsert_player_events_bulk")
+def upsert_player_events_bulk(season_label: str, rows: pd.DataFrame | Iterable) -> int:
+    """
+    Save many player event values at once: rows has Week, Player, Event and
+    Value columns (or is an iterable of such tuples).
+
+    Players and events are checked in memory against the season's rosters and
+    point values before anything is written; the inserts, the team_week_scores
+    refresh and the data-version bump then share one transaction. Returns the
+    number of rows written.
+    """
+    frame = _bulk_frame(rows, ["Week", "Player", "Event", "Value"], ["Week", "Player", "Event"])
+    if frame.empty:
+        return 0
+
+    def write(conn: sqlite3.Connection) -> None:
+        season_id = _id_for(conn, "seasons", "label", season_label)
+        events = {
+            r["event_name"] for r in conn.execute("SELECT event_name FROM point_values WHERE season_id=?", (season_id,))
+        }
+        player_teams: dict[str, list[int]] = {}
+        for r in conn.execute(
+            "SELECT rp.player_name, rp.team_id FROM roster_players rp JOIN teams t ON t.id=rp.team_id WHERE t.season_id=?",
+            (season_id,),
+        ):
+            player_teams.setdefault(r["player_name"], []).append(r["team_id"])
+        known_players = set(player_teams) | {
+            r["player_name"]
+            for r in conn.execute("SELECT DISTINCT player_name FROM player_event_scores WHERE season_id=?", (season_id,))
+        }
+        unknown_players = sorted(set(frame["Player"]) - known_players)
+        unknown_events = sorted(set(frame["Event"]) - events)
+        if unknown_players or unknown_events:
+            problems = []
+            if unknown_players:
+                problems.append(f"unknown player(s) {_preview(unknown_players)}")
+            if unknown_events:
+                problems.append(f"unknown event(s) {_preview(unknown_events)}")
+            raise ValueError(f"{season_label}: {'; '.join(problems)}")
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO player_event_scores(season_id,week_number,player_name,event_name,value) VALUES (?,?,?,?,?)",
+            zip(repeat(season_id), frame["Week"].tolist(), frame["Player"].tolist(), frame["Event"].tolist(),
+                frame["Value"].tolist()),
+        )
+        touched = frame[["Player", "Week"]].drop_duplicates().itertuples(index=False)
+        _refresh_team_week_scores(
+            conn, [(team_id, week) for player, week in touched for team_id in player_teams.get(player, ())]
+        )
+        _bump_data_version(conn, season_id)
+
+    _write(write)
+    return len(frame)
+
+
+@timed("backend.upsert_weekly_bonuses_bulk")
+def upsert_weekly_bonuses_bulk(league_name: str, season_label: str, rows: pd.DataFrame | Iterable) -> int:
+    """
+    Save many weekly bonus points for one league season at once: rows has
+    Team, Week and Points columns. Same single-transaction behaviour as
+    upsert_player_events_bulk; returns the number of rows written.
+    """
+    frame = _bulk_frame(rows, ["Team", "Week", "Points"], ["Team", "Week"])
+    if frame.empty:
+        return 0
+
+    def write(conn: sqlite3.Connection) -> None:
+        teams = {
+            r["name"]: (r["id"], r["league_id"], r["season_id"])
+            for r in conn.execute(
+                """
+                SELECT t.id, t.name, t.league_id, t.season_id
+                FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id
+                WHERE l.name=? AND s.label=?
+                """,
+                (league_name, season_label),
+            )
+        }
+        unknown = sorted(set(frame["Team"]) - set(teams))
+        if unknown:
+            raise ValueError(f"{league_name} / {season_label}: unknown team(s) {_preview(unknown)}")
+
+        team_ids = [teams[name][0] for name in frame["Team"]]
+        weeks = frame["Week"].tolist()
+        conn.executemany(
+            "INSERT OR REPLACE INTO weekly_question_scores(team_id,week_number,points) VALUES (?,?,?)",
+            zip(team_ids, weeks, frame["Points"].tolist()),
+        )
+        _refresh_team_week_scores(conn, zip(team_ids, weeks))
+        _, league_id, season_id = next(iter(teams.values()))
+        _bump_data_version(conn, season_id, league_id)
+
+    _write(write)
+    return len(frame)
+
+
+def player_event_week(season_label: str, week_number: int) -> pd.DataFrame:
+    """Player x event grid of one week's recorded values (0 where nothing is recorded)."""
+    with get_conn(readonly=True) as conn:
+        season_id = _id_for(conn, "seasons", "label", season_label)
+        values = pd.read_sql_query(
+            "SELECT player_name, event_name, value FROM player_event_scores WHERE season_id=? AND week_number=?",
+            conn,
+            params=[season_id, week_number],
+        )
+    players = list_players_for_season(season_label)
+    events = list_events_for_season(season_label)
+    return (
+        values.pivot_table(index="player_name", columns="event_name", values="value", aggfunc="last")
+        .reindex(index=players, columns=events)
+        .fillna(0.0)
+        .rename_axis(index="Player", columns=None)
+    )
+
+
+def weekly_bonus_week(league_name: str, season_label: str, week_number: int) -> pd.DataFrame:
+    """Each team's bonus points for one week (0 where nothing is recorded)."""
+    with get_conn(readonly=True) as conn:
+        return pd.read_sql_query(
+            """
+            SELECT t.name AS Team, COALESCE(wqs.points, 0) AS Points
+            FROM teams t
+            JOIN leagues l ON t.league_id=l.id
+            JOIN seasons s ON t.season_id=s.id
+            LEFT JOIN weekly_question_scores wqs ON wqs.team_id=t.id AND wqs.week_number=?
+            WHERE l.name=? AND s.label=?
+            ORDER BY t.name
+            """,
+            conn,
+            params=[week_number, league_name, season_label],
+        )
 
 
 def list_seasons() -> list[str]:
-    with get_conn() as conn:
+    with get_conn(readonly=True) as conn:
         rows = conn.execute("SELECT label FROM seasons ORDER BY label DESC").fetchall()
     return [r["label"] for r in rows]
 
 
 def list_events_for_season(season_label: str) -> list[str]:
-    with get_conn() as conn:
+    with get_conn(readonly=True) as conn:
         season_id = _id_for(conn, "seasons", "label", season_label)
         rows = conn.execute(
             "SELECT event_name FROM point_values WHERE season_id=? ORDER BY event_name", (season_id,)
@@ -465,7 +1966,7 @@ def list_events_for_season(season_label: str) -> list[str]:
 
 
 def list_players_for_season(season_label: str) -> list[str]:
-    with get_conn() as conn:
+    with get_conn(readonly=True) as conn:
         season_id = _id_for(conn, "seasons", "label", season_label)
         rows = conn.execute(
             "SELECT DISTINCT player_name FROM player_event_scores WHERE season_id=? ORDER BY player_name",
@@ -475,13 +1976,13 @@ def list_players_for_season(season_label: str) -> list[str]:
 
 
 def list_leagues() -> list[str]:
-    with get_conn() as conn:
+    with get_conn(readonly=True) as conn:
         rows = conn.execute("SELECT name FROM leagues ORDER BY name").fetchall()
     return [r["name"] for r in rows]
 
 
 def list_teams_for_league_season(league_name: str, season_label: str) -> list[str]:
-    with get_conn() as conn:
+    with get_conn(readonly=True) as conn:
         rows = conn.execute(
             """
             SELECT t.name FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id
@@ -490,3 +1991,210 @@ def list_teams_for_league_season(league_name: str, season_label: str) -> list[st
             (league_name, season_label),
         ).fetchall()
     return [r["name"] for r in rows]
+
+
+def list_event_categories(season_label: str) -> pd.DataFrame:
+    """Each scoring event of the season with its category and whether an admin set it."""
+    with get_conn(readonly=True) as conn:
+        season_id = _id_for(conn, "seasons", "label", season_label)
+        return pd.read_sql_query(
+            """
+            SELECT pv.event_name, pv.points, COALESCE(ec.category, 'other') AS category,
+                   COALESCE(ec.is_override, 0) AS is_override
+            FROM point_values pv
+            LEFT JOIN event_categories ec ON ec.season_id=pv.season_id AND ec.event_name=pv.event_name
+            WHERE pv.season_id=?
+            ORDER BY pv.event_name
+            """,
+            conn,
+            params=[season_id],
+        )
+
+
+@timed("backend.set_event_categories")
+def set_event_categories(season_label: str, categories: dict[str, str | None]) -> int:
+    """
+    Override the category of events in a season (event name -> category). A
+    category of None drops the override and restores the rule-based one.
+    Returns the number of events updated.
+    """
+    unknown = sorted({c for c in categories.values() if c is not None} - set(EVENT_CATEGORIES))
+    if unknown:
+        raise ValueError(f"Unknown category {_preview(unknown)}; expected one of {', '.join(EVENT_CATEGORIES)}")
+    if not categories:
+        return 0
+
+    def write(conn: sqlite3.Connection) -> None:
+        season_id = _id_for(conn, "seasons", "label", season_label)
+        events = {
+            r["event_name"] for r in conn.execute("SELECT event_name FROM point_values WHERE season_id=?", (season_id,))
+        }
+        missing = sorted(set(categories) - events)
+        if missing:
+            raise ValueError(f"{season_label}: unknown event(s) {_preview(missing)}")
+        conn.executemany(
+            """
+            INSERT INTO event_categories(season_id, event_name, category, is_override) VALUES (?,?,?,?)
+            ON CONFLICT(season_id, event_name) DO UPDATE SET category=excluded.category, is_override=excluded.is_override
+            """,
+            [
+                (season_id, name, category or categorize_event(name), int(category is not None))
+                for name, category in categories.items()
+            ],
+        )
+        _bump_data_version(conn, season_id)
+
+    _write(write)
+    return len(categories)
+
+
+def list_weekly_questions(league_name: str, season_label: str) -> pd.DataFrame:
+    """A league season's questions in week order, one row per question."""
+    with get_conn(readonly=True) as conn:
+        return pd.read_sql_query(
+            """
+            SELECT wq.id AS question_id, wq.week_number, wq.position, wq.question, wq.correct_answer, wq.is_voided
+            FROM weekly_questions wq
+            JOIN leagues l ON l.id=wq.league_id JOIN seasons s ON s.id=wq.season_id
+            WHERE l.name=? AND s.label=?
+            ORDER BY wq.week_number, wq.position
+            """,
+            conn,
+            params=[league_name, season_label],
+        )
+
+
+def list_team_answers(league_name: str, season_label: str, week_number: int | None = None) -> pd.DataFrame:
+    """
+    Every team's stored answer and grade (1/0, NULL when the question is
+    voided) for a league season, optionally for one week only.
+    """
+    week_filter = "" if week_number is None else "AND wq.week_number=?"
+    with get_conn(readonly=True) as conn:
+        return pd.read_sql_query(
+            f"""
+            SELECT wq.id AS question_id, wq.week_number, t.name AS team_name, ta.answer, ta.is_correct
+            FROM weekly_questions wq
+            JOIN leagues l ON l.id=wq.league_id JOIN seasons s ON s.id=wq.season_id
+            JOIN team_answers ta ON ta.question_id=wq.id
+            JOIN teams t ON t.id=ta.team_id
+            WHERE l.name=? AND s.label=? {week_filter}
+            ORDER BY wq.week_number, wq.position, t.id
+            """,
+            conn,
+            params=[league_name, season_label] + ([] if week_number is None else [week_number]),
+        )
+
+
+def team_question_accuracy(league_name: str, season_label: str) -> pd.DataFrame:
+    """Correct answers, graded (non-voided) questions and accuracy per team."""
+    with get_conn(readonly=True) as conn:
+        accuracy = pd.read_sql_query(
+            """
+            SELECT t.name AS Team, COALESCE(SUM(ta.is_correct), 0) AS Correct, COUNT(ta.is_correct) AS Total
+            FROM teams t
+            JOIN leagues l ON l.id=t.league_id JOIN seasons s ON s.id=t.season_id
+            LEFT JOIN team_answers ta ON ta.team_id=t.id
+            WHERE l.name=? AND s.label=?
+            GROUP BY t.id
+            ORDER BY t.id
+            """,
+            conn,
+            params=[league_name, season_label],
+        )
+    accuracy["Accuracy"] = (accuracy["Correct"] / accuracy["Total"].where(accuracy["Total"] > 0)).fillna(0.0)
+    return accuracy
+
+
+@timed("backend.update_weekly_question")
+def update_weekly_question(question_id: int, correct_answer: str | None, is_voided: bool = False) -> None:
+    """Change a question's correct answer or voided flag and regrade every team's answer to it."""
+
+    def write(conn: sqlite3.Connection) -> None:
+        question = conn.execute(
+            "SELECT league_id, season_id FROM weekly_questions WHERE id=?", (question_id,)
+        ).fetchone()
+        if question is None:
+            raise ValueError("Question not found")
+        conn.execute(
+            "UPDATE weekly_questions SET correct_answer=?, is_voided=? WHERE id=?",
+            (correct_answer, int(is_voided), question_id),
+        )
+        answers = conn.execute(
+            "SELECT team_id, answer FROM team_answers WHERE question_id=? ORDER BY team_id", (question_id,)
+        ).fetchall()
+        correct = grade_answers(
+            pd.Series([correct_answer], dtype=object),
+            pd.DataFrame([[r["answer"] for r in answers]], dtype=object),
+        )[0]
+        conn.executemany(
+            "UPDATE team_answers SET is_correct=? WHERE question_id=? AND team_id=?",
+            [(None if is_voided else int(ok), question_id, r["team_id"]) for r, ok in zip(answers, correct)],
+        )
+        _bump_data_version(conn, question["season_id"], question["league_id"])
+
+    _write(write)
+
+
+def graded_weekly_bonuses(league_name: str, season_label: str, points_per_correct: float = 1.0) -> pd.DataFrame:
+    """
+    Team / Week / Points rows (the upsert_weekly_bonuses_bulk format) derived
+    from the stored grades at points_per_correct each. Every team gets a row
+    for every week that has questions.
+    """
+    with get_conn(readonly=True) as conn:
+        bonuses = pd.read_sql_query(
+            """
+            SELECT t.name AS Team, wq.week_number AS Week, COALESCE(SUM(ta.is_correct), 0) AS Correct
+            FROM weekly_questions wq
+            JOIN leagues l ON l.id=wq.league_id JOIN seasons s ON s.id=wq.season_id
+            JOIN team_answers ta ON ta.question_id=wq.id
+            JOIN teams t ON t.id=ta.team_id
+            WHERE l.name=? AND s.label=?
+            GROUP BY t.id, wq.week_number
+            ORDER BY wq.week_number, t.id
+            """,
+            conn,
+            params=[league_name, season_label],
+        )
+    return bonuses.assign(Points=bonuses.pop("Correct") * points_per_correct)
+
+
+def list_roster_players(league_name: str, season_label: str) -> pd.DataFrame:
+    """
+    Every rostered player of a league season in roster order, with their
+    image URL (None when the cast workbook has none) and eliminated flag.
+    """
+    with get_conn(readonly=True) as conn:
+        return pd.read_sql_query(
+            """
+            SELECT t.name AS team_name, rp.player_name, pi.image_url, COALESCE(p.is_eliminated, 0) AS is_eliminated
+            FROM teams t
+            JOIN leagues l ON l.id=t.league_id JOIN seasons s ON s.id=t.season_id
+            JOIN roster_players rp ON rp.team_id=t.id
+            LEFT JOIN players p ON p.season_id=t.season_id AND p.name=rp.player_name
+            LEFT JOIN player_images pi ON pi.player_id=p.id
+            WHERE l.name=? AND s.label=?
+            ORDER BY t.id, rp.rowid
+            """,
+            conn,
+            params=[league_name, season_label],
+        )
+
+
+def list_eliminations(season_label: str) -> pd.DataFrame:
+    """A season's eliminated players in elimination order, with week label and image URL."""
+    with get_conn(readonly=True) as conn:
+        return pd.read_sql_query(
+            """
+            SELECT e.elimination_order, e.week_label, p.name AS player_name, pi.image_url
+            FROM seasons s
+            JOIN eliminations e ON e.season_id=s.id
+            JOIN players p ON p.id=e.player_id
+            LEFT JOIN player_images pi ON pi.player_id=p.id
+            WHERE s.label=?
+            ORDER BY e.elimination_order
+            """,
+            conn,
+            params=[season_label],
+        )
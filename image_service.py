@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Player image service - fetch once, serve local thumbnails.
+
+Originals are downloaded concurrently, shrunk to roster-sized thumbnails and
+stored next to a pre-rendered red-X (eliminated) variant in a content-addressed
+on-disk cache. Tabs get PNG bytes back instead of making every browser pull
+full-size originals.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Iterable, Optional
+
+import requests
+from PIL import Image, ImageDraw
+
+from perf import timed
+
+CACHE_DIR = Path("data/image_cache")
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+THUMB_WIDTH = 130
+FETCH_TIMEOUT = 10
+PREFETCH_WORKERS = 8
+RETRY_FAILED_AFTER = 300  # seconds before a URL that failed to download is tried again
+MAX_FAILED_URLS = 1000  # failed URLs remembered at most; forgetting one only means an earlier retry
+VARIANTS = ("thumb", "redx")
+
+
+class ImageCache:
+    """
+    Content-addressed blob store with LRU eviction.
+
+    objects/<sha256 of bytes>.png holds each rendered image once; refs/<sha256 of key>
+    points a (url, variant) key at its object. Reads bump the object's mtime and
+    eviction removes the least recently used objects until the store fits max_bytes.
+
+    The store's size is kept as a running byte total, seeded from disk once, so
+    puts only scan objects/ when that total goes over budget.
+    """
+
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._objects = self.root / "objects"
+        self._refs = self.root / "refs"
+        self._lock = threading.Lock()
+        with self._lock:
+            self._bytes = sum(size for _, size, _ in self._scan())
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _ref_path(self, key: str) -> Path:
+        return self._refs / self._digest(key.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            digest = self._ref_path(key).read_text().strip()
+            obj = self._objects / f"{digest}.png"
+            data = obj.read_bytes()
+            os.utime(obj)
+            return data
+        except FileNotFoundError:
+            return None
+
+    def contains(self, key: str) -> bool:
+        """Whether key's object is stored, without reading it."""
+        try:
+            digest = self._ref_path(key).read_text().strip()
+        except FileNotFoundError:
+            return False
+        return (self._objects / f"{digest}.png").exists()
+
+    def put(self, key: str, data: bytes) -> None:
+        digest = self._digest(data)
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._refs.mkdir(parents=True, exist_ok=True)
+        obj = self._objects / f"{digest}.png"
+        # Check and count under the lock so two threads storing the same object add it once.
+        with self._lock:
+            if not obj.exists():
+                _atomic_write(obj, data)
+                self._bytes += len(data)
+            over_budget = self._bytes > self.max_bytes
+        _atomic_write(self._ref_path(key), digest.encode("ascii"))
+        if over_budget:
+            self.evict()
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for obj in self._objects.glob("*.png"):
+            try:
+                stat = obj.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, obj))
+        return entries
+
+    def evict(self) -> int:
+        """Drop least recently used objects until the store fits; returns how many were removed."""
+        with self._lock:
+            # Rescanning also resyncs the running total with what is actually on disk.
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, obj in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                obj.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            self._bytes = total
+            # Refs to evicted objects simply read as misses and are rewritten on the next fetch.
+            return removed
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _png_bytes(img: Image.Image) -> bytes:
+    out = BytesIO()
+    img.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+def render_variants(original: bytes, width: int = THUMB_WIDTH) -> dict[str, bytes]:
+    """A width-px thumbnail and the same thumbnail with a red X drawn across it."""
+    img = Image.open(BytesIO(original)).convert("RGBA")
+    height = max(1, round(img.height * width / img.width))
+    thumb = img.resize((width, height), Image.LANCZOS)
+
+    redx = thumb.copy()
+    draw = ImageDraw.Draw(redx)
+    line_width = max(1, int(width * 0.08))
+    draw.line((0, 0, width, height), fill=(255, 0, 0, 255), width=line_width)
+    draw.line((width, 0, 0, height), fill=(255, 0, 0, 255), width=line_width)
+    return {"thumb": _png_bytes(thumb), "redx": _png_bytes(redx)}
+
+
+_default_cache: Optional[ImageCache] = None
+
+
+def default_cache() -> ImageCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ImageCache()
+    return _default_cache
+
+
+def _key(url: str, variant: str) -> str:
+    return f"{variant}|{THUMB_WIDTH}|{url}"
+
+
+# url -> when it last failed, oldest first; written from prefetch's worker threads.
+_failed_at: "OrderedDict[str, float]" = OrderedDict()
+_failed_lock = threading.Lock()
+
+
+def _recently_failed(url: str) -> bool:
+    with _failed_lock:
+        return time.monotonic() - _failed_at.get(url, float("-inf")) < RETRY_FAILED_AFTER
+
+
+def _record_failure(url: str) -> None:
+    now = time.monotonic()
+    with _failed_lock:
+        _failed_at[url] = now
+        _failed_at.move_to_end(url)
+        while _failed_at and (
+            len(_failed_at) > MAX_FAILED_URLS or next(iter(_failed_at.values())) <= now - RETRY_FAILED_AFTER
+        ):
+            _failed_at.popitem(last=False)
+
+
+@timed("images.fetch")
+def _fetch_and_store(url: str, cache: ImageCache) -> bool:
+    if _recently_failed(url):
+        return False
+    try:
+        response = requests.get(url, timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        variants = render_variants(response.content)
+    except (requests.RequestException, OSError, ValueError):
+        _record_failure(url)
+        return False
+    with _failed_lock:
+        _failed_at.pop(url, None)
+    for variant, data in variants.items():
+        cache.put(_key(url, variant), data)
+    return True
+
+
+@timed("images.prefetch")
+def prefetch(urls: Iterable[str], cache: Optional[ImageCache] = None, workers: int = PREFETCH_WORKERS) -> dict[str, bool]:
+    """
+    Make sure every URL has both variants cached, downloading misses in a thread pool.
+
+    Returns url -> True when the images are available locally.
+    """
+    cache = cache or default_cache()
+    urls = list(dict.fromkeys(u for u in urls if isinstance(u, str) and u))
+    status = {u: all(cache.contains(_key(u, v)) for v in VARIANTS) for u in urls}
+    missing = [u for u, ok in status.items() if not ok]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+            for url, ok in zip(missing, pool.map(lambda u: _fetch_and_store(u, cache), missing)):
+                status[url] = ok
+    return status
+
+
+@timed("images.get_image")
+def get_image(url: str, eliminated: bool = False, cache: Optional[ImageCache] = None) -> Optional[bytes]:
+    """
+    PNG bytes for a player thumbnail (red-X variant when eliminated).
+
+    Fetches on a miss; returns None when the image can't be retrieved so callers
+    can fall back to the remote URL.
+    """
+    cache = cache or default_cache()
+    key = _key(url, "redx" if eliminated else "thumb")
+    data = cache.get(key)
+    if data is None and _fetch_and_store(url, cache):
+        data = cache.get(key)
+    return data
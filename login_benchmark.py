@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Login throughput benchmark for fantasy_backend.
+
+Registers a batch of users on a scratch database, then reports logins/sec for
+password logins (PBKDF2 through the hashing pool) and for session-token
+resumes, each from several concurrent client threads.
+
+    python login_benchmark.py [--users 32] [--clients 16]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import fantasy_backend as fb
+
+
+def _throughput(label: str, calls: list[Callable[[], object]], clients: int) -> dict[str, float]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda call: call(), calls))
+    elapsed = time.perf_counter() - started
+    if not all(results):
+        raise AssertionError(f"{label}: {results.count(None)} of {len(results)} logins failed")
+    return {"label": label, "logins": len(calls), "clients": clients, "seconds": elapsed, "per_sec": len(calls) / elapsed}
+
+
+def run(users: int = 32, clients: int = 16) -> list[dict[str, float]]:
+    original_path = fb.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        fb.close_all_connections()
+        fb.DB_PATH = Path(tmp) / "login_bench.db"
+        try:
+            fb.migrate()
+            names = [f"bench_user_{i}" for i in range(users)]
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                list(pool.map(lambda name: fb.register_user(name, f"{name}-pw"), names))
+
+            password_logins = [lambda name=name: fb.authenticate_user(name, f"{name}-pw") for name in names]
+            results = [
+                _throughput("password, 1 client", password_logins[: max(1, users // 4)], 1),
+                _throughput(f"password, {clients} clients", password_logins, clients),
+            ]
+            for name in names:
+                fb._clear_login_attempts(name)
+
+            user_ids = [fb.authenticate_user(name, f"{name}-pw")["id"] for name in names]
+            tokens = [fb.create_session(user_id) for user_id in user_ids]
+            resumes = [lambda token=token: fb.user_for_session(token) for token in tokens * 20]
+            results.append(_throughput(f"session token, {clients} clients", resumes, clients))
+        finally:
+            fb.close_all_connections()
+            fb.DB_PATH = original_path
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+    print(f"PBKDF2 iterations: {fb.PBKDF2_ITERATIONS}, hashing workers: {fb.HASH_WORKERS}\n")
+    for row in run(args.users, args.clients):
+        print(f"{row['label']:<32} {row['logins']:>5} logins in {row['seconds']:6.2f}s  {row['per_sec']:9.1f} logins/sec")
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight timing spans for the hot paths.
+
+    with span("dashboard.queries"):
+        ...
+
+    @timed("backend.build_team_dashboard")
+    def build_team_dashboard(...): ...
+
+Each finished span is appended to an in-process ring buffer (the most recent
+RING_SIZE spans), which summary() and spans() turn into DataFrames for the
+admin performance page. Nested spans record their parent so time can be
+attributed. Recording costs two perf_counter() calls and a deque append.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, TypeVar
+
+import pandas as pd
+
+RING_SIZE = 20000
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    name: str
+    parent: Optional[str]
+    started_at: float      # time.time() when the span opened
+    duration_ms: float
+    thread: str
+    error: bool
+
+
+_RING: deque[SpanRecord] = deque(maxlen=RING_SIZE)
+_LOCAL = threading.local()
+
+
+def _stack() -> list[str]:
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block and record it under name."""
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    stack.append(name)
+    wall = time.time()
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        duration = (time.perf_counter() - started) * 1000
+        stack.pop()
+        _RING.append(SpanRecord(name, parent, wall, duration, threading.current_thread().name, error))
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator form of span(); defaults to module.qualname."""
+
+    def decorate(fn: F) -> F:
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def spans(name: Optional[str] = None) -> pd.DataFrame:
+    """Recorded spans (oldest first), optionally only those called name."""
+    records = list(_RING)
+    if name is not None:
+        records = [r for r in records if r.name == name]
+    return pd.DataFrame(
+        records, columns=["name", "parent", "started_at", "duration_ms", "thread", "error"]
+    )
+
+
+def summary() -> pd.DataFrame:
+    """Per-span count, error count and latency percentiles over the ring buffer, slowest total first."""
+    df = spans()
+    if df.empty:
+        return pd.DataFrame(columns=["span", "count", "errors", "p50_ms", "p95_ms", "max_ms", "total_ms"])
+    grouped = df.groupby("name")["duration_ms"]
+    out = pd.DataFrame(
+        {
+            "count": grouped.size(),
+            "errors": df.groupby("name")["error"].sum(),
+            "p50_ms": grouped.quantile(0.5),
+            "p95_ms": grouped.quantile(0.95),
+            "max_ms": grouped.max(),
+            "total_ms": grouped.sum(),
+        }
+    )
+    return out.sort_values("total_ms", ascending=False).rename_axis("span").reset_index()
+
+
+def reset() -> None:
+    _RING.clear()
@@ -4,49 +4,17 @@ Created on Wed Mar 26 13:37:47 2025
 
 @author: IsaacSchultz
 """
-from utils_cache import read_excel, read_csv, cache_df
+from utils_cache import read_excel, read_csv, cache_df, file_fingerprint
+from scoring import score_season
+from fantasy_backend import get_roster_index
+from perf import timed
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
 
+@timed("tab.player_trends")
 def trends_tab():
-    def get_all_rosters(season):
-        if season == "Season 49":
-            return {
-                "NE Portland": pd.DataFrame({
-                    "Picasso": ['Savannah','Steven','Jawan','Sage'],
-                    "Brackie": ['MC','Rizo','Matt','Shannon' ],
-                    "Polron":  ['Sophie S','Nate','Jason','Kristina'],
-                    "Kanna":   ['Alex','Jeremiah','Sophi B','Jake']
-                }),
-                "Bi-coastal Elites": pd.DataFrame({
-                    "Jena":            ['Matt','Sophie S','Rizo'],
-                    "Schultz & Big P": ['Kristina','Alex','Savannah'],
-                    "Isaac":           ['Jawan','Jeremiah','Steven'],
-                    "Mike":            ['Nate','Jake','Sage'],
-                    "Nick":            ['MC','Nicole','Annie'],
-                    "Eric":            ['Jason','Sophi B','Shannon']
-                })
-            }
-        if season == "Season 48":
-            return {
-                "NE Portland": pd.DataFrame({
-                    "Picasso": ['Eva','Mitch','Mary','Sai'],
-                    "Brackie": ['Kamilla','Kyle','Chrissy','Cedrek'],
-                    "Polron":  ['Joe','Thomas','Bianca','Charity'],
-                    "Kanna":   ['Shauhin','Justin','Star','David']
-                })
-            }
-        if season == "Season 47":
-            return {
-                "NE Portland": pd.DataFrame({
-                    "Picasso": ['Sam','Sierra','Genevieve','Sue','Caroline'],
-                    "Brackie": ['Kyle','Rome','Sol','Anika','Kishan'],
-                    "Polron":  ['Teeny','Rachel','Andy','Gabe','Tiyana']
-                })
-            }
-
     st.header("Player Trends")
 
     # Load from session state
@@ -65,68 +33,54 @@ def trends_tab():
             scores_file = "data/PointsScored_Survivor_49.xlsx"
     
     if league == 'Bi-coastal Elites':
-        point_values = pd.read_excel("data/east/Survivor_49_East.xlsx", sheet_name="PointValues_Survivor")
+        point_values_file = "data/east/Survivor_49_East.xlsx"
+        load_point_values = lambda: read_excel(point_values_file, "PointValues_Survivor")
     else:
-        point_values = pd.read_csv("data/PointValues_Survivor.csv")
+        point_values_file = "data/PointValues_Survivor.csv"
+        load_point_values = lambda: pd.read_csv(point_values_file)
+    point_values = cache_df(f"{league}|{season}|point_values", load_point_values, file_path=point_values_file)
 
     # --- Load and process data ---
     def clean_data(df):
         df.columns = df.columns.str.replace(" ", "_").str.replace(".", "_", regex=False)
         return df.fillna(0)
 
-    def apply_point_values(raw_scores, point_values):
-        raw_scores = raw_scores.copy()
-        point_values = point_values.copy()
-    
-        # Don't rename anything — match original column names exactly
-        raw_scores = raw_scores.fillna(0)
-        point_values["Event"] = point_values["Event"].str.strip()
-        raw_scores.columns = raw_scores.columns.str.strip()
-        for _, row in point_values.iterrows():
-            event = row["Event"]
-            if event in raw_scores.columns:
-                raw_scores[event] *= row["Points"]
-    
-        event_cols = [col for col in point_values["Event"] if col in raw_scores.columns]
-        raw_scores["total"] = raw_scores[event_cols].sum(axis=1)
-        return raw_scores, event_cols
-
-    def get_scoreboard(raw_scores):
-        scoreboard = raw_scores[["Player", "Week", "total"]].copy()
-        scoreboard["rolling_total"] = scoreboard.groupby("Player")["total"].cumsum()
-        return scoreboard
-
     # Load and score
 
-    raw_scores = pd.read_excel(scores_file, sheet_name="PointsScored_Survivor")
     key_rs = f"{league}|{season}|raw_scores"
-    raw_scores = cache_df(key_rs, raw_scores, file_path=scores_file)
+    raw_scores = cache_df(
+        key_rs, lambda: read_excel(scores_file, "PointsScored_Survivor"), file_path=scores_file
+    )
 
     
-    raw_scores, event_cols = apply_point_values(raw_scores, point_values)
+    scores = score_season(
+        raw_scores,
+        point_values,
+        cache_key=(scores_file, file_fingerprint(scores_file),
+                   point_values_file, file_fingerprint(point_values_file)),
+    )
+    event_cols = scores.events
     key_scored = f"{league}|{season}|scored_trends"
-    raw_scores = cache_df(key_scored, raw_scores, file_path=scores_file)
+    raw_scores = cache_df(key_scored, scores.event_points, file_path=(scores_file, point_values_file))
 
     
-    scoreboard = get_scoreboard(raw_scores)
     key_board = f"{league}|{season}|scoreboard_trends"
-    scoreboard = cache_df(key_board, scoreboard, file_path=scores_file)
+    scoreboard = cache_df(key_board, scores.scoreboard, file_path=(scores_file, point_values_file))
 
 
     # --- Team filter (optional) ---
-    rosters = get_all_rosters(season)
-    roster_df = rosters.get(league)
+    rosters = get_roster_index(league, season).rosters(league, season)
     
     # Build the team list if we have rosters for this league; otherwise just default to All teams
-    team_options = ["All teams"] + (roster_df.columns.tolist() if isinstance(roster_df, pd.DataFrame) else [])
+    team_options = ["All teams"] + list(rosters)
     selected_team = st.selectbox("Team (optional)", team_options, index=0)
 
 
 
     # --- Controls ---
     player_list = sorted(raw_scores["Player"].unique())  # all players in the season
-    if selected_team != "All teams" and isinstance(roster_df, pd.DataFrame):
-        team_players = roster_df[selected_team].dropna().tolist()
+    if selected_team != "All teams":
+        team_players = list(rosters[selected_team])
         # Default to everyone on the chosen team
         default_players = team_players if len(team_players) > 0 else player_list[:1]
         help_txt = f"Showing players on {selected_team}. You can add/remove players."
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Query plan regression check for fantasy_backend.
+
+Runs the backend entry points against a freshly seeded scratch database,
+captures every SQL statement they issue and fails if EXPLAIN QUERY PLAN shows
+a full scan of one of the tables that grow with leagues, seasons and weeks.
+tests/test_query_plans.py runs the same check under pytest.
+
+    python query_plans.py
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fantasy_backend as fb
+
+# Tables whose size grows with every league/season/week; a full scan of any of them is a regression.
+SCORING_TABLES = {
+    "data_versions",
+    "eliminations",
+    "event_categories",
+    "player_event_scores",
+    "player_images",
+    "players",
+    "roster_players",
+    "team_week_scores",
+    "teams",
+    "weekly_question_scores",
+    "point_values",
+    "user_teams",
+    "sessions",
+    "team_answers",
+    "weekly_questions",
+}
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+# Statements (as normalize_sql keys them) that may scan a scoring table, and why.
+FULL_SCAN_ALLOWED = {
+    "SELECT ? FROM player_event_scores LIMIT ?": "migration emptiness probe; stops at the first row",
+    "SELECT ? FROM team_week_scores LIMIT ?": "migration emptiness probe; stops at the first row",
+    "SELECT ? FROM teams LIMIT ?": "seed_from_legacy emptiness probe; stops at the first row",
+    "SELECT t.id, l.name AS league_name, s.label AS season_label, t.name AS team_name "
+    "FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id":
+        "seed_from_legacy maps every team it just inserted, once",
+    "SELECT l.name AS league_name, s.label AS season_label, t.name AS team_name "
+    "FROM teams t JOIN leagues l ON t.league_id=l.id JOIN seasons s ON t.season_id=s.id "
+    "ORDER BY s.label DESC, l.name, t.name":
+        "list_all_teams lists every team for the team pickers",
+}
+
+
+@dataclass
+class QueryPlan:
+    statement: str
+    plan: list[str]
+    full_scans: list[str] = field(default_factory=list)
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse literals and whitespace so repeated executions of one statement share a key."""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    return " ".join(sql.split())
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in {"ON", "WHERE", "JOIN", "LEFT", "GROUP", "ORDER", "SELECT", "VALUES", "SET"}:
+            aliases[alias] = table
+    return aliases
+
+
+def is_explainable(sql: str) -> bool:
+    return sql.lstrip().upper().startswith(_EXPLAINABLE)
+
+
+def full_scans(sql: str, plan: list[str]) -> list[str]:
+    """The plan lines that scan a whole scoring table."""
+    if normalize_sql(sql) in FULL_SCAN_ALLOWED:
+        return []
+    aliases = _aliases(sql)
+    scans = []
+    for detail in plan:
+        match = _SCAN.match(detail)
+        if match and aliases.get(match.group(1), match.group(1)) in SCORING_TABLES:
+            scans.append(detail)
+    return scans
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> QueryPlan:
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    return QueryPlan(normalize_sql(sql), plan, full_scans(sql, plan))
+
+
+def _exercise_backend() -> None:
+    fb.bootstrap()
+    league, season = "NE Portland", "Season 49"
+    team = fb.list_teams_for_league_season(league, season)[0]
+    fb.register_user("plan_check", "plan_check")
+    user = fb.authenticate_user("plan_check", "plan_check")
+    token = fb.create_session(user["id"])
+    fb.user_for_session(token)
+    fb.revoke_session(token)
+    fb.assign_team("plan_check", league, season, team)
+    options = fb.list_league_season_options_for_user(user["id"])
+    fb.list_all_teams()
+    fb.list_seasons()
+    fb.list_leagues()
+    events = fb.list_events_for_season(season)
+    players = fb.list_players_for_season(season)
+    fb.get_data_version(league, season)
+    fb.clear_caches()
+    fb.get_roster_index(league, season)
+    fb.build_league_standings(league, season)
+    fb.build_team_dashboard(int(options["team_id"].iloc[0]))
+    with fb.get_conn(readonly=True) as conn:
+        season_id = conn.execute("SELECT id FROM seasons WHERE label=?", (season,)).fetchone()["id"]
+    fb._write(lambda conn: fb._rebuild_team_week_scores(conn, season_id))
+    fb.upsert_player_event(season, 1, players[0], events[0], 1.0)
+    fb.upsert_weekly_bonus(league, season, team, 1, 1.0)
+    fb.player_event_week(season, 2)
+    fb.weekly_bonus_week(league, season, 2)
+    fb.upsert_player_events_bulk(season, [(2, player, events[0], 1.0) for player in players[:3]])
+    fb.upsert_weekly_bonuses_bulk(league, season, [(team, 2, 1.0)])
+    fb.list_event_categories(season)
+    fb.set_event_categories(season, {events[0]: "social"})
+    fb.set_event_categories(season, {events[0]: None})
+    questions = fb.list_weekly_questions(league, season)
+    fb.list_team_answers(league, season)
+    fb.list_team_answers(league, season, int(questions["week_number"].iloc[0]))
+    fb.team_question_accuracy(league, season)
+    fb.graded_weekly_bonuses(league, season)
+    question = questions.iloc[0]
+    fb.update_weekly_question(int(question["question_id"]), question["correct_answer"], bool(question["is_voided"]))
+    fb.list_roster_players(league, season)
+    fb.list_eliminations(season)
+
+
+def capture_query_plans() -> list[QueryPlan]:
+    """Exercise the backend on a scratch database and explain each distinct statement it ran."""
+    statements: dict[str, str] = {}
+
+    def record(sql: str) -> None:
+        if is_explainable(sql):
+            statements.setdefault(normalize_sql(sql), sql)
+
+    def hook(conn: sqlite3.Connection) -> None:
+        conn.set_trace_callback(record)
+
+    original_path = fb.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        fb.close_all_connections()
+        fb.DB_PATH = Path(tmp) / "plan_check.db"
+        fb.add_connection_hook(hook)
+        try:
+            _exercise_backend()
+            fb.close_all_connections()
+            conn = sqlite3.connect(fb.DB_PATH)
+            try:
+                plans = [explain(conn, sql) for sql in statements.values()]
+            finally:
+                conn.close()
+        finally:
+            fb.remove_connection_hook(hook)
+            fb.close_all_connections()
+            fb.DB_PATH = original_path
+    return plans
+
+
+def assert_no_full_scans(plans: list[QueryPlan]) -> None:
+    offenders = [p for p in plans if p.full_scans]
+    if offenders:
+        report = "\n\n".join(f"{p.statement}\n  -> {'; '.join(p.full_scans)}" for p in offenders)
+        raise AssertionError(f"{len(offenders)} statement(s) fall back to a full table scan:\n\n{report}")
+
+
+if __name__ == "__main__":
+    captured = capture_query_plans()
+    for query_plan in captured:
+        print(("FULL SCAN  " if query_plan.full_scans else "ok         ") + query_plan.statement[:140])
+    try:
+        assert_no_full_scans(captured)
+    except AssertionError as exc:
+        print(f"\n{exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n{len(captured)} statements checked, no full scans of scoring tables.")
@@ -8,8 +8,10 @@ Created on Wed Mar 26 11:51:16 2025
 import streamlit as st
 import pandas as pd
 from utils_cache import read_excel, read_csv
+from perf import timed
 
 
+@timed("tab.rules")
 def rules_tab():
     st.header("Scoring System")
     st.markdown("""
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Shared scoring engine - turns a season's PointsScored sheet into points.
+
+A season is held as a dense (player-week x event) count matrix plus a point
+value vector; totals come from one matrix-vector product instead of
+multiplying event columns one at a time.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+_CACHE_SIZE = 32
+_cache: "OrderedDict[Hashable, SeasonScores]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class SeasonScores:
+    rows: pd.DataFrame          # Player / Week for each matrix row, in sheet order
+    events: list[str]           # matrix column labels
+    counts: np.ndarray          # (rows x events) raw event counts
+    point_vector: np.ndarray    # (events,) points per event
+    totals: np.ndarray          # (rows,) counts @ point_vector
+
+    def event_points(self) -> pd.DataFrame:
+        """Player, Week, one points column per event and the row total."""
+        points = pd.DataFrame(self.counts * self.point_vector, columns=self.events, index=self.rows.index)
+        return pd.concat([self.rows, points], axis=1).assign(total=self.totals)
+
+    def scoreboard(self) -> pd.DataFrame:
+        """Player, Week, weekly total and each player's running total (accumulated in week order)."""
+        board = self.rows.assign(total=self.totals)
+        board["rolling_total"] = board.sort_values("Week", kind="stable").groupby("Player")["total"].cumsum()
+        return board
+
+    def player_cumulative(self) -> pd.DataFrame:
+        """Week x Player matrix of cumulative points."""
+        return (
+            self.rows.assign(total=self.totals)
+            .pivot_table(index="Week", columns="Player", values="total", aggfunc="sum", fill_value=0.0)
+            .cumsum()
+        )
+
+
+def normalize_point_values(point_values: pd.DataFrame) -> pd.DataFrame:
+    point_values = point_values[["Event", "Points"]].dropna(subset=["Event"]).copy()
+    point_values["Event"] = point_values["Event"].astype(str).str.strip()
+    point_values["Points"] = pd.to_numeric(point_values["Points"], errors="coerce")
+    return point_values.dropna(subset=["Points"]).drop_duplicates("Event")
+
+
+def count_matrix(raw_scores: pd.DataFrame, events: list[str]) -> tuple[pd.DataFrame, list[str], np.ndarray]:
+    """
+    Split a PointsScored sheet into row labels and a dense count matrix.
+
+    Only events that appear as (whitespace-stripped) columns are kept; missing
+    counts become 0.
+    """
+    raw_scores = raw_scores.rename(columns=lambda c: str(c).strip())
+    raw_scores = raw_scores.dropna(subset=["Player", "Week"])
+    events = [e for e in events if e in raw_scores.columns]
+    counts = (
+        raw_scores[events].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float)
+        if events
+        else np.zeros((len(raw_scores), 0))
+    )
+    rows = raw_scores[["Player", "Week"]].reset_index(drop=True)
+    return rows, events, counts
+
+
+def score_season(
+    raw_scores: pd.DataFrame,
+    point_values: pd.DataFrame,
+    cache_key: Optional[Hashable] = None,
+) -> SeasonScores:
+    """
+    Score a season. Pass cache_key (e.g. path + file fingerprint) to reuse the
+    result for as long as the source files are unchanged.
+    """
+    if cache_key is not None and cache_key in _cache:
+        _cache.move_to_end(cache_key)
+        return _cache[cache_key]
+
+    point_values = normalize_point_values(point_values)
+    rows, events, counts = count_matrix(raw_scores, point_values["Event"].tolist())
+    point_vector = point_values.set_index("Event")["Points"].reindex(events).to_numpy(dtype=float)
+    scores = SeasonScores(rows, events, counts, point_vector, counts @ point_vector)
+
+    if cache_key is not None:
+        _cache[cache_key] = scores
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return scores
+
+
+def team_week_points(
+    scoreboard: pd.DataFrame,
+    rosters: Mapping[str, Iterable[str]],
+    bonus_by_week: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Week x team points: a (week x player) points pivot times a (player x team)
+    roster-membership matrix, plus bonus points joined on the week key.
+
+    bonus_by_week is indexed by week number with one column per team; weeks
+    missing on either side count as 0.
+    """
+    teams = list(rosters)
+    memberships = [(player, t) for t, team in enumerate(teams) for player in team_players(rosters[team])]
+    players = sorted({player for player, _ in memberships})
+    player_idx = {player: i for i, player in enumerate(players)}
+    membership = np.zeros((len(players), len(teams)))
+    for player, t in memberships:
+        membership[player_idx[player], t] = 1.0
+
+    week_player = scoreboard.pivot_table(
+        index="Week", columns="Player", values="total", aggfunc="sum", fill_value=0.0
+    ).reindex(columns=players, fill_value=0.0)
+
+    weeks = week_player.index
+    bonus = None
+    if bonus_by_week is not None:
+        bonus = bonus_by_week.groupby(level=0).sum()
+        weeks = weeks.union(bonus.index)
+
+    points = week_player.reindex(weeks, fill_value=0.0).to_numpy() @ membership
+    if bonus is not None:
+        points += bonus.reindex(index=weeks, columns=teams).fillna(0.0).to_numpy(dtype=float)
+    result = pd.DataFrame(points, index=weeks, columns=teams)
+    result.index.name = "Week"
+    return result
+
+
+def team_players(players: Iterable[str]) -> list[str]:
+    """Roster entries without the NaN padding of ragged roster frames."""
+    return [p for p in players if isinstance(p, str) and p]
+
+
+ANSWER_SEPARATORS = r"[,/;]"
+
+
+def accepted_answers(correct_answers: pd.Series) -> pd.DataFrame:
+    """
+    One (question, answer) row per accepted answer. Text answers may list
+    several alternatives separated by , / or ; and each is whitespace-stripped;
+    missing answers accept nothing.
+    """
+    correct = pd.Series(correct_answers).reset_index(drop=True)
+    present = correct.notna().to_numpy()
+    is_text = correct.map(lambda v: isinstance(v, str)).to_numpy()
+    text = correct[present & is_text].astype(str)
+    parts = text.str.split(ANSWER_SEPARATORS, regex=True).explode().str.strip()
+    parts = parts[parts != ""]
+    # A text answer made only of separators is accepted verbatim.
+    bare = text.index.difference(parts.index)
+    others = correct[present & ~is_text]
+    frames = [parts, text[bare].str.strip(), others.astype(str).str.strip()]
+    answers = pd.concat(frames).sort_index(kind="stable")
+    return pd.DataFrame({"question": answers.index.to_numpy(dtype=np.int64), "answer": answers.to_numpy(dtype=object)})
+
+
+def grade_answers(correct_answers: pd.Series, team_answers: pd.DataFrame) -> np.ndarray:
+    """
+    (questions x teams) boolean correctness matrix: a team's stripped answer
+    is correct when it is one of the question's accepted_answers(). Blank
+    answers are never correct. Rows of team_answers line up with
+    correct_answers by position.
+    """
+    n_questions, n_teams = team_answers.shape
+    flat = team_answers.to_numpy(dtype=object).ravel()
+    answered = pd.notna(flat)
+    given = pd.Series(flat[answered]).astype(str).str.strip().to_numpy(dtype=object)
+    question = np.repeat(np.arange(n_questions), n_teams)[answered]
+
+    accepted = accepted_answers(correct_answers)
+    accepted_keys = pd.MultiIndex.from_arrays([accepted["question"].to_numpy(), accepted["answer"].to_numpy()])
+    correct = np.zeros(n_questions * n_teams, dtype=bool)
+    correct[answered] = pd.MultiIndex.from_arrays([question, given]).isin(accepted_keys)
+    return correct.reshape(n_questions, n_teams)
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in SQLite statement tracing for fantasy_backend.
+
+enable() makes the connection pool open connections as TracedConnection, so
+every statement that goes through get_conn() is timed from execute() until
+its last row is fetched. Each finished statement is recorded with its
+normalized text, duration and rows returned (rows affected for writes). The
+first execution of each distinct statement, plus a sampled share of later
+ones, also gets its EXPLAIN QUERY PLAN, with full scans of the scoring
+tables flagged as in query_plans.py.
+
+Records go to a rolling in-memory window (for top_statements()) and,
+optionally, a JSONL log:
+
+    python sql_trace.py --top 15 --log data/sql_trace.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+import fantasy_backend as fb
+from query_plans import full_scans, is_explainable, normalize_sql
+
+DEFAULT_LOG = Path("data/sql_trace.jsonl")
+WINDOW = 10000          # statements kept for the rolling report
+PLAN_SAMPLE_RATE = 0.01  # share of repeat executions re-explained
+
+
+@dataclass
+class StatementRecord:
+    ts: float
+    statement: str
+    duration_ms: float
+    rows: int
+    thread: str
+    plan: Optional[list[str]] = None
+    full_scans: list[str] = field(default_factory=list)
+
+
+class Tracer:
+    def __init__(self, log_path: Optional[Path] = None, sample_rate: float = PLAN_SAMPLE_RATE,
+                 window: int = WINDOW) -> None:
+        self.sample_rate = sample_rate
+        self.records: deque[StatementRecord] = deque(maxlen=window)
+        self.plans: dict[str, tuple[list[str], list[str]]] = {}
+        self._lock = threading.Lock()
+        self._log = None
+        if log_path is not None:
+            Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(log_path, "a", encoding="utf-8", buffering=1)
+
+    def wants_plan(self, statement: str) -> bool:
+        return statement not in self.plans or random.random() < self.sample_rate
+
+    def record(self, record: StatementRecord) -> None:
+        with self._lock:
+            if record.plan is not None:
+                self.plans[record.statement] = (record.plan, record.full_scans)
+            self.records.append(record)
+            if self._log is not None:
+                self._log.write(json.dumps(asdict(record)) + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def top_statements(self, n: int = 10, by: str = "total_ms") -> pd.DataFrame:
+        """The n costliest statements in the window, by total_ms, p95_ms, max_ms or count."""
+        with self._lock:
+            df = pd.DataFrame(
+                [(r.statement, r.duration_ms, r.rows) for r in self.records],
+                columns=["statement", "duration_ms", "rows"],
+            )
+            plans = dict(self.plans)
+        if df.empty:
+            return pd.DataFrame(
+                columns=["statement", "count", "total_ms", "mean_ms", "p95_ms", "max_ms", "mean_rows", "full_scan", "plan"]
+            )
+        grouped = df.groupby("statement")
+        report = pd.DataFrame(
+            {
+                "count": grouped.size(),
+                "total_ms": grouped["duration_ms"].sum(),
+                "mean_ms": grouped["duration_ms"].mean(),
+                "p95_ms": grouped["duration_ms"].quantile(0.95),
+                "max_ms": grouped["duration_ms"].max(),
+                "mean_rows": grouped["rows"].mean(),
+            }
+        ).reset_index()
+        report["full_scan"] = report["statement"].map(lambda s: bool(plans.get(s, ([], []))[1]))
+        report["plan"] = report["statement"].map(lambda s: "; ".join(plans.get(s, ([], []))[0]))
+        return report.sort_values(by, ascending=False).head(n).reset_index(drop=True)
+
+
+_TRACER: Optional[Tracer] = None
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Times execute() plus every fetch until the result is exhausted, closed or dropped."""
+
+    _pending: Optional[list] = None  # [statement, plan, full scans, elapsed seconds, rows]
+
+    def _start(self, sql: str, parameters, explain: bool) -> None:
+        self._finish()
+        tracer = _TRACER
+        if tracer is None:
+            return
+        statement = normalize_sql(sql)
+        plan, scans = None, []
+        if explain and is_explainable(sql) and tracer.wants_plan(statement):
+            try:
+                raw = self.connection.cursor(sqlite3.Cursor)
+                plan = [row[3] for row in raw.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+                scans = full_scans(sql, plan)
+            except sqlite3.Error:
+                plan = None
+        self._pending = [statement, plan, scans, 0.0, 0]
+
+    def _finish(self) -> None:
+        pending, self._pending = self._pending, None
+        tracer = _TRACER
+        if pending is None or tracer is None:
+            return
+        statement, plan, scans, elapsed, rows = pending
+        if not rows and self.rowcount > 0:
+            rows = self.rowcount
+        tracer.record(
+            StatementRecord(time.time(), statement, elapsed * 1000, rows, threading.current_thread().name, plan, scans)
+        )
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._pending is not None:
+                self._pending[3] += time.perf_counter() - started
+
+    def execute(self, sql, parameters=()):
+        self._start(sql, parameters, explain=True)
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql, (), explain=False)
+        result = self._timed(super().executemany, sql, seq_of_parameters)
+        self._finish()
+        return result
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._pending is not None:
+            self._pending[4] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(super().fetchmany, size)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._pending is not None:
+            self._pending[4] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Single-row lookups are rarely read to exhaustion; record them when the cursor goes away.
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class TracedConnection(sqlite3.Connection):
+    def cursor(self, factory=None):
+        return super().cursor(factory or TracedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def enable(log_path: Optional[Path] = None, sample_rate: float = PLAN_SAMPLE_RATE, window: int = WINDOW) -> Tracer:
+    """Start tracing every connection get_conn() opens from now on."""
+    global _TRACER
+    disable()
+    _TRACER = Tracer(log_path, sample_rate, window)
+    fb.set_connection_factory(TracedConnection)
+    return _TRACER
+
+
+def disable() -> None:
+    global _TRACER
+    tracer, _TRACER = _TRACER, None
+    if tracer is not None:
+        fb.set_connection_factory(None)
+        tracer.close()
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _TRACER
+
+
+if __name__ == "__main__":
+    from query_plans import _exercise_backend
+
+    parser = argparse.ArgumentParser(description="Trace the backend entry points on a scratch database.")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--by", choices=["total_ms", "p95_ms", "max_ms", "count"], default="total_ms")
+    parser.add_argument("--log", type=Path, help="also append every statement to this JSONL file")
+    args = parser.parse_args()
+
+    original_path = fb.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        fb.close_all_connections()
+        fb.DB_PATH = Path(tmp) / "sql_trace.db"
+        tracer = enable(args.log, sample_rate=1.0)
+        try:
+            _exercise_backend()
+        finally:
+            disable()
+            fb.DB_PATH = original_path
+
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_colwidth", 90)
+    report = tracer.top_statements(args.top, args.by)
+    print(report.drop(columns=["plan"]).to_string(formatters={"statement": lambda s: s[:90]}))
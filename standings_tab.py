@@ -4,251 +4,107 @@ Created on Wed Mar 26 11:53:21 2025
 
 @author: IsaacSchultz
 """
-from utils_cache import read_excel, read_csv, cache_df, cache_obj
+from utils_cache import read_excel, read_csv, read_workbook, cache_df, file_fingerprint
+from scoring import score_season, team_week_points
+from fantasy_backend import get_roster_index, list_roster_players
+from image_service import get_image, prefetch
+from perf import span, timed
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from PIL import Image, ImageDraw, ImageFont
-import requests
-from io import BytesIO
 
+@timed("tab.standings")
 def standings_tab():
     league = st.session_state["league"]
     season = st.session_state["season"]
     paths  = st.session_state["paths"]
     scores_file_path = paths["scores"]
-    images_path      = paths["images"]
     point_values_src = paths["point_values"]
     st.header("Standings and Team Rosters")
-    def overlay_red_x(image_url):
-        key = f"redx|{image_url}"
-        cached = cache_obj(key, None)
-        if cached is not None:
-            return cached
-    
-        response = requests.get(image_url)
-        img = Image.open(BytesIO(response.content)).convert("RGBA")
-    
-        draw = ImageDraw.Draw(img)
-        width, height = img.size
-        line_width = int(width * 0.08)
-        draw.line((0, 0, width, height), fill=(255, 0, 0, 255), width=line_width)
-        draw.line((width, 0, 0, height), fill=(255, 0, 0, 255), width=line_width)
-    
-        return cache_obj(key, img)
 
-    
-    
     # --- Pull global state from sidebar ---
     season = st.session_state["season"]
     league = st.session_state["league"]
     
 
-    def load_data(scores_file_path, images_path, league, point_values_src):
-        raw_scores   = read_excel(scores_file_path, "PointsScored_Survivor")
-        bonus_scores = read_excel(scores_file_path, "Weekly_Pick_Scores")
-        bonus_scores = bonus_scores.drop(columns=["Week"])
-        bonus_scores.columns = bonus_scores.columns.str.strip()
+    def load_data(scores_file_path, league, point_values_src):
+        sheets = read_workbook(scores_file_path, ["PointsScored_Survivor", "Weekly_Pick_Scores"])
+        raw_scores = sheets["PointsScored_Survivor"]
+        bonus_scores = (
+            sheets["Weekly_Pick_Scores"].rename(columns=lambda c: str(c).strip())
+            .dropna(subset=["Week"])
+            .set_index("Week")
+        )
     
         if league == "Bi-coastal Elites":
             point_values = read_excel(point_values_src, "PointValues_Survivor")
         else:
             point_values = read_csv("data/PointValues_Survivor.csv")
-    
-        player_images = read_excel(images_path, "Images")
-        return raw_scores, bonus_scores, point_values, player_images
-
-
-
-    raw_scores, bonus_scores, point_values, player_images = load_data(
-        scores_file_path, images_path, league, point_values_src
-    )
-
-
 
-    # --- Roster definitions ---
-    def get_all_rosters(season):
-        if season == "Season 49":
-            return {
-                "NE Portland": pd.DataFrame({
-                    "Picasso": ['Savannah','Steven','Jawan','Sage'],
-                    "Brackie": ['MC','Rizo','Matt','Shannon' ],
-                    "Polron":  ['Sophie S','Nate','Jason','Kristina'],
-                    'Kanna':   ['Alex','Jeremiah','Sophi B','Jake']}),
-                    
-                    "Bi-coastal Elites": pd.DataFrame({
-                        'Jena':            ['Matt','Sophie S','Rizo'],
-                        'Schultz & Big P': ['Kristina','Alex','Savannah' ],
-                        'Isaac':           ['Jawan','Jeremiah','Steven'],
-                        'Mike':            ['Nate','Jake','Sage'],
-                        'Nick':            ['MC','Nicole','Annie'],
-                        'Eric':            ['Jason','Sophi B','Shannon']})
-                
-            }
-        
-        if season == "Season 48":
-            return {
-                "NE Portland": pd.DataFrame({
-                    "Picasso": ['Eva','Mitch','Mary','Sai'],
-                    "Brackie": [ 'Kamilla','Kyle','Chrissy','Cedrek'],
-                    "Polron": ['Joe','Thomas','Bianca','Charity'],
-                    'Kanna':['Shauhin','Justin','Star','David']
-                })
-            }
-        if season == 'Season 47':
-            return {
-                "NE Portland": pd.DataFrame({
-                    "Picasso": ['Sam','Sierra','Genevieve','Sue','Caroline'],
-                    "Brackie": ['Kyle','Rome','Sol','Anika','Kishan'],
-                    "Polron": ['Teeny','Rachel','Andy','Gabe','Tiyana']
-                })
-            }
+        return raw_scores, bonus_scores, point_values
 
-    all_rosters = get_all_rosters(season)
-    roster_df = all_rosters[league]
-    #teams = roster_df.columns.tolist()
 
-    # --- Scoring Functions ---
-    def clean_data(df):
-        df.columns = df.columns.str.replace(" ", "_").str.replace(".", "_", regex=False)
-        return df.fillna(0)
-
-    def apply_point_values(raw_scores, point_values):
-        raw_scores = raw_scores.copy()
-        point_values = point_values.copy()
-    
-        # Don't rename anything — match original column names exactly
-        raw_scores = raw_scores.fillna(0)
-        point_values["Event"] = point_values["Event"].str.strip()
-        raw_scores.columns = raw_scores.columns.str.strip()
-        for _, row in point_values.iterrows():
-            event = row["Event"]
-            if event in raw_scores.columns:
-                raw_scores[event] *= row["Points"]
-    
-        event_cols = [col for col in point_values["Event"] if col in raw_scores.columns]
-        raw_scores["total"] = raw_scores[event_cols].sum(axis=1)
-        return raw_scores, event_cols
-
-    def get_scoreboard(raw_scores):
-        scoreboard = raw_scores[["Player", "Week", "total"]].copy()
-        scoreboard["rolling_total"] = scoreboard.groupby("Player")["total"].cumsum()
-        return scoreboard
-
-    def get_team_totals(scoreboard, roster_df, bonus_scores):
-        player_totals = scoreboard.groupby("Player")["total"].sum()
-        team_totals = {}
-        for team in roster_df.columns:
-            players = roster_df[team].dropna()
-            player_total = player_totals.loc[players].sum()
-            bonus_total = bonus_scores[team].sum() if team in bonus_scores.columns else 0
-            team_totals[team] = player_total + bonus_total
-        return pd.DataFrame.from_dict(team_totals, orient='index', columns=["Total Points"]).sort_values("Total Points", ascending=False)
 
+    raw_scores, bonus_scores, point_values = load_data(
+        scores_file_path, league, point_values_src
+    )
 
-    def get_team_scores_by_week(scoreboard, roster_df):
-        weeks = sorted(scoreboard["Week"].unique())
-        team_data = { "Week": weeks }
 
-        for team in roster_df.columns:
-            team_week_scores = []
-            for w in weeks:
-                week_df = scoreboard[scoreboard["Week"] == w]
-                players = roster_df[team].dropna()
-                total = week_df[week_df["Player"].isin(players)]["total"].sum()
-                team_week_scores.append(total)
-            team_data[team] = pd.Series(team_week_scores).cumsum()
 
-        return pd.DataFrame(team_data)
+    # --- Rosters (team -> players, shared index loaded from the league database) ---
+    roster_index = get_roster_index(league, season)
+    rosters = roster_index.rosters(league, season)
+    roster_version = roster_index.version
 
     # --- Process Scoring ---
-    scored, _ = apply_point_values(raw_scores, point_values)
-    key_scored = f"{league}|{season}|scored"
-    scored = cache_df(key_scored, scored, file_path=scores_file_path)
+    scores = score_season(
+        raw_scores,
+        point_values,
+        cache_key=(scores_file_path, file_fingerprint(scores_file_path),
+                   point_values_src, file_fingerprint(point_values_src)),
+    )
 
-    scoreboard = get_scoreboard(scored)
+    source_files = (scores_file_path, point_values_src)
     key_scoreboard = f"{league}|{season}|scoreboard"
-    scoreboard = cache_df(key_scoreboard, scoreboard, file_path=scores_file_path)
+    scoreboard = cache_df(key_scoreboard, scores.scoreboard, file_path=source_files)
     
-    standings_df = get_team_totals(scoreboard, roster_df, bonus_scores)
-    key_standings = f"{league}|{season}|standings"
-    standings_df = cache_df(key_standings, standings_df, file_path=scores_file_path)
+    # (week x team) points from one roster-membership matrix product; bonuses join on the week key.
+    # Rosters live in the database, so their version is part of the key.
+    key_team_week = f"{league}|{season}|team_week|{roster_version}"
+    team_week = cache_df(
+        key_team_week, lambda: team_week_points(scoreboard, rosters, bonus_scores), file_path=source_files
+    )
+
+    key_standings = f"{league}|{season}|standings|{roster_version}"
+    standings_df = cache_df(
+        key_standings,
+        lambda: team_week.sum().to_frame("Total Points").sort_values("Total Points", ascending=False),
+        file_path=source_files,
+    )
 
 #####################################################################################
     # --- Line Chart: Team Scores by Week ---
     # --- Team Scores Chart Options ---
     chart_type = st.radio("Show Team Scores as:", ["Cumulative Line Chart", "Weekly Bar Chart"])
     
-    # --- Cumulative Line Chart ---
-    def get_cumulative_team_scores(scoreboard, roster_df, bonus_scores):
-        weeks = sorted(scoreboard["Week"].unique())
-        team_data = { "Week": weeks }
-    
-        for team in roster_df.columns:
-            team_week_scores = []
-            for w in weeks:
-                week_df = scoreboard[scoreboard["Week"] == w]
-                players = roster_df[team].dropna()
-                player_total = week_df[week_df["Player"].isin(players)]["total"].sum()
-                
-                # Grab bonus for that week
-                bonus = 0
-                if team in bonus_scores.columns:
-                    try:
-                        bonus = bonus_scores.iloc[w - 1][team]
-                    except Exception:
-                        pass  # In case week index mismatch
-    
-                team_week_scores.append(player_total + bonus)
-    
-            team_data[team] = pd.Series(team_week_scores).cumsum()
-    
-        return pd.DataFrame(team_data)
-    
-    # --- Weekly (Non-Cumulative) Scores ---
-    def get_weekly_team_scores(scoreboard, roster_df, bonus_scores):
-        weeks = sorted(scoreboard["Week"].unique())
-        team_data = { "Week": weeks }
-    
-        for team in roster_df.columns:
-            team_week_scores = []
-            for w in weeks:
-                week_df = scoreboard[scoreboard["Week"] == w]
-                players = roster_df[team].dropna()
-                player_total = week_df[week_df["Player"].isin(players)]["total"].sum()
-    
-                # Grab bonus for that week
-                bonus = 0
-                if team in bonus_scores.columns:
-                    try:
-                        bonus = bonus_scores.iloc[w - 1][team]
-                    except Exception:
-                        pass
-    
-                team_week_scores.append(player_total + bonus)
-    
-            team_data[team] = team_week_scores
-    
-        return pd.DataFrame(team_data)
-    
     if chart_type == "Cumulative Line Chart":
         st.subheader("Team Scores by Week (Cumulative)")
-        team_week_df = get_cumulative_team_scores(scoreboard, roster_df, bonus_scores)
-        key_cum = f"{league}|{season}|team_week_cumulative"
-        team_week_df = cache_df(key_cum, team_week_df, file_path=scores_file_path)
-        team_long = team_week_df.melt(id_vars="Week", var_name="Team", value_name="Score")
-        fig = px.line(team_long, x="Week", y="Score", color="Team", markers=True)
-        fig.update_layout(height=400)
+        key_cum = f"{league}|{season}|team_week_cumulative|{roster_version}"
+        team_week_df = cache_df(key_cum, lambda: team_week.cumsum().reset_index(), file_path=source_files)
+        with span("standings.plotly"):
+            team_long = team_week_df.melt(id_vars="Week", var_name="Team", value_name="Score")
+            fig = px.line(team_long, x="Week", y="Score", color="Team", markers=True)
+            fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
     
     elif chart_type == "Weekly Bar Chart":
         st.subheader("Team Scores by Week (Non-Cumulative)")
-        team_week_df = get_weekly_team_scores(scoreboard, roster_df, bonus_scores)
-        key_weekly = f"{league}|{season}|team_week_weekly"
-        team_week_df = cache_df(key_weekly, team_week_df, file_path=scores_file_path)
-        team_long = team_week_df.melt(id_vars="Week", var_name="Team", value_name="Score")
-        fig = px.bar(team_long, x="Week", y="Score", color="Team", text="Score")
-        fig.update_layout(barmode="group", height=450, xaxis=dict(type='category'))
+        key_weekly = f"{league}|{season}|team_week_weekly|{roster_version}"
+        team_week_df = cache_df(key_weekly, team_week.reset_index, file_path=source_files)
+        with span("standings.plotly"):
+            team_long = team_week_df.melt(id_vars="Week", var_name="Team", value_name="Score")
+            fig = px.bar(team_long, x="Week", y="Score", color="Team", text="Score")
+            fig.update_layout(barmode="group", height=450, xaxis=dict(type='category'))
 
         st.plotly_chart(fig, use_container_width=True)
 ####################################################################################
@@ -259,19 +115,20 @@ def standings_tab():
     # --- Team Rosters with Images ---
     st.subheader("Team Rosters")
 
-    for team in roster_df.columns:
-        st.markdown(f"### {team}")
-        players = roster_df[team].dropna().tolist()
-        cols = st.columns(len(players))
+    # One indexed query for every roster slot's image and eliminated flag, in roster order
+    roster_players = list_roster_players(league, season)
 
-        for i, player in enumerate(players):
-            info = player_images[player_images["Player"] == player]
-            if not info.empty:
-                url = info["Image"].values[0]
-                eliminated = info["Eliminated"].values[0] == "Yes"
-                with cols[i]:
-                    if eliminated:
-                        img = overlay_red_x(url)
-                        st.image(img, caption=player, width=130)
-                    else:
-                        st.image(url, caption=player, width=130)
+    # Warm the local thumbnail cache for every rostered player in parallel
+    prefetch(roster_players["image_url"].dropna())
+
+    for team, team_players in roster_players.groupby("team_name", sort=False):
+        st.markdown(f"### {team}")
+        cols = st.columns(len(team_players))
+
+        for col, player, url, eliminated in zip(
+            cols, team_players["player_name"], team_players["image_url"], team_players["is_eliminated"]
+        ):
+            if pd.notna(url):
+                with col:
+                    img = get_image(url, eliminated=bool(eliminated))
+                    st.image(img if img is not None else url, caption=player, width=130)
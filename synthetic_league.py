@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic league generator for load testing the backend.
+
+A SyntheticSpec describes the scale (leagues, teams, weeks, events, ...).
+From it this module can build either
+
+* a populated SQLite database, written straight through the backend schema
+  (fast, used for the read-path benchmarks), or
+* legacy-style workbooks plus matching LEAGUE_CONFIG / ROSTERS mappings, so
+  seed_from_legacy can be timed end to end.
+
+Everything is drawn from one seeded RNG, so the same spec always produces the
+same data.
+
+    python synthetic_league.py --scale large --db data/synthetic.db
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass, replace
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import fantasy_backend as fb
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    leagues: int = 20
+    teams_per_league: int = 10
+    seasons: int = 1
+    weeks: int = 15
+    events: int = 40
+    players: int = 20           # players per season; every league drafts from the same pool
+    roster_size: int = 5
+    event_density: float = 0.05  # share of (player, week, event) cells with a non-zero count
+    seed: int = 0
+
+    @property
+    def teams(self) -> int:
+        return self.leagues * self.teams_per_league
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "teams": self.teams}
+
+
+SCALES = {
+    "small": SyntheticSpec(),
+    "medium": SyntheticSpec(leagues=100, weeks=26, events=80, players=24),
+    "large": SyntheticSpec(leagues=500, weeks=40, events=150, players=24),
+}
+
+
+@dataclass
+class SyntheticLeague:
+    spec: SyntheticSpec
+    leagues: list[str]
+    seasons: list[str]
+    players: list[str]
+    events: list[str]
+    point_values: dict[str, np.ndarray]                 # season -> (events,) points
+    counts: dict[str, np.ndarray]                       # season -> (weeks, players, events) counts
+    rosters: dict[tuple[str, str], dict[str, list[str]]]  # (league, season) -> team -> players
+    bonus: dict[tuple[str, str], np.ndarray]            # (league, season) -> (weeks, teams) points
+
+
+def generate(spec: SyntheticSpec) -> SyntheticLeague:
+    rng = np.random.default_rng(spec.seed)
+    leagues = [f"League {i:03d}" for i in range(spec.leagues)]
+    seasons = [f"Season {i + 1}" for i in range(spec.seasons)]
+    players = [f"Player {i:03d}" for i in range(spec.players)]
+    events = [f"Event {i:03d}" for i in range(spec.events)]
+
+    point_values, counts = {}, {}
+    for season in seasons:
+        point_values[season] = rng.integers(-5, 11, spec.events).astype(float)
+        shape = (spec.weeks, spec.players, spec.events)
+        counts[season] = (rng.random(shape) < spec.event_density) * rng.integers(1, 3, shape)
+
+    rosters, bonus = {}, {}
+    for league in leagues:
+        for season in seasons:
+            rosters[(league, season)] = {
+                f"{league} Team {t:02d}": [
+                    players[p] for p in rng.choice(spec.players, size=min(spec.roster_size, spec.players), replace=False)
+                ]
+                for t in range(spec.teams_per_league)
+            }
+            bonus[(league, season)] = rng.choice([0.0, 0.0, 5.0, 10.0], size=(spec.weeks, spec.teams_per_league))
+
+    return SyntheticLeague(spec, leagues, seasons, players, events, point_values, counts, rosters, bonus)
+
+
+def _event_rows(data: SyntheticLeague, season: str, season_id: int) -> list[tuple]:
+    weeks, player_idx, event_idx = np.nonzero(data.counts[season])
+    values = data.counts[season][weeks, player_idx, event_idx].astype(float)
+    return list(
+        zip(
+            repeat(season_id),
+            (weeks + 1).tolist(),
+            [data.players[i] for i in player_idx],
+            [data.events[i] for i in event_idx],
+            values.tolist(),
+        )
+    )
+
+
+def build_database(path: Path, spec: SyntheticSpec) -> SyntheticLeague:
+    """
+    Create (or replace) a database at path and fill it for spec. fb.DB_PATH
+    is pointed at the new database and left there.
+    """
+    data = generate(spec)
+    path = Path(path)
+    fb.close_all_connections()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    fb.DB_PATH = path
+    fb.migrate()
+
+    with fb.get_conn() as conn:
+        conn.executemany("INSERT INTO leagues(name) VALUES (?)", [(name,) for name in data.leagues])
+        conn.executemany("INSERT INTO seasons(label) VALUES (?)", [(label,) for label in data.seasons])
+        league_ids = {r["name"]: r["id"] for r in conn.execute("SELECT id, name FROM leagues")}
+        season_ids = {r["label"]: r["id"] for r in conn.execute("SELECT id, label FROM seasons")}
+        conn.executemany(
+            "INSERT INTO teams(league_id,season_id,name) VALUES (?,?,?)",
+            [
+                (league_ids[league], season_ids[season], team)
+                for (league, season), teams in data.rosters.items()
+                for team in teams
+            ],
+        )
+        team_ids = {
+            (r["league_id"], r["season_id"], r["name"]): r["id"]
+            for r in conn.execute("SELECT id, league_id, season_id, name FROM teams")
+        }
+        roster_rows, bonus_rows = [], []
+        for (league, season), teams in data.rosters.items():
+            ids = [team_ids[(league_ids[league], season_ids[season], team)] for team in teams]
+            roster_rows += [(tid, player) for tid, players in zip(ids, teams.values()) for player in players]
+            weeks, cols = np.nonzero(data.bonus[(league, season)])
+            bonus_rows += [
+                (ids[c], int(w) + 1, float(data.bonus[(league, season)][w, c])) for w, c in zip(weeks, cols)
+            ]
+        conn.executemany("INSERT INTO roster_players(team_id, player_name) VALUES (?,?)", roster_rows)
+        conn.executemany(
+            "INSERT INTO weekly_question_scores(team_id,week_number,points) VALUES (?,?,?)", bonus_rows
+        )
+        for season in data.seasons:
+            season_id = season_ids[season]
+            conn.executemany(
+                "INSERT INTO point_values(season_id,event_name,points) VALUES (?,?,?)",
+                zip(repeat(season_id), data.events, data.point_values[season].tolist()),
+            )
+            fb._categorize_events(conn, season_id)
+            conn.executemany(
+                "INSERT INTO player_event_scores(season_id,week_number,player_name,event_name,value) VALUES (?,?,?,?,?)",
+                _event_rows(data, season, season_id),
+            )
+        fb._rebuild_team_week_scores(conn)
+        fb._bump_data_version(conn)
+    return data
+
+
+def write_workbooks(root: Path, spec: SyntheticSpec) -> tuple[dict, dict]:
+    """
+    Write legacy-format workbooks for spec under root.
+
+    Returns (league_config, rosters) shaped like fb.LEAGUE_CONFIG and
+    fb.ROSTERS. Each season gets one scores workbook whose Weekly_Pick_Scores
+    sheet carries a column for every team, shared by all leagues.
+    """
+    data = generate(spec)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    league_config: dict[str, dict[str, dict[str, str]]] = {league: {} for league in data.leagues}
+    for season in data.seasons:
+        counts = data.counts[season]
+        scores = pd.DataFrame(
+            counts.reshape(-1, spec.events), columns=data.events
+        )
+        scores.insert(0, "Week", np.repeat(np.arange(1, spec.weeks + 1), spec.players))
+        scores.insert(0, "Player", data.players * spec.weeks)
+        bonus = pd.DataFrame({"Week": np.arange(1, spec.weeks + 1)})
+        bonus = pd.concat(
+            [bonus]
+            + [
+                pd.DataFrame(data.bonus[(league, season)], columns=list(data.rosters[(league, season)]))
+                for league in data.leagues
+            ],
+            axis=1,
+        )
+        scores_path = root / f"PointsScored_{season.replace(' ', '_')}.xlsx"
+        with pd.ExcelWriter(scores_path) as writer:
+            scores.to_excel(writer, sheet_name="PointsScored_Survivor", index=False)
+            bonus.to_excel(writer, sheet_name="Weekly_Pick_Scores", index=False)
+        points_path = root / f"PointValues_{season.replace(' ', '_')}.csv"
+        pd.DataFrame({"Event": data.events, "Points": data.point_values[season]}).to_csv(points_path, index=False)
+        for league in data.leagues:
+            league_config[league][season] = {"scores": str(scores_path), "point_values": str(points_path)}
+    return league_config, data.rosters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a synthetic fantasy league database.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--db", type=Path, default=Path("data/synthetic.db"))
+    parser.add_argument("--leagues", type=int)
+    parser.add_argument("--weeks", type=int)
+    parser.add_argument("--events", type=int)
+    args = parser.parse_args()
+    overrides = {k: v for k, v in {"leagues": args.leagues, "weeks": args.weeks, "events": args.events}.items() if v}
+    spec = replace(SCALES[args.scale], **overrides)
+    build_database(args.db, spec)
+    with fb.get_conn(readonly=True) as conn:
+        sizes = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("teams", "roster_players", "player_event_scores", "weekly_question_scores", "team_week_scores")
+        }
+    print(f"Wrote {args.db}: {spec.as_dict()}")
+    for table, count in sizes.items():
+        print(f"  {table:<24} {count:>10,} rows")
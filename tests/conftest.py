@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures. Tests run from the repository root against the flat
+top-level modules. The legacy workbooks in data/ are read but never
+written; databases and sidecars go to pytest's temporary directories, and
+nothing here touches the network.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def png_bytes(width: int, height: int, color: tuple[int, int, int] = (40, 120, 200)) -> bytes:
+    out = BytesIO()
+    Image.new("RGB", (width, height), color).save(out, format="PNG")
+    return out.getvalue()
+
+
+class ImageServer:
+    """
+    Local stand-in for the remote image host. /<name>.png serves a solid PNG
+    (400x600 unless sized like /w200h100.png); any path under /missing/ is a
+    404. Requests are counted per path, and delay holds each response open so
+    tests can see how many are in flight at once.
+    """
+
+    def __init__(self) -> None:
+        self.requests: dict[str, int] = {}
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests[self.path] = server.requests.get(self.path, 0) + 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.delay)
+                    if self.path.startswith("/missing/"):
+                        self.send_error(404)
+                        return
+                    body = png_bytes(*server.size_for(self.path))
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @staticmethod
+    def size_for(path: str) -> tuple[int, int]:
+        name = path.rsplit("/", 1)[-1].removesuffix(".png")
+        if name.startswith("w") and "h" in name:
+            width, height = name[1:].split("h", 1)
+            if width.isdigit() and height.isdigit():
+                return int(width), int(height)
+        return 400, 600
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}{path}"
+
+    def count(self, path: str) -> int:
+        with self._lock:
+            return self.requests.get(path, 0)
+
+    def __enter__(self) -> "ImageServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture(scope="session")
+def sidecar_dir(tmp_path_factory) -> Path:
+    return tmp_path_factory.mktemp("sidecars")
+
+
+@pytest.fixture
+def seeded_db(tmp_path, sidecar_dir, monkeypatch) -> Path:
+    """A scratch database migrated and seeded from the legacy workbooks; fantasy_backend.DB_PATH points at it."""
+    import fantasy_backend as fb
+    import workbooks
+
+    monkeypatch.setattr(workbooks, "SIDECAR_DIR", sidecar_dir)
+    monkeypatch.setattr(fb, "DB_PATH", tmp_path / "fantasy_survivor.db")
+    fb.init_db(force_seed=True)
+    yield fb.DB_PATH
+    fb.close_all_connections()
+    fb.clear_caches()
+
+
+@pytest.fixture
+def image_server():
+    with ImageServer() as server:
+        yield server
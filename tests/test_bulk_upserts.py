@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import fantasy_backend as fb
+
+LEAGUE, SEASON = "NE Portland", "Season 49"
+
+SNAPSHOTS = {
+    "player_event_scores": "SELECT season_id, week_number, player_name, event_name, value FROM player_event_scores",
+    "weekly_question_scores": "SELECT team_id, week_number, points FROM weekly_question_scores",
+    "team_week_scores": """
+        SELECT team_id, week_number, ROUND(player_points, 9), ROUND(bonus_points, 9),
+               ROUND(week_total, 9), ROUND(cumulative_total, 9)
+        FROM team_week_scores
+    """,
+}
+
+
+def _snapshot(path) -> dict[str, list[tuple]]:
+    with sqlite3.connect(path) as conn:
+        return {table: sorted(conn.execute(sql).fetchall()) for table, sql in SNAPSHOTS.items()}
+
+
+def _copy(source, target):
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+    return target
+
+
+def _writes(seed: int = 7) -> tuple[list[tuple], list[tuple]]:
+    # Existing and new weeks, players on one or two teams (and none), and repeated keys where the last value wins.
+    rng = random.Random(seed)
+    players = sorted(fb.list_players_for_season(SEASON))
+    events = fb.list_events_for_season(SEASON)[:12]
+    teams = fb.list_teams_for_league_season(LEAGUE, SEASON)
+    weeks = [1, 4, 10, 12]
+    events_rows = [
+        (rng.choice(weeks), rng.choice(players), rng.choice(events), float(rng.randint(0, 3))) for _ in range(60)
+    ]
+    bonus_rows = [(rng.choice(teams), rng.choice(weeks), float(rng.randint(0, 5))) for _ in range(20)]
+    return events_rows, bonus_rows
+
+
+def test_bulk_upserts_match_single_row_upserts(seeded_db, tmp_path, monkeypatch):
+    before = _snapshot(seeded_db)
+    bulk_db = _copy(seeded_db, tmp_path / "bulk.db")
+    events_rows, bonus_rows = _writes()
+
+    for week, player, event, value in events_rows:
+        fb.upsert_player_event(SEASON, week, player, event, value)
+    for team, week, points in bonus_rows:
+        fb.upsert_weekly_bonus(LEAGUE, SEASON, team, week, points)
+    single = _snapshot(seeded_db)
+
+    monkeypatch.setattr(fb, "DB_PATH", bulk_db)
+    assert fb.upsert_player_events_bulk(SEASON, events_rows) == len({r[:3] for r in events_rows})
+    assert fb.upsert_weekly_bonuses_bulk(LEAGUE, SEASON, bonus_rows) == len({r[:2] for r in bonus_rows})
+    bulk = _snapshot(bulk_db)
+
+    assert single["team_week_scores"] != before["team_week_scores"]
+    assert bulk == single
+
+    # The incremental refresh agrees with recomputing every cell from scratch.
+    fb._write(fb._rebuild_team_week_scores)
+    assert _snapshot(bulk_db)["team_week_scores"] == single["team_week_scores"]
+
+
+def test_rejected_bulk_upsert_writes_nothing(seeded_db):
+    before = _snapshot(seeded_db)
+    version = fb.get_data_version(LEAGUE, SEASON)
+    player = fb.list_players_for_season(SEASON)[0]
+    event = fb.list_events_for_season(SEASON)[0]
+    rows = pd.DataFrame({"Week": [1, 2], "Player": [player, "Nobody"], "Event": [event, event], "Value": [1, 2]})
+
+    with pytest.raises(ValueError, match="unknown player\\(s\\) Nobody"):
+        fb.upsert_player_events_bulk(SEASON, rows)
+    with pytest.raises(ValueError, match="unknown team\\(s\\) Nobody"):
+        fb.upsert_weekly_bonuses_bulk(LEAGUE, SEASON, [("Nobody", 1, 3.0)])
+    assert _snapshot(seeded_db) == before
+    assert fb.get_data_version(LEAGUE, SEASON) == version
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import image_service
+from image_service import THUMB_WIDTH, ImageCache, get_image, prefetch
+
+
+@pytest.fixture(autouse=True)
+def clear_failures():
+    image_service._failed_at.clear()
+    yield
+    image_service._failed_at.clear()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ImageCache(tmp_path / "image_cache")
+
+
+def _open(data: bytes) -> Image.Image:
+    return Image.open(BytesIO(data)).convert("RGBA")
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/player.png"
+
+
+def test_second_get_is_served_from_cache(image_server, cache):
+    url = image_server.url("/sam.png")
+
+    first = get_image(url, cache=cache)
+    second = get_image(url, cache=cache)
+    eliminated = get_image(url, eliminated=True, cache=cache)
+
+    assert first is not None and second == first
+    assert eliminated is not None
+    assert image_server.count("/sam.png") == 1
+
+
+def test_cache_survives_a_new_instance(image_server, tmp_path):
+    url = image_server.url("/sam.png")
+    get_image(url, cache=ImageCache(tmp_path))
+
+    assert get_image(url, cache=ImageCache(tmp_path)) is not None
+    assert image_server.count("/sam.png") == 1
+
+
+def test_missing_image_returns_none(image_server, cache):
+    url = image_server.url("/missing/nobody.png")
+
+    assert get_image(url, cache=cache) is None
+    assert prefetch([url], cache=cache) == {url: False}
+
+
+def test_connection_error_returns_none(cache):
+    url = _closed_port_url()
+
+    assert get_image(url, cache=cache) is None
+    assert url in image_service._failed_at
+
+
+def test_failed_url_backs_off_then_retries(image_server, cache, monkeypatch):
+    url = image_server.url("/missing/nobody.png")
+
+    assert get_image(url, cache=cache) is None
+    assert get_image(url, cache=cache) is None
+    assert image_server.count("/missing/nobody.png") == 1
+
+    # Once RETRY_FAILED_AFTER has passed the URL is requested again.
+    monkeypatch.setitem(
+        image_service._failed_at, url, time.monotonic() - image_service.RETRY_FAILED_AFTER - 1
+    )
+    assert get_image(url, cache=cache) is None
+    assert image_server.count("/missing/nobody.png") == 2
+
+
+def test_success_clears_earlier_failure(image_server, cache):
+    url = image_server.url("/sam.png")
+    image_service._failed_at[url] = time.monotonic() - image_service.RETRY_FAILED_AFTER - 1
+
+    assert get_image(url, cache=cache) is not None
+    assert url not in image_service._failed_at
+
+
+def test_thumbnail_is_scaled_to_thumb_width(image_server, cache):
+    thumb = _open(get_image(image_server.url("/w400h600.png"), cache=cache))
+    wide = _open(get_image(image_server.url("/w1000h250.png"), cache=cache))
+
+    assert thumb.size == (THUMB_WIDTH, round(600 * THUMB_WIDTH / 400))
+    assert wide.size == (THUMB_WIDTH, round(250 * THUMB_WIDTH / 1000))
+
+
+def test_eliminated_variant_is_crossed_out(image_server, cache):
+    url = image_server.url("/w400h600.png")
+    thumb = _open(get_image(url, cache=cache))
+    crossed = _open(get_image(url, eliminated=True, cache=cache))
+
+    assert crossed.size == thumb.size
+    center = (thumb.width // 2, thumb.height // 2)
+    assert thumb.getpixel(center)[:3] == (40, 120, 200)
+    assert crossed.getpixel(center)[:3] == (255, 0, 0)
+    # Away from the diagonals the original picture is untouched.
+    edge = (thumb.width // 2, 2)
+    assert crossed.getpixel(edge) == thumb.getpixel(edge)
+
+
+def test_prefetch_downloads_concurrently(image_server, cache):
+    image_server.delay = 0.3
+    urls = [image_server.url(f"/player{i}.png") for i in range(8)]
+
+    started = time.perf_counter()
+    status = prefetch(urls + urls[:2], cache=cache, workers=8)
+    elapsed = time.perf_counter() - started
+
+    assert status == {url: True for url in urls}
+    assert all(image_server.count(f"/player{i}.png") == 1 for i in range(8))
+    assert image_server.max_in_flight > 1
+    assert elapsed < 8 * image_server.delay / 2
+
+
+def test_prefetch_skips_cached_and_invalid_urls(image_server, cache):
+    url = image_server.url("/sam.png")
+    prefetch([url], cache=cache)
+
+    assert prefetch([url, None, "", float("nan")], cache=cache) == {url: True}
+    assert image_server.count("/sam.png") == 1
+
+
+def test_prefetch_checks_cached_images_without_reading_them(image_server, cache, monkeypatch):
+    url = image_server.url("/sam.png")
+    prefetch([url], cache=cache)
+
+    def no_read(key):
+        raise AssertionError("prefetch read a cached image")
+
+    monkeypatch.setattr(cache, "get", no_read)
+    assert prefetch([url], cache=cache) == {url: True}
+
+
+def test_failed_urls_are_pruned_and_bounded(monkeypatch):
+    monkeypatch.setattr(image_service, "MAX_FAILED_URLS", 5)
+    for i in range(20):
+        image_service._record_failure(f"http://example.invalid/{i}.png")
+
+    assert list(image_service._failed_at) == [f"http://example.invalid/{i}.png" for i in range(15, 20)]
+
+    now = time.monotonic()
+    monkeypatch.setattr(image_service.time, "monotonic", lambda: now + image_service.RETRY_FAILED_AFTER + 1)
+    image_service._record_failure("http://example.invalid/late.png")
+    assert list(image_service._failed_at) == ["http://example.invalid/late.png"]
+
+
+def test_concurrent_puts_of_one_object_count_it_once(tmp_path, monkeypatch):
+    cache = ImageCache(tmp_path)
+    data = b"x" * 1000
+    start = threading.Barrier(8)
+    atomic_write = image_service._atomic_write
+
+    def slow_write(path, payload):
+        time.sleep(0.05)  # widen the window between the exists() check and the write
+        atomic_write(path, payload)
+
+    monkeypatch.setattr(image_service, "_atomic_write", slow_write)
+
+    def put(i: int) -> None:
+        start.wait()
+        cache.put(f"key{i}", data)
+
+    threads = [threading.Thread(target=put, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache._bytes == len(data)
+    assert all(cache.get(f"key{i}") == data for i in range(8))
+
+
+def test_eviction_keeps_store_within_budget(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=5000)
+    for i in range(20):
+        cache.put(f"key{i}", bytes([i]) * 1000)
+
+    stored = list((tmp_path / "objects").glob("*.png"))
+    assert sum(p.stat().st_size for p in stored) <= 5000
+    assert cache.get("key19") is not None
+    assert cache.get("key0") is None
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import pytest
+
+import fantasy_backend as fb
+
+
+@pytest.fixture(autouse=True)
+def empty_attempts():
+    fb._LOGIN_ATTEMPTS.clear()
+    yield
+    fb._LOGIN_ATTEMPTS.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(fb.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_username_is_limited_within_window(clock):
+    assert all(fb._take_login_attempt("alice") for _ in range(fb.LOGIN_ATTEMPTS))
+    assert not fb._take_login_attempt("alice")
+    assert fb.login_retry_after("alice") == pytest.approx(fb.LOGIN_WINDOW)
+
+    clock[0] += fb.LOGIN_WINDOW + 1
+    assert fb.login_retry_after("alice") == 0.0
+    assert fb._take_login_attempt("alice")
+
+
+def test_expired_usernames_are_pruned(clock):
+    for i in range(1000):
+        fb._take_login_attempt(f"made-up-{i}")
+    assert len(fb._LOGIN_ATTEMPTS) == 1000
+
+    clock[0] += fb.LOGIN_WINDOW + 1
+    fb._take_login_attempt("alice")
+    assert list(fb._LOGIN_ATTEMPTS) == ["alice"]
+
+
+def test_flood_of_made_up_usernames_does_not_reset_a_limit(clock):
+    for _ in range(fb.LOGIN_ATTEMPTS):
+        fb._take_login_attempt("alice")
+    for i in range(20000):
+        fb._take_login_attempt(f"made-up-{i}")
+        clock[0] += 0.001
+
+    assert not fb._take_login_attempt("alice")
+    assert fb.login_retry_after("alice") > 0
+
+
+def test_limited_username_survives_pruning(clock):
+    for _ in range(fb.LOGIN_ATTEMPTS):
+        fb._take_login_attempt("alice")
+    clock[0] += fb.LOGIN_WINDOW / 2
+    for i in range(100):
+        fb._take_login_attempt(f"made-up-{i}")
+
+    assert not fb._take_login_attempt("alice")
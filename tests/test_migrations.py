@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import sqlite3
+
+import fantasy_backend as fb
+
+# Tables and indexes the migrations after the base schema create, and the rows they backfill (by natural key, not id).
+LATER_TABLES = [
+    "team_week_scores", "data_versions", "sessions", "app_settings", "event_categories",
+    "team_answers", "weekly_questions", "player_images", "eliminations", "players",
+]
+SCORING_INDEXES = ["idx_player_event_scores_season_player", "idx_roster_players_player", "idx_teams_season_league"]
+BACKFILLS = {
+    "team_week_scores": """
+        SELECT team_id, week_number, ROUND(player_points, 9), ROUND(bonus_points, 9),
+               ROUND(week_total, 9), ROUND(cumulative_total, 9)
+        FROM team_week_scores
+    """,
+    "event_categories": "SELECT season_id, event_name, category, is_override FROM event_categories",
+    "weekly_questions": """
+        SELECT league_id, season_id, week_number, position, question, correct_answer, is_voided
+        FROM weekly_questions
+    """,
+    "team_answers": """
+        SELECT wq.league_id, wq.season_id, wq.week_number, wq.position, ta.team_id, ta.answer, ta.is_correct
+        FROM team_answers ta JOIN weekly_questions wq ON wq.id=ta.question_id
+    """,
+    "players": "SELECT season_id, name, is_eliminated FROM players",
+    "player_images": "SELECT p.season_id, p.name, pi.image_url FROM player_images pi JOIN players p ON p.id=pi.player_id",
+    "eliminations": """
+        SELECT e.season_id, p.name, e.elimination_order, e.week_label
+        FROM eliminations e JOIN players p ON p.id=e.player_id
+    """,
+}
+
+
+def _backfilled(path) -> dict[str, list[tuple]]:
+    with sqlite3.connect(path) as conn:
+        return {table: sorted(conn.execute(sql).fetchall(), key=repr) for table, sql in BACKFILLS.items()}
+
+
+def _rewind_to_base_schema(path, keep: tuple[str, ...] = ()) -> None:
+    # What a version-1 install looked like: the base tables with their data and nothing later.
+    fb.close_all_connections()
+    with sqlite3.connect(path) as conn:
+        for table in LATER_TABLES:
+            if table not in keep:
+                conn.execute(f"DROP TABLE {table}")
+        for index in SCORING_INDEXES:
+            conn.execute(f"DROP INDEX {index}")
+        conn.execute("DELETE FROM schema_version WHERE version > 1")
+
+
+def _versions(path) -> list[int]:
+    with sqlite3.connect(path) as conn:
+        return [r[0] for r in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+
+
+def test_fresh_database_runs_every_migration_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(fb, "DB_PATH", tmp_path / "fresh.db")
+    try:
+        assert fb.migrate() == len(fb.MIGRATIONS)
+        assert fb.migrate() == len(fb.MIGRATIONS)
+        assert _versions(fb.DB_PATH) == [version for version, _, _ in fb.MIGRATIONS]
+        assert fb.schema_version() == len(fb.MIGRATIONS)
+    finally:
+        fb.close_all_connections()
+
+
+def test_base_schema_database_is_migrated_and_backfilled(seeded_db):
+    expected = _backfilled(seeded_db)
+    assert all(expected[table] for table in BACKFILLS)
+
+    _rewind_to_base_schema(seeded_db)
+    assert fb.schema_version() == 1
+
+    assert fb.migrate() == len(fb.MIGRATIONS)
+    assert _versions(seeded_db) == [version for version, _, _ in fb.MIGRATIONS]
+    assert _backfilled(seeded_db) == expected
+    with sqlite3.connect(seeded_db) as conn:
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert set(SCORING_INDEXES) <= indexes
+
+
+def test_materialized_scores_are_not_rebuilt_when_present(seeded_db):
+    with sqlite3.connect(seeded_db) as conn:
+        conn.execute("UPDATE team_week_scores SET week_total = -1")
+    _rewind_to_base_schema(seeded_db, keep=("team_week_scores",))
+
+    assert fb.migrate() == len(fb.MIGRATIONS)
+    with sqlite3.connect(seeded_db) as conn:
+        assert {r[0] for r in conn.execute("SELECT week_total FROM team_week_scores")} == {-1}
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import pytest
+
+from query_plans import FULL_SCAN_ALLOWED, assert_no_full_scans, capture_query_plans, full_scans
+
+
+@pytest.fixture(scope="module")
+def plans():
+    # Seeds a scratch database from the legacy workbooks and explains every statement the backend ran.
+    return capture_query_plans()
+
+
+def _ran(plans, *fragments: str) -> bool:
+    return any(all(fragment in p.statement for fragment in fragments) for p in plans)
+
+
+def test_backend_statements_do_not_scan_scoring_tables(plans):
+    assert_no_full_scans(plans)
+
+
+def test_hot_read_and_rebuild_paths_are_checked(plans):
+    # get_roster_index, build_league_standings and the per-season team_week_scores rebuild.
+    assert _ran(plans, "LEFT JOIN roster_players rp ON rp.team_id=t.id", "WHERE l.name=? AND s.label=?")
+    assert _ran(plans, "LEFT JOIN team_week_scores tws ON tws.team_id=t.id", "WHERE l.name=? AND s.label=?")
+    assert _ran(plans, "INSERT INTO team_week_scores", "FROM teams WHERE season_id=?")
+
+
+def test_every_allowed_full_scan_is_still_issued(plans):
+    statements = {p.statement for p in plans}
+    assert set(FULL_SCAN_ALLOWED) <= statements
+
+
+def test_limit_does_not_hide_a_full_scan():
+    sql = "SELECT week_number FROM player_event_scores pes WHERE value > 2 LIMIT 1"
+
+    assert full_scans(sql, ["SCAN pes"]) == ["SCAN pes"]
+
+
+def test_full_scan_of_teams_and_data_versions_is_reported():
+    assert full_scans("SELECT * FROM teams WHERE name = 'x'", ["SCAN teams"]) == ["SCAN teams"]
+    assert full_scans("SELECT SUM(version) FROM data_versions dv", ["SCAN dv"]) == ["SCAN dv"]
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fantasy_backend as fb
+from scoring import accepted_answers, grade_answers, score_season, team_week_points
+from workbooks import read_workbook
+
+LEAGUE_SEASONS = [(league, season) for league, seasons in fb.LEAGUE_CONFIG.items() for season in seasons]
+
+
+def test_accepted_answers_split_on_separators():
+    correct = pd.Series(["Jake / Sage", None, 3, ",,", " Yes ", "A;B,C"], dtype=object)
+
+    accepted = accepted_answers(correct)
+    assert list(accepted.itertuples(index=False, name=None)) == [
+        (0, "Jake"), (0, "Sage"), (2, "3"), (3, ",,"), (4, "Yes"), (5, "A"), (5, "B"), (5, "C"),
+    ]
+
+
+def test_grade_answers_matches_stripped_answers_by_position():
+    correct = pd.Series(["Jake / Sage", None, 3, ",,", "Yes"], dtype=object)
+    answers = pd.DataFrame(
+        {
+            "Picasso": ["jake", "x", 3, ",,", "Yes"],
+            "Brackie": [" Sage ", None, "3", None, "yes"],
+            "Polron": [None, "", 3.0, ",", " Yes "],
+        },
+        dtype=object,
+    )
+
+    # Case-sensitive; blanks and questions without an answer are never correct; 3.0 is not "3".
+    assert grade_answers(correct, answers).tolist() == [
+        [False, True, False],
+        [False, False, False],
+        [True, True, False],
+        [True, False, False],
+        [True, False, True],
+    ]
+
+
+def _baseline_team_totals(raw_scores, point_values, rosters, bonus_scores) -> dict[str, float]:
+    # The per-event multiply and per-team loop the standings tab used before the scoring engine.
+    raw_scores = raw_scores.fillna(0)
+    raw_scores.columns = raw_scores.columns.str.strip()
+    point_values = point_values.assign(Event=point_values["Event"].str.strip())
+    for _, row in point_values.iterrows():
+        if row["Event"] in raw_scores.columns:
+            raw_scores[row["Event"]] *= row["Points"]
+    event_cols = [col for col in point_values["Event"] if col in raw_scores.columns]
+    player_totals = raw_scores[event_cols].sum(axis=1).groupby(raw_scores["Player"]).sum()
+    bonus_scores = bonus_scores.drop(columns=["Week"])
+    bonus_scores.columns = bonus_scores.columns.str.strip()
+    return {
+        team: player_totals.reindex(players, fill_value=0).sum()
+        + (bonus_scores[team].sum() if team in bonus_scores.columns else 0)
+        for team, players in rosters.items()
+    }
+
+
+def _league_season_inputs(league: str, season: str):
+    paths = fb.LEAGUE_CONFIG[league][season]
+    sheets = read_workbook(paths["scores"], ["PointsScored_Survivor", "Weekly_Pick_Scores"])
+    point_values = fb.load_point_values(paths["point_values"], league)
+    return sheets["PointsScored_Survivor"], sheets["Weekly_Pick_Scores"], point_values, fb.ROSTERS[(league, season)]
+
+
+@pytest.mark.parametrize("league, season", LEAGUE_SEASONS)
+def test_scoring_engine_matches_baseline_totals(league, season):
+    raw_scores, bonus_scores, point_values, rosters = _league_season_inputs(league, season)
+    expected = _baseline_team_totals(raw_scores, point_values, rosters, bonus_scores)
+
+    scoreboard = score_season(raw_scores, point_values).scoreboard()
+    bonus_by_week = bonus_scores.rename(columns=lambda c: str(c).strip()).dropna(subset=["Week"]).set_index("Week")
+    team_week = team_week_points(scoreboard, rosters, bonus_by_week)
+
+    assert list(team_week.columns) == list(rosters)
+    assert team_week.sum().to_dict() == pytest.approx(expected)
+
+
+def test_scoreboard_rolling_total_accumulates_by_week():
+    raw = pd.DataFrame({"Player": ["Ann", "Bob", "Ann", "Ann"], "Week": [2, 1, 1, 3], "Vote": [1, 2, 3, 0]})
+    points = pd.DataFrame({"Event": [" Vote "], "Points": [2]})
+
+    board = score_season(raw, points).scoreboard()
+    assert board["total"].tolist() == [2.0, 4.0, 6.0, 0.0]
+    assert board["rolling_total"].tolist() == [8.0, 4.0, 6.0, 8.0]
+    assert np.array_equal(board[["Player", "Week"]].to_numpy(), raw[["Player", "Week"]].to_numpy())
+
+
+@pytest.mark.parametrize("season", ["Season 47", "Season 48"])
+def test_database_standings_match_baseline_totals(seeded_db, season):
+    # Season 49's point values are stored once per season, so only single-league seasons compare exactly.
+    league = "NE Portland"
+    raw_scores, bonus_scores, point_values, rosters = _league_season_inputs(league, season)
+    expected = _baseline_team_totals(raw_scores, point_values, rosters, bonus_scores)
+
+    standings = fb.build_league_standings(league, season)["standings"]
+    assert standings.set_index("team_name")["total_points"].to_dict() == pytest.approx(expected)
+
+
+def test_regrading_a_question_updates_grades_and_bonuses(seeded_db):
+    league, season = "NE Portland", "Season 49"
+    answers = fb.list_team_answers(league, season).dropna(subset=["answer"])
+    question_id = answers["question_id"].iloc[0]
+    given = answers[answers["question_id"] == question_id].set_index("team_name")["answer"]
+    team, answer = given.index[0], given.iloc[0]
+    week = int(answers["week_number"].iloc[0])
+
+    def week_points() -> dict[str, float]:
+        bonuses = fb.graded_weekly_bonuses(league, season)
+        return bonuses[bonuses["Week"] == week].set_index("Team")["Points"].to_dict()
+
+    def grades() -> dict[str, object]:
+        stored = fb.list_team_answers(league, season, week)
+        return stored[stored["question_id"] == question_id].set_index("team_name")["is_correct"].to_dict()
+
+    fb.update_weekly_question(int(question_id), "nobody said this")
+    baseline = week_points()
+    assert set(grades().values()) == {0}
+
+    fb.update_weekly_question(int(question_id), f"nobody said this / {answer}")
+    regraded = grades()
+    assert regraded[team] == 1
+    assert all(regraded[t] == int(given.get(t) == answer) for t in regraded)
+    assert week_points() == {t: baseline[t] + regraded[t] for t in baseline}
+
+    fb.update_weekly_question(int(question_id), answer, is_voided=True)
+    assert all(pd.isna(g) for g in grades().values())
+    assert week_points() == baseline
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import threading
+
+import pandas as pd
+import pytest
+
+import workbooks
+from workbooks import read_workbook
+
+
+@pytest.fixture(autouse=True)
+def scratch_sidecars(tmp_path, monkeypatch):
+    monkeypatch.setattr(workbooks, "SIDECAR_DIR", tmp_path / ".sidecars")
+    monkeypatch.setattr(workbooks, "_BUNDLES", {})
+    monkeypatch.setattr(workbooks, "_LOAD_LOCKS", {})
+
+
+def _workbook(path, **sheets: pd.DataFrame):
+    with pd.ExcelWriter(path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return path
+
+
+def test_missing_sheet_raises_from_the_cached_bundle(tmp_path, monkeypatch):
+    path = _workbook(tmp_path / "scores.xlsx", Scores=pd.DataFrame({"Week": [1, 2]}))
+    assert list(read_workbook(path)) == ["Scores"]
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("workbook parsed again")
+
+    monkeypatch.setattr(workbooks.pd, "read_excel", no_parse)
+    with pytest.raises(ValueError, match="Worksheet named 'Missing' not found"):
+        read_workbook(path, ["Scores", "Missing"])
+
+
+def test_cold_load_does_not_block_other_workbooks(tmp_path, monkeypatch):
+    slow = _workbook(tmp_path / "slow.xlsx", Scores=pd.DataFrame({"Week": [1]}))
+    fast = _workbook(tmp_path / "fast.xlsx", Scores=pd.DataFrame({"Week": [2]}))
+    parsing, release = threading.Event(), threading.Event()
+    read_excel = pd.read_excel
+
+    def gated_read_excel(path, *args, **kwargs):
+        if str(path) == str(slow):
+            parsing.set()
+            assert release.wait(10)
+        return read_excel(path, *args, **kwargs)
+
+    monkeypatch.setattr(workbooks.pd, "read_excel", gated_read_excel)
+    loader = threading.Thread(target=read_workbook, args=(slow,))
+    loader.start()
+    try:
+        assert parsing.wait(10)
+        assert read_workbook(fast)["Scores"]["Week"].tolist() == [2]
+    finally:
+        release.set()
+        loader.join()
+    assert read_workbook(slow)["Scores"]["Week"].tolist() == [1]
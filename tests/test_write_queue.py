@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+import fantasy_backend as fb
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = tmp_path / "queue.db"
+    monkeypatch.setattr(fb, "DB_PATH", path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE items (name TEXT PRIMARY KEY)")
+    yield path
+    fb.close_all_connections()
+
+
+def _names(path) -> list[str]:
+    with sqlite3.connect(path) as conn:
+        return [r[0] for r in conn.execute("SELECT name FROM items ORDER BY name")]
+
+
+def _insert(name: str):
+    return lambda conn: conn.execute("INSERT INTO items(name) VALUES (?)", (name,)).rowcount
+
+
+def _insert_then_fail(name: str):
+    def write(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT INTO items(name) VALUES (?)", (name,))
+        raise ValueError(f"{name} rejected")
+
+    return write
+
+
+def _gated(writer: fb._WriteQueue):
+    # Park the writer thread inside a batch so the next submissions queue up and drain together.
+    started, release = threading.Event(), threading.Event()
+
+    def wait(conn: sqlite3.Connection) -> None:
+        started.set()
+        assert release.wait(10)
+
+    gate = writer.submit(wait)
+    assert started.wait(10)
+    return gate, release
+
+
+def test_failed_mutation_is_rolled_back_alone(db):
+    writer = fb._WriteQueue()
+    gate, release = _gated(writer)
+    first = writer.submit(_insert("a"))
+    failing = writer.submit(_insert_then_fail("b"))
+    last = writer.submit(_insert("c"))
+    release.set()
+
+    assert first.result(10) == 1 and last.result(10) == 1
+    with pytest.raises(ValueError, match="b rejected"):
+        failing.result(10)
+    gate.result(10)
+    assert _names(db) == ["a", "c"]
+
+    stats = writer.stats()
+    assert (stats["batches"], stats["max_batch"]) == (2, 3)
+    assert (stats["committed"], stats["failed"]) == (3, 1)
+
+
+def test_later_mutations_in_a_batch_see_earlier_ones(db):
+    writer = fb._WriteQueue()
+    gate, release = _gated(writer)
+    writer.submit(_insert("a"))
+    # The duplicate fails on the primary key against the uncommitted row above.
+    duplicate = writer.submit(_insert("a"))
+    count = writer.submit(lambda conn: conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+    release.set()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        duplicate.result(10)
+    assert count.result(10) == 1
+    gate.result(10)
+    assert _names(db) == ["a"]
+
+
+def test_futures_resolve_after_commit(db):
+    writer = fb._WriteQueue()
+    seen: list[list[str]] = []
+    future = writer.submit(_insert("a"))
+    future.add_done_callback(lambda _: seen.append(_names(db)))
+
+    future.result(10)
+    assert seen == [["a"]]
+
+
+def test_queued_write_cannot_submit_another(db):
+    writer = fb._WriteQueue()
+    nested = writer.submit(lambda conn: writer.submit(_insert("a")))
+
+    with pytest.raises(RuntimeError, match="cannot submit further writes"):
+        nested.result(10)
+    assert _names(db) == []
@@ -1,38 +1,36 @@
 # utils_cache.py
 
 import os
-import hashlib
-from typing import Any, Optional
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from perf import span, timed
+from workbooks import file_fingerprint, read_sheet, read_workbook
 
-# ---------- File fingerprint helper (optional, if you want it later) ----------
-
-def file_fingerprint(path: str) -> str:
-    """
-    Return a simple fingerprint string for a file based on size + mtime.
-    Safe to call even if the file does not exist.
-    """
-    try:
-        stat = os.stat(path)
-        raw = f"{stat.st_size}-{stat.st_mtime}"
-        return hashlib.md5(raw.encode()).hexdigest()
-    except FileNotFoundError:
-        return "missing"
+# Byte budgets for the process-wide stores below (shared by every session).
+FRAME_CACHE_MAX_BYTES = 256 * 1024 * 1024
+OBJ_STORE_MAX_BYTES = 128 * 1024 * 1024
 
 
 # ---------- Cached readers ----------
 
-@st.cache_data(show_spinner=False)
+@timed("cache.read_excel")
 def read_excel(path: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
     """
-    Thin wrapper around pandas.read_excel with Streamlit caching.
+    pandas.read_excel served from memory-mapped columnar sidecars (see workbooks.py);
+    the workbook is only parsed again after it changes on disk.
     """
-    return pd.read_excel(path, sheet_name=sheet_name)
+    return read_sheet(path, sheet_name)
 
 
+@timed("cache.read_csv")
 @st.cache_data(show_spinner=False)
 def read_csv(path: str) -> pd.DataFrame:
     """
@@ -41,43 +39,169 @@ def read_csv(path: str) -> pd.DataFrame:
     return pd.read_csv(path)
 
 
+# ---------- Bounded LRU store ----------
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate in-memory size of a cached value in bytes.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, "size") and hasattr(value, "getbands"):  # PIL image: width x height x bands
+        width, height = value.size
+        return width * height * len(value.getbands())
+    return sys.getsizeof(value)
+
+
+class BoundedStore:
+    """
+    Thread-safe LRU cache with a byte budget and an optional TTL.
+
+    Entries are sized with estimate_size on insert; least recently used
+    entries are evicted until the total fits max_bytes. A single value larger
+    than the budget is not stored at all.
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Any, validate: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        Return the value for key, or None on a miss. Entries older than ttl, or
+        rejected by validate, are dropped and count as misses.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, stored_at = entry
+                if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                    self._drop(key)
+                    self.expirations += 1
+                elif validate is not None and not validate(value):
+                    self._drop(key)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key: Any, value: Any) -> Any:
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return value
+
+    def _drop(self, key: Any) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
 # ---------- DataFrame cache helper ----------
 
-@st.cache_data(show_spinner=False)
-def _cache_df_internal(full_key: str, df: pd.DataFrame) -> pd.DataFrame:
-    # Streamlit will cache on (full_key, df) arguments automatically.
-    # We just return a copy so callers can't mutate the cached version.
-    return df.copy()
+@st.cache_resource(show_spinner=False)
+def _frame_cache() -> BoundedStore:
+    """
+    One entry per logical key: (source fingerprint, frame). A fingerprint
+    change replaces the entry, so stale versions don't pile up.
+    """
+    return BoundedStore(FRAME_CACHE_MAX_BYTES)
+
+
+def _fingerprints(file_path: Union[str, Iterable[str], None]) -> Tuple[str, ...]:
+    if file_path is None:
+        return ()
+    if isinstance(file_path, (str, os.PathLike)):
+        file_path = [file_path]
+    return tuple(file_fingerprint(p) for p in file_path)
 
 
 def cache_df(
     full_key: str,
-    df: pd.DataFrame,
-    file_path: Optional[str] = None,
+    df: Union[pd.DataFrame, Callable[[], pd.DataFrame]],
+    file_path: Union[str, Iterable[str], None] = None,
 ) -> pd.DataFrame:
     """
-    Cache a DataFrame under a given key.
+    Cache a DataFrame under (full_key, fingerprint of file_path).
 
     full_key  – logical cache key (you already build things like f"{league}|{season}|…")
-    df        – DataFrame to store
-    file_path – optional; only included so existing calls like
-                cache_df(key, df, file_path=scores_file_path) keep working.
-                It isn't used directly here but will participate in Streamlit's
-                argument-based caching if you need that later.
+    df        – the DataFrame, or a zero-argument callable that builds it; the
+                callable only runs on a miss, so pass one to skip the work on a hit
+    file_path – source file(s) the frame is derived from; editing any of them
+                (size/mtime change) invalidates the entry
+
+    Nothing is hashed per call. Callers get a shallow view of the cached frame;
+    with pandas copy-on-write any edit they make copies first, so the cached
+    version never changes underneath other sessions.
     """
-    # We *could* build a combined key with file_path/fingerprint here,
-    # but it's not strictly necessary.
-    return _cache_df_internal(full_key, df)
+    cache = _frame_cache()
+    fingerprint = _fingerprints(file_path)
+    entry = cache.get(full_key, validate=lambda e: e[0] == fingerprint)
+    if entry is not None:
+        return entry[1].copy(deep=False)
+
+    with span("cache.cache_df_build"):
+        frame = df() if callable(df) else df
+    cache.put(full_key, (fingerprint, frame))
+    return frame.copy(deep=False)
+
+
+def cache_df_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters and memory use of the DataFrame cache (process-wide)."""
+    return _frame_cache().stats()
 
 
 # ---------- Generic object cache (for images, etc.) ----------
 
 @st.cache_resource(show_spinner=False)
-def _obj_store() -> dict:
+def _obj_store() -> BoundedStore:
     """
-    A single cached dictionary we can use to store arbitrary Python objects.
+    A single cached LRU store for arbitrary Python objects, bounded by OBJ_STORE_MAX_BYTES.
     """
-    return {}
+    return BoundedStore(OBJ_STORE_MAX_BYTES)
 
 
 def cache_obj(key: str, value: Optional[Any]) -> Optional[Any]:
@@ -85,10 +209,15 @@ def cache_obj(key: str, value: Optional[Any]) -> Optional[Any]:
     Simple get/set wrapper around a cached object store.
 
     - If value is None  -> return any previously cached object for `key`
+      (None if it was never stored or has been evicted)
     - If value is not None -> store it under `key` and return it
     """
     store = _obj_store()
     if value is None:
         return store.get(key)
-    store[key] = value
-    return value
+    return store.put(key, value)
+
+
+def cache_obj_stats() -> Dict[str, Any]:
+    """Hit ratio, evictions and memory use of the object store (process-wide)."""
+    return _obj_store().stats()
@@ -6,14 +6,16 @@ Weekly Tab - Bonus points, question responses, and team accuracy
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import re
-from utils_cache import read_excel, cache_df
+from fantasy_backend import list_team_answers, list_weekly_questions, team_question_accuracy
+from utils_cache import read_workbook, cache_df
+from perf import timed
 import numpy as np
 
 def clean_week_column(series: pd.Series) -> pd.Series:
     wk = pd.to_numeric(pd.Series(series).astype(str).str.extract(r"(\d+)")[0], errors="coerce")
     return wk.astype("Int64")  # keep as nullable int for all joins/filters/sorts
 
+@timed("tab.weekly_questions")
 def weekly_questions_tab():
     scores_file_path = st.session_state["paths"]["scores"]
     
@@ -22,19 +24,21 @@ def weekly_questions_tab():
 
     st.header("Weekly Bonus Questions")
 
-    # ---------- LOAD: Weekly bonus ----------
-    def load_weekly_picks():
+    # ---------- LOAD: Weekly bonus sheet ----------
+    def workbook_path():
         if season == 'Season 47':
-            return read_excel("data/PointsScored_Survivor_47.xlsx", "Weekly_Pick_Scores")
+            return "data/PointsScored_Survivor_47.xlsx"
         if season == 'Season 48':
-            return read_excel("data/PointsScored_Survivor_48.xlsx", "Weekly_Pick_Scores")
+            return "data/PointsScored_Survivor_48.xlsx"
         if season == 'Season 49':
             if league == 'Bi-coastal Elites':
-                return read_excel("data/east/Survivor_49_East.xlsx", "Weekly_Pick_Scores")
+                return "data/east/Survivor_49_East.xlsx"
             else:
-                return read_excel("data/PointsScored_Survivor_49.xlsx", "Weekly_Pick_Scores")
+                return "data/PointsScored_Survivor_49.xlsx"
 
-    df = load_weekly_picks().copy()
+    sheets = read_workbook(workbook_path(), ["Weekly_Pick_Scores"])
+
+    df = sheets["Weekly_Pick_Scores"].copy()
     df = df.fillna(0)
     df["Week"] = clean_week_column(df["Week"])
     team_cols = [c for c in df.columns if c != "Week"]
@@ -47,9 +51,12 @@ def weekly_questions_tab():
     st.subheader(f"{view_type} Bonus Points by Team")
 
     # Use a display label for x-axis but keep numeric Week underneath
-    df_long = df.melt(id_vars="Week", var_name="Team", value_name="Bonus Points")
     key_bonus_long = f"{league}|{season}|bonus_long"
-    df_long = cache_df(key_bonus_long, df_long, file_path=scores_file_path)
+    df_long = cache_df(
+        key_bonus_long,
+        lambda: df.melt(id_vars="Week", var_name="Team", value_name="Bonus Points"),
+        file_path=scores_file_path,
+    )
 
 
     if view_type == "Cumulative":
@@ -76,99 +83,54 @@ def weekly_questions_tab():
     df_full = df_full.assign(WeekLabel=lambda x: x["Week"].astype("Int64").astype(str).where(x["Week"].notna(), "Total"))
     st.dataframe(df_full.drop(columns=["Week"]).set_index("WeekLabel"), use_container_width=True)
 
-    # ---------- LOAD: Weekly Q&A ----------
+    # ---------- Weekly Q&A (graded once at import into weekly_questions / team_answers) ----------
     st.subheader("Answers to Weekly Questions")
 
-    def load_question_answers():
-        if season == 'Season 47':
-            return read_excel("data/PointsScored_Survivor_47.xlsx", "Weekly_Questions")
-        if season == 'Season 48':
-            return read_excel("data/PointsScored_Survivor_48.xlsx", "Weekly_Questions")
-        if season == 'Season 49':
-            if league == 'Bi-coastal Elites':
-                return read_excel("data/east/Survivor_49_East.xlsx", "Weekly_Questions")
-            else:
-                return read_excel("data/PointsScored_Survivor_49.xlsx", "Weekly_Questions")
-
-    qa_df = load_question_answers().copy()
-
-    # Clean weeks ONCE, keep as Int64
-    qa_df["Week"] = clean_week_column(qa_df["Week"])
-
-    # Team columns, flags, and normalization
-    qa_df = qa_df.rename(columns=lambda c: c.strip())
-    non_team_cols = ["Week", "Question", "Correct Answer", "Is Voided"]
-    teams = [c for c in qa_df.columns if c not in non_team_cols]
-
-    qa_df["Is Voided"] = (
-        qa_df["Is Voided"]
-        .astype(str).str.strip().str.lower()
-        .map({"yes": True, "y": True, "true": True, "1": True,
-              "no": False, "n": False, "false": False, "0": False})
-        .fillna(False)
-    )
-
-    # --- Week selector (SINGLE widget; keep weeks numeric) ---
-    week_options = (
-        qa_df["Week"].dropna().astype(int).sort_values().unique().tolist()
-    )
+    questions = list_weekly_questions(league, season)
+    week_options = questions["week_number"].drop_duplicates().tolist()
+    if not week_options:
+        st.info("No weekly questions have been imported for this season.")
+        return
     selected_week = st.selectbox(
         "Select a week",
         week_options,
-        index=(len(week_options) - 1) if week_options else 0,
+        index=len(week_options) - 1,
         key="wq_week_select"
     )
     wk = int(selected_week)
 
-    # Filter data for the chosen week
-    week_df = qa_df.loc[qa_df["Week"] == wk].copy().sort_values("Question")
-
-    # ---------- Style answers ----------
-    def _normalize_answers(val):
-        if pd.isna(val):
-            return set()
-        if isinstance(val, (list, tuple, set)):
-            return {str(x).strip() for x in val}
-        if isinstance(val, str):
-            parts = [p.strip() for p in re.split(r"[,/;]", val) if p.strip()]
-            return set(parts if parts else [val.strip()])
-        return {str(val).strip()}
-
-    full_week_df = week_df.copy()
-    display_df = week_df.drop(columns=["Is Voided", "Week"])
-
-    def highlight_answers(row):
-        styles = []
-        is_voided = bool(full_week_df.loc[row.name, "Is Voided"])
-        correct_list = _normalize_answers(full_week_df.loc[row.name, "Correct Answer"])
-        for col in row.index:
-            if is_voided:
-                styles.append("background-color: lightgray")
-            elif col in teams:
-                cell = str(row[col]).strip()
-                styles.append("background-color: lightgreen" if cell in correct_list
-                              else "background-color: lightcoral")
-            else:
-                styles.append("")
-        return styles
-
-    styled = display_df.style.apply(highlight_answers, axis=1).set_table_styles(
+    week_questions = questions[questions["week_number"] == wk].set_index("question_id")
+    answers = list_team_answers(league, season, wk)
+    teams = answers["team_name"].drop_duplicates().tolist()
+    answer_grid = answers.pivot(index="question_id", columns="team_name", values="answer").reindex(
+        index=week_questions.index, columns=teams
+    )
+    correct_grid = answers.pivot(index="question_id", columns="team_name", values="is_correct").reindex(
+        index=week_questions.index, columns=teams
+    )
+    display_df = pd.concat(
+        [week_questions[["question", "correct_answer"]].rename(columns={"question": "Question", "correct_answer": "Correct Answer"}),
+         answer_grid],
+        axis=1,
+    )
+    order = display_df["Question"].argsort(kind="stable").to_numpy()
+    display_df = display_df.iloc[order].reset_index(drop=True)
+    voided = week_questions["is_voided"].astype(bool).to_numpy()[order]
+    correct = correct_grid.to_numpy(dtype=float)[order]
+
+    # ---------- Style answers (one vectorized pass over the stored grades) ----------
+    styles = np.full(display_df.shape, "", dtype=object)
+    styles[:, 2:] = np.where(correct == 1, "background-color: lightgreen", "background-color: lightcoral")
+    styles[voided, :] = "background-color: lightgray"
+    style_frame = pd.DataFrame(styles, index=display_df.index, columns=display_df.columns)
+    styled = display_df.style.apply(lambda _: style_frame, axis=None).set_table_styles(
         [{"selector": "td", "props": [("font-size", "12px")]}]
     )
     st.table(styled)
 
     # ---------- Overall Accuracy ----------
     st.subheader("Overall Team Accuracy")
-    valid_df = qa_df[qa_df["Is Voided"] == False].copy()
-    team_accuracy = (
-        valid_df[teams]
-        .eq(valid_df["Correct Answer"], axis=0)
-        .sum()
-        .reset_index(name="Correct")
-        .rename(columns={"index": "Team"})
-    )
-    team_accuracy["Total"] = len(valid_df)
-    team_accuracy["Accuracy"] = team_accuracy["Correct"] / team_accuracy["Total"]
+    team_accuracy = team_question_accuracy(league, season)
 
     fig3 = px.bar(
         team_accuracy,
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar sidecars for the Excel workbooks.
+
+The first read of a workbook parses every sheet through openpyxl once and
+writes each one to an uncompressed Feather file under SIDECAR_DIR, in a
+directory named after the workbook's file_fingerprint. Later reads
+memory-map the Feather file instead of touching the .xlsx; editing the
+workbook changes its fingerprint, so it is converted again and the old
+sidecars are removed.
+
+On top of that, read_workbook keeps one in-memory bundle of sheets per
+workbook and fingerprint, so a workbook is loaded once per process no matter
+how many tabs and sheets ask for it.
+
+Sheets Arrow can't represent (e.g. object columns mixing numbers and text)
+are pickled instead so every sheet round-trips unchanged.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from perf import span, timed
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_DIR = Path("data/.sidecars")
+_MANIFEST = "manifest.json"
+
+# str(path) -> (fingerprint, {sheet name: DataFrame})
+_BUNDLES: dict[str, tuple[str, dict[str, pd.DataFrame]]] = {}
+# Guards _BUNDLES and _LOAD_LOCKS only; a workbook is parsed under its own load
+# lock, so a cold load of one workbook never blocks reads of the others.
+_BUNDLES_LOCK = threading.Lock()
+_LOAD_LOCKS: dict[str, threading.Lock] = {}
+
+
+def file_fingerprint(path: Union[str, Path]) -> str:
+    """
+    Return a simple fingerprint string for a file based on size + mtime.
+    Safe to call even if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+        raw = f"{stat.st_size}-{stat.st_mtime}"
+        return hashlib.md5(raw.encode()).hexdigest()
+    except FileNotFoundError:
+        return "missing"
+
+
+def _workbook_dir(path: Union[str, Path]) -> Path:
+    resolved = str(Path(path).resolve())
+    return SIDECAR_DIR / f"{Path(path).stem}-{hashlib.sha1(resolved.encode()).hexdigest()[:12]}"
+
+
+def _write_sheet(directory: Path, index: int, df: pd.DataFrame) -> str:
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        name = f"{index}.feather"
+        feather.write_feather(table, directory / name, compression="uncompressed")
+    except (pa.ArrowException, TypeError, ValueError):
+        name = f"{index}.pkl"
+        df.to_pickle(directory / name)
+    return name
+
+
+def _read_sheet_file(file: Path) -> pd.DataFrame:
+    if file.suffix == ".feather":
+        return feather.read_table(file, memory_map=True).to_pandas()
+    return pd.read_pickle(file)
+
+
+def convert_workbook(path: Union[str, Path]) -> Path:
+    """
+    Parse every sheet of the workbook once and write its sidecars; returns the
+    sidecar directory for the current fingerprint.
+    """
+    fingerprint = file_fingerprint(path)
+    root = _workbook_dir(path)
+    target = root / fingerprint
+    if (target / _MANIFEST).exists():
+        return target
+
+    with span("workbooks.parse_excel"):
+        sheets = pd.read_excel(path, sheet_name=None)
+    root.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=root, prefix=".tmp-"))
+    try:
+        manifest = {name: _write_sheet(staging, i, df) for i, (name, df) in enumerate(sheets.items())}
+        (staging / _MANIFEST).write_text(json.dumps(manifest))
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another process converted the same version first; keep theirs.
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    for stale in root.iterdir():
+        if stale.name != target.name and not stale.name.startswith(".tmp-"):
+            shutil.rmtree(stale, ignore_errors=True)
+    logger.info("Converted %s (%d sheets) to sidecars in %s", path, len(sheets), target)
+    return target
+
+
+@timed("workbooks.load_bundle")
+def _bundle(path: Union[str, Path]) -> dict[str, pd.DataFrame]:
+    key, fingerprint = str(path), file_fingerprint(path)
+    with _BUNDLES_LOCK:
+        cached = _BUNDLES.get(key)
+        load_lock = _LOAD_LOCKS.setdefault(key, threading.Lock())
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    with load_lock:
+        with _BUNDLES_LOCK:
+            cached = _BUNDLES.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        directory = convert_workbook(path)
+        manifest = json.loads((directory / _MANIFEST).read_text())
+        sheets = {name: _read_sheet_file(directory / file) for name, file in manifest.items()}
+        with _BUNDLES_LOCK:
+            _BUNDLES[key] = (fingerprint, sheets)
+        return sheets
+
+
+def read_workbook(path: Union[str, Path], sheet_names: Optional[Iterable[str]] = None) -> dict[str, pd.DataFrame]:
+    """
+    The requested sheets (all of them when sheet_names is None) from a single
+    load of the workbook, like pd.read_excel(path, sheet_name=[...]).
+
+    Frames are shared by every caller; they are handed out as shallow views, so
+    copy-on-write (always on from pandas 3.0, the pinned minimum) keeps edits
+    from leaking back into the bundle.
+    """
+    sheets = _bundle(path)
+    names = list(sheets) if sheet_names is None else list(sheet_names)
+    missing = [name for name in names if name not in sheets]
+    if missing:
+        # Same error pd.read_excel raises, without parsing the workbook again.
+        raise ValueError(f"Worksheet named '{missing[0]}' not found")
+    return {name: sheets[name].copy(deep=False) for name in names}
+
+
+def read_sheet(path: Union[str, Path], sheet_name: Optional[str] = None):
+    """
+    Drop-in for pd.read_excel(path, sheet_name=sheet_name) served from the
+    sidecars; sheet_name=None returns a dict of every sheet, like pandas.
+    """
+    if sheet_name is None:
+        return read_workbook(path)
+    return read_workbook(path, [sheet_name])[sheet_name]